@@ -0,0 +1,97 @@
+"""
+Benchmark das declarações preparadas das classes de acesso ao banco.
+
+Compara, para cada consulta registrada em `DECLARACOES_PREPARADAS`, a latência da execução
+comum (o PostgreSQL analisa e planeja o SQL a cada chamada) com a execução por nome.
+Todos os dados criados são desfeitos ao final.
+
+Uso (a partir do diretório bib_funcao_postgree):
+    python -m benchmarks.benchmark_declaracoes_preparadas [repeticoes]
+
+A conexão usa as variáveis de ambiente HOST_BD, DATABASE, USER_BD e PASSWORD_BD.
+"""
+
+import os
+import re
+import sys
+from datetime import datetime
+from statistics import median
+from time import perf_counter
+
+from src.funcao_postgree.bd_postgree_base import Bd_Base
+from src.funcao_postgree.bd_postgree_funcionario import BdFuncionario
+from src.funcao_postgree.bd_postgree_pedido import BdPedido
+from src.funcao_postgree.bd_postgree_pedido_produto import BdPedidoProduto
+from src.funcao_postgree.bd_postgree_produto import BdProduto
+
+
+def medir(comum, preparada, repeticoes: int) -> tuple[list[float], list[float]]:
+    """
+    Executa as duas versões da consulta de forma intercalada e retorna a latência de cada
+    execução em microssegundos. A intercalação evita que uma versão seja prejudicada pelo
+    crescimento das tabelas causado pela outra.
+    """
+    for _ in range(50):
+        comum()
+        preparada()
+
+    tempos_comum, tempos_preparada = [], []
+    for _ in range(repeticoes):
+        inicio = perf_counter()
+        comum()
+        meio = perf_counter()
+        preparada()
+        fim = perf_counter()
+        tempos_comum.append((meio - inicio) * 1_000_000)
+        tempos_preparada.append((fim - meio) * 1_000_000)
+    return tempos_comum, tempos_preparada
+
+
+def main(repeticoes: int) -> None:
+    """
+    Cria dados de teste, mede cada declaração preparada e desfaz os dados ao final.
+    """
+    bd = Bd_Base(
+        os.getenv("HOST_BD", "localhost"),
+        os.getenv("DATABASE", "database-postgres"),
+        os.getenv("USER_BD", "root"),
+        os.getenv("PASSWORD_BD", "root"),
+    )
+    cursor = bd.get_cursor()
+    cursor.execute("INSERT INTO Produto (nome, preco) VALUES ('benchmark', 1) RETURNING id;")
+    produto_id = cursor.fetchone()[0]
+    cursor.execute("INSERT INTO Pedido (mesa, status, data_hora) VALUES (1, codigo_status_pedido('Entregar'), now()) RETURNING id;")
+    pedido_id = cursor.fetchone()[0]
+    cursor.execute("INSERT INTO funcionario (usuario, senha, email) VALUES ('benchmark', 'x', 'benchmark@local');")
+
+    parametros = {
+        "produto_por_id": (produto_id,),
+        "pedido_editar_status": ("Pedido finalizado", pedido_id),
+        "produto_pedido_inserir_pedido": (1, "Entregar", datetime.now(), [produto_id] * 15, [1] * 15, [1] * 15),
+        "funcionario_email": ("benchmark",),
+        "funcionario_senha": ("benchmark",),
+    }
+
+    print(f"{'declaração':<30} {'comum p50 (µs)':>15} {'preparada p50 (µs)':>19} {'ganho':>8}")
+    try:
+        for classe in (BdProduto, BdPedido, BdPedidoProduto, BdFuncionario):
+            dao = classe.__new__(classe)
+            for nome, (_, sql) in classe.DECLARACOES_PREPARADAS.items():
+                sql_comum = re.sub(r"\$\d+", "%s", sql)
+                valores = parametros[nome]
+
+                tempos_comum, tempos_preparada = medir(
+                    lambda: cursor.execute(sql_comum, valores),
+                    lambda: dao.executar_preparada(cursor, nome, valores),
+                    repeticoes
+                )
+                comum, preparada = median(tempos_comum), median(tempos_preparada)
+                ganho = (comum - preparada) / comum * 100
+                print(f"{nome:<30} {comum:>15.1f} {preparada:>19.1f} {ganho:>7.1f}%")
+    finally:
+        cursor.close()
+        bd.rollback()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,126 @@
+"""
+Benchmark da inserção de pedidos com itens.
+
+Compara a latência de `BdPedidoProduto.inserir_pedido_com_produtos`, que grava o pedido e
+todos os itens em um único comando, com a forma anterior: um INSERT para o pedido e outro
+para cada item, cada um em uma ida e volta ao banco. Mostra p50 e p99 para alguns tamanhos
+de pedido. Os pedidos criados são removidos ao final.
+
+Uso (a partir do diretório bib_funcao_postgree):
+    python -m benchmarks.benchmark_inserir_pedido [repeticoes]
+
+A conexão usa as variáveis de ambiente HOST_BD, DATABASE, USER_BD e PASSWORD_BD.
+"""
+
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime
+from statistics import quantiles
+from time import perf_counter
+
+from src.funcao_postgree.bd_postgree_base import Bd_Base
+from src.funcao_postgree.bd_postgree_modelos import ItemPedido
+from src.funcao_postgree.bd_postgree_pedido_produto import BdPedidoProduto
+
+TAMANHOS_PEDIDO = (1, 5, 15, 40)
+
+
+def inserir_um_comando_por_item(dao: BdPedidoProduto, itens: list[ItemPedido], mesa: int, status: str) -> None:
+    """
+    Insere o pedido como na versão anterior de `inserir_pedido_com_produtos`: um INSERT para o
+    pedido e um para cada item.
+    """
+    cursor = dao.get_cursor()
+    try:
+        cursor.execute(
+            "INSERT INTO Pedido (mesa, status, data_hora) VALUES (%s, codigo_status_pedido(%s), %s) RETURNING id, data_hora;",
+            (mesa, status, datetime.now())
+        )
+        pedido_id, data_hora = cursor.fetchone()
+        for item in itens:
+            cursor.execute(
+                "INSERT INTO Produto_Pedido (pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago) VALUES (%s, %s, %s, %s, %s);",
+                (pedido_id, data_hora, item.produto_id, item.quantidade, item.preco_pago)
+            )
+        dao.commit()
+    finally:
+        cursor.close()
+
+
+def medir(comum, unico, repeticoes: int) -> tuple[list[float], list[float]]:
+    """
+    Executa as duas versões de forma intercalada e retorna a latência de cada execução em
+    microssegundos.
+    """
+    for _ in range(20):
+        comum()
+        unico()
+
+    tempos_comum, tempos_unico = [], []
+    for _ in range(repeticoes):
+        inicio = perf_counter()
+        comum()
+        meio = perf_counter()
+        unico()
+        fim = perf_counter()
+        tempos_comum.append((meio - inicio) * 1_000_000)
+        tempos_unico.append((fim - meio) * 1_000_000)
+    return tempos_comum, tempos_unico
+
+
+def p50_p99(tempos: list[float]) -> tuple[float, float]:
+    """
+    Retorna o p50 e o p99 das latências.
+    """
+    percentis = quantiles(tempos, n=100, method="inclusive")
+    return percentis[49], percentis[98]
+
+
+def main(repeticoes: int) -> None:
+    """
+    Mede as duas formas de inserção para cada tamanho de pedido e remove os pedidos criados.
+    """
+    bd = Bd_Base(
+        os.getenv("HOST_BD", "localhost"),
+        os.getenv("DATABASE", "database-postgres"),
+        os.getenv("USER_BD", "root"),
+        os.getenv("PASSWORD_BD", "root"),
+    )
+    dao = BdPedidoProduto.__new__(BdPedidoProduto)
+    cursor = bd.get_cursor()
+    cursor.execute("INSERT INTO Produto (nome, preco) VALUES ('benchmark', 1) RETURNING id;")
+    produto_id = cursor.fetchone()[0]
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM Pedido;")
+    ultimo_pedido = cursor.fetchone()[0]
+    bd.commit()
+    cursor.close()
+
+    print(f"{'itens':>5} {'por item p50':>13} {'p99':>9} {'único p50':>10} {'p99':>9} {'ganho p50':>10} {'ganho p99':>10}  (µs)")
+    try:
+        for tamanho in TAMANHOS_PEDIDO:
+            itens = [ItemPedido(produto_id, 1, 1) for _ in range(tamanho)]
+            # Os pedidos vão para a mesa 0, que não existe no salão; o log de cada inserção é descartado.
+            with redirect_stdout(io.StringIO()):
+                tempos_comum, tempos_unico = medir(
+                    lambda: inserir_um_comando_por_item(dao, itens, 0, "Pedido cancelado"),
+                    lambda: dao.inserir_pedido_com_produtos(itens, 0, "Pedido cancelado"),
+                    repeticoes
+                )
+            comum_p50, comum_p99 = p50_p99(tempos_comum)
+            unico_p50, unico_p99 = p50_p99(tempos_unico)
+            print(
+                f"{tamanho:>5} {comum_p50:>13.1f} {comum_p99:>9.1f} {unico_p50:>10.1f} {unico_p99:>9.1f}"
+                f" {(comum_p50 - unico_p50) / comum_p50 * 100:>9.1f}% {(comum_p99 - unico_p99) / comum_p99 * 100:>9.1f}%"
+            )
+    finally:
+        cursor = bd.get_cursor()
+        cursor.execute("DELETE FROM Pedido WHERE id > %s AND mesa = 0;", (ultimo_pedido,))
+        cursor.execute("DELETE FROM Produto WHERE id = %s;", (produto_id,))
+        bd.commit()
+        cursor.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,75 @@
+"""
+Benchmark da inserção de pedidos em lote.
+
+Compara a vazão (pedidos por segundo) de `BdPedidoProduto.inserir_pedidos_em_lote` com a
+inserção dos mesmos pedidos um a um por `inserir_pedido_com_produtos`, uma transação por
+pedido. Os pedidos criados são removidos ao final.
+
+Uso (a partir do diretório bib_funcao_postgree):
+    python -m benchmarks.benchmark_inserir_pedidos_em_lote [pedidos] [itens_por_pedido]
+
+A conexão usa as variáveis de ambiente HOST_BD, DATABASE, USER_BD e PASSWORD_BD.
+"""
+
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime
+from time import perf_counter
+
+from src.funcao_postgree.bd_postgree_base import Bd_Base
+from src.funcao_postgree.bd_postgree_modelos import ItemPedido, Pedido
+from src.funcao_postgree.bd_postgree_pedido_produto import BdPedidoProduto
+
+
+def main(quantidade: int, itens_por_pedido: int) -> None:
+    """
+    Insere os mesmos pedidos das duas formas, mostra a vazão de cada uma e remove os pedidos criados.
+    """
+    bd = Bd_Base(
+        os.getenv("HOST_BD", "localhost"),
+        os.getenv("DATABASE", "database-postgres"),
+        os.getenv("USER_BD", "root"),
+        os.getenv("PASSWORD_BD", "root"),
+    )
+    dao = BdPedidoProduto.__new__(BdPedidoProduto)
+    cursor = bd.get_cursor()
+    cursor.execute("INSERT INTO Produto (nome, preco) VALUES ('benchmark', 1) RETURNING id;")
+    produto_id = cursor.fetchone()[0]
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM Pedido;")
+    ultimo_pedido = cursor.fetchone()[0]
+    bd.commit()
+    cursor.close()
+
+    # Os pedidos vão para a mesa 0, que não existe no salão.
+    itens = [ItemPedido(produto_id, 1, 1) for _ in range(itens_por_pedido)]
+    pedidos = [(Pedido(0, "Pedido cancelado", datetime.now()), itens) for _ in range(quantidade)]
+
+    print(f"{quantidade} pedidos com {itens_por_pedido} itens")
+    try:
+        with redirect_stdout(io.StringIO()):
+            inicio = perf_counter()
+            for pedido, itens_pedido in pedidos:
+                dao.inserir_pedido_com_produtos(itens_pedido, pedido.mesa, pedido.status)
+            um_a_um = perf_counter() - inicio
+
+            inicio = perf_counter()
+            dao.inserir_pedidos_em_lote(pedidos)
+            em_lote = perf_counter() - inicio
+
+        print(f"{'um a um':<10} {um_a_um * 1000:>10.1f} ms {quantidade / um_a_um:>10.0f} pedidos/s")
+        print(f"{'em lote':<10} {em_lote * 1000:>10.1f} ms {quantidade / em_lote:>10.0f} pedidos/s")
+    finally:
+        cursor = bd.get_cursor()
+        cursor.execute("DELETE FROM Pedido WHERE id > %s AND mesa = 0;", (ultimo_pedido,))
+        cursor.execute("DELETE FROM Produto WHERE id = %s;", (produto_id,))
+        bd.commit()
+        cursor.close()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
@@ -0,0 +1,74 @@
+"""
+Benchmark da leitura de vários pedidos com os seus itens.
+
+Compara a latência de `BdPedidoProduto.get_pedidos_completos`, que busca os pedidos e todos os
+itens em uma única consulta, com a leitura de uma tela que lista os pedidos abertos e chama
+`get_produtos_do_pedido` para cada um (uma consulta por pedido). Mostra p50 e p99 para alguns
+números de pedidos. Nada é alterado no banco.
+
+Uso (a partir do diretório bib_funcao_postgree, com o banco já populado, por exemplo pelo work.py):
+    python -m benchmarks.benchmark_pedidos_completos [repeticoes]
+
+A conexão usa as variáveis de ambiente HOST_BD, DATABASE, USER_BD e PASSWORD_BD.
+"""
+
+import os
+import sys
+from statistics import quantiles
+from time import perf_counter
+
+from src.funcao_postgree.bd_postgree_pedido import BdPedido
+from src.funcao_postgree.bd_postgree_pedido_produto import BdPedidoProduto
+
+QUANTIDADES_PEDIDOS = (10, 50, 200)
+
+
+def medir(funcao, repeticoes: int) -> list[float]:
+    """
+    Executa a função repetidas vezes e retorna a latência de cada execução em milissegundos.
+    """
+    for _ in range(5):
+        funcao()
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = perf_counter()
+        funcao()
+        tempos.append((perf_counter() - inicio) * 1000)
+    return tempos
+
+
+def p50_p99(tempos: list[float]) -> tuple[float, float]:
+    """
+    Retorna o p50 e o p99 das latências.
+    """
+    percentis = quantiles(tempos, n=100, method="inclusive")
+    return percentis[49], percentis[98]
+
+
+def main(repeticoes: int) -> None:
+    """
+    Mede as duas formas de leitura para cada número de pedidos.
+    """
+    conexao = (
+        os.getenv("HOST_BD", "localhost"),
+        os.getenv("DATABASE", "database-postgres"),
+        os.getenv("USER_BD", "root"),
+        os.getenv("PASSWORD_BD", "root"),
+    )
+    bd_pedido = BdPedido(*conexao)
+    dao = BdPedidoProduto(*conexao)
+    ids = [pedido.id for pedido in bd_pedido.get_abertos()]
+
+    print(f"{'pedidos':>7} {'um por pedido p50':>18} {'p99':>8} {'única p50':>10} {'p99':>8}  (ms)")
+    for quantidade in QUANTIDADES_PEDIDOS:
+        amostra = ids[:quantidade]
+        um_por_pedido = medir(lambda: [dao.get_produtos_do_pedido(id) for id in amostra], repeticoes)
+        unica = medir(lambda: dao.get_pedidos_completos(amostra), repeticoes)
+        p50_um, p99_um = p50_p99(um_por_pedido)
+        p50_unica, p99_unica = p50_p99(unica)
+        print(f"{len(amostra):>7} {p50_um:>18.2f} {p99_um:>8.2f} {p50_unica:>10.2f} {p99_unica:>8.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,224 @@
+"""
+Verificação dos planos de execução das consultas das classes de acesso ao banco.
+
+Chama os métodos das classes de acesso a dados com um cursor que executa EXPLAIN antes de
+cada comando e falha se algum plano fizer uma varredura sequencial (Seq Scan) em uma tabela
+(ou partição mensal de Pedido e Produto_Pedido) com mais linhas que o limite. Também falha se alguma chave estrangeira com ON DELETE CASCADE
+não tiver índice, já que a remoção em cascata não aparece no EXPLAIN de quem apaga a linha.
+As chaves sem cascata referenciam tabelas de domínio cujas linhas não são removidas (como
+status_pedido) e não precisam de índice.
+
+Os métodos que leem a tabela inteira de propósito (get_all, exportações CSV, resumos de
+vendas) são listados, mas não reprovam a verificação. Todas as alterações feitas pelos métodos
+são desfeitas.
+
+Uso (a partir do diretório bib_funcao_postgree, com o banco já populado, por exemplo pelo work.py):
+    python -m benchmarks.verificar_planos [--limite 1000] [--analisar]
+
+A conexão usa as variáveis de ambiente HOST_BD, DATABASE, USER_BD e PASSWORD_BD.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import psycopg2
+import psycopg2.extensions
+
+from src.funcao_postgree.bd_postgree_base import Bd_Base, ErroTransacao
+from src.funcao_postgree.bd_postgree_funcionario import BdFuncionario
+from src.funcao_postgree.bd_postgree_pedido import BdPedido
+from src.funcao_postgree.bd_postgree_pedido_produto import BdPedidoProduto
+from src.funcao_postgree.bd_postgree_produto import BdProduto
+from src.funcao_postgree.bd_postgree_resumo_vendas import BdResumoVendas
+
+COMANDOS_EXPLICAVEIS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "EXECUTE")
+TABELAS = ("funcionario", "Produto", "Pedido", "Produto_Pedido", "resumo_vendas_hora", "resumo_vendas_produto")
+
+
+class CursorExplain(psycopg2.extensions.cursor):
+    """
+    Cursor que registra o plano de execução de cada comando antes de executá-lo.
+    """
+
+    planos = []
+
+    def execute(self, query, vars=None):
+        comando = query.lstrip().split(None, 1)[0].upper()
+        if comando in COMANDOS_EXPLICAVEIS:
+            super().execute("EXPLAIN (FORMAT JSON) " + query, vars)
+            CursorExplain.planos.append((" ".join(query.split()), self.fetchone()[0][0]["Plan"]))
+        return super().execute(query, vars)
+
+
+class DesfazerVerificacao(Exception):
+    """
+    Lançada ao final da verificação para desfazer as alterações feitas pelos métodos.
+    """
+    pass
+
+
+def varreduras_sequenciais(plano: dict) -> list:
+    """
+    Retorna o nome das tabelas lidas por Seq Scan em um plano e em todos os seus nós filhos.
+    """
+    tabelas = []
+    if plano["Node Type"] == "Seq Scan":
+        tabelas.append(plano["Relation Name"])
+    for filho in plano.get("Plans", []):
+        tabelas.extend(varreduras_sequenciais(filho))
+    return tabelas
+
+
+def chamadas(amostras: dict) -> list:
+    """
+    Lista os métodos verificados no formato (nome, função, lê a tabela inteira de propósito).
+    """
+    bd_produto = BdProduto.__new__(BdProduto)
+    bd_pedido = BdPedido.__new__(BdPedido)
+    bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+    bd_funcionario = BdFuncionario.__new__(BdFuncionario)
+    bd_resumo_vendas = BdResumoVendas.__new__(BdResumoVendas)
+
+    produto = json.dumps({"nome": "verificar_planos", "preco": 1, "disponivel": True})
+    item = [{"produto_id": amostras["produto"], "quantidade": 1, "preco_pago": 1}]
+
+    return [
+        ("BdProduto.get", lambda: bd_produto.get(amostras["produto"]), False),
+        ("BdProduto.get_all", bd_produto.get_all, True),
+        ("BdProduto.listar", lambda: bd_produto.listar(amostras["produto"], 50, True, "a"), False),
+        ("BdProduto.buscar", lambda: bd_produto.buscar("a", 20), False),
+        ("BdProduto.get_por_ids", lambda: bd_produto.get_por_ids([amostras["produto"]]), False),
+        ("BdProduto.trocar_disponibilidade", lambda: bd_produto.trocar_disponibilidade(amostras["produto"]), False),
+        ("BdProduto.definir_disponibilidade", lambda: bd_produto.definir_disponibilidade([amostras["produto"]], False), False),
+        ("BdProduto.atualizar_produto", lambda: bd_produto.atualizar_produto(produto, amostras["produto"]), False),
+        ("BdProduto.remover_produto", lambda: bd_produto.remover_produto(amostras["produto"]), False),
+        ("BdPedido.editar_status", lambda: bd_pedido.editar_status("Entregar", amostras["pedido"]), False),
+        ("BdPedido.editar_status_em_lote", lambda: bd_pedido.editar_status_em_lote([amostras["pedido"]], "Entregar"), False),
+        ("BdPedido.editar_status_dos_abertos", lambda: bd_pedido.editar_status_dos_abertos("Pedido finalizado", mesa=1), False),
+        ("BdPedido.get_last_1000", bd_pedido.get_last_1000, False),
+        ("BdPedido.get_alterados_desde", lambda: bd_pedido.get_alterados_desde(bd_pedido.marcador_atual()), False),
+        ("BdPedido.get_abertos", bd_pedido.get_abertos, False),
+        ("BdPedido.get_por_periodo", lambda: bd_pedido.get_por_periodo(*amostras["periodo"]), False),
+        ("BdPedido.get_all", bd_pedido.get_all, True),
+        ("BdPedidoProduto.get_produtos_do_pedido", lambda: bd_pedido_produto.get_produtos_do_pedido(amostras["pedido"]), False),
+        ("BdPedidoProduto.get_pedidos_completos", lambda: bd_pedido_produto.get_pedidos_completos([amostras["pedido"]]), False),
+        ("BdPedidoProduto.inserir_pedido_com_produtos", lambda: bd_pedido_produto.inserir_pedido_com_produtos(item, 1, "Entregar"), False),
+        ("BdResumoVendas.get_vendas_por_hora", bd_resumo_vendas.get_vendas_por_hora, True),
+        ("BdResumoVendas.get_vendas_por_produto", bd_resumo_vendas.get_vendas_por_produto, True),
+        ("BdFuncionario.get_email", lambda: bd_funcionario.get_email(amostras["usuario"]), False),
+        ("BdFuncionario.validar_acesso", lambda: bd_funcionario.validar_acesso(amostras["usuario"], "senha"), False),
+    ]
+
+
+def chaves_estrangeiras_sem_indice(cursor: psycopg2.extensions.cursor) -> list:
+    """
+    Retorna as chaves estrangeiras com ON DELETE CASCADE cujas colunas não são o início de
+    nenhum índice da tabela.
+    """
+    cursor.execute("""
+        SELECT c.conrelid::regclass::text, c.conname
+        FROM pg_constraint c
+        WHERE c.contype = 'f'
+          AND c.confdeltype = 'c'
+          AND c.connamespace = 'public'::regnamespace
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_index i
+              WHERE i.indrelid = c.conrelid
+                AND (i.indkey::int2[])[0:array_length(c.conkey, 1) - 1] = c.conkey
+          )
+        ORDER BY 1, 2;
+    """)
+    return cursor.fetchall()
+
+
+def main(limite: int, analisar: bool) -> int:
+    """
+    Verifica os planos de todos os métodos e retorna o código de saída (0 aprovado, 1 reprovado).
+    """
+    bd = Bd_Base(
+        os.getenv("HOST_BD", "localhost"),
+        os.getenv("DATABASE", "database-postgres"),
+        os.getenv("USER_BD", "root"),
+        os.getenv("PASSWORD_BD", "root"),
+    )
+
+    cursor = bd.get_cursor()
+    if analisar:
+        cursor.execute(f"ANALYZE {', '.join(TABELAS)};")
+    # Pedido e Produto_Pedido são particionadas: os planos leem as partições de cada mês, que
+    # são comparadas com o limite pelas suas próprias linhas.
+    cursor.execute("""
+        SELECT c.relname, GREATEST(c.reltuples, 0)::bigint
+        FROM pg_class c
+        LEFT JOIN pg_inherits h ON h.inhrelid = c.oid
+        LEFT JOIN pg_class pai ON pai.oid = h.inhparent
+        WHERE c.relkind = 'r' AND COALESCE(pai.relname, c.relname) = ANY(%s);
+    """, ([tabela.lower() for tabela in TABELAS],))
+    linhas = dict(cursor.fetchall())
+    cursor.execute("""
+        SELECT (SELECT MAX(id) FROM Produto), (SELECT MAX(pedido_id) FROM Produto_Pedido),
+               (SELECT MIN(usuario) FROM funcionario), (SELECT MAX(data_hora) FROM Pedido);
+    """)
+    produto, pedido, usuario, data_hora = cursor.fetchone()
+    fim = data_hora or datetime.now()
+    amostras = {
+        "produto": produto or 1, "pedido": pedido or 1, "usuario": usuario or "",
+        "periodo": (fim - timedelta(days=1), fim),
+    }
+    fks_sem_indice = chaves_estrangeiras_sem_indice(cursor)
+    cursor.close()
+    bd.commit()
+
+    reprovado = False
+    print(f"{'método':<45} {'varreduras sequenciais'}")
+    try:
+        with bd.transacao():
+            conexao = bd.post_client
+            conexao.cursor_factory = CursorExplain
+            for nome, funcao, leitura_completa in chamadas(amostras):
+                CursorExplain.planos.clear()
+                try:
+                    with bd.transacao():
+                        funcao()
+                        raise DesfazerVerificacao()
+                except (DesfazerVerificacao, ErroTransacao):
+                    pass
+
+                varreduras = sorted({
+                    tabela for _, plano in CursorExplain.planos for tabela in varreduras_sequenciais(plano)
+                    if linhas.get(tabela.lower(), 0) > limite
+                })
+                if not CursorExplain.planos:
+                    situacao = "nenhum comando executado"
+                elif not varreduras:
+                    situacao = "ok"
+                elif leitura_completa:
+                    situacao = f"{', '.join(varreduras)} (esperado)"
+                else:
+                    situacao = f"FALHA: {', '.join(varreduras)}"
+                    reprovado = True
+                print(f"{nome:<45} {situacao}")
+            conexao.cursor_factory = None
+            raise DesfazerVerificacao()
+    except DesfazerVerificacao:
+        pass
+    finally:
+        CursorExplain.planos.clear()
+
+    for tabela, restricao in fks_sem_indice:
+        print(f"FALHA: chave estrangeira {restricao} de {tabela} sem índice")
+        reprovado = True
+
+    print("Reprovado." if reprovado else "Aprovado.")
+    return 1 if reprovado else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica os planos de execução das consultas.")
+    parser.add_argument("--limite", type=int, default=1000, help="Linhas a partir das quais um Seq Scan reprova a verificação.")
+    parser.add_argument("--analisar", action="store_true", help="Executa ANALYZE nas tabelas antes da verificação.")
+    argumentos = parser.parse_args()
+    sys.exit(main(argumentos.limite, argumentos.analisar))
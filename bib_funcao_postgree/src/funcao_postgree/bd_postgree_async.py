@@ -0,0 +1,942 @@
+"""
+Módulo com as versões assíncronas (asyncio) das classes de acesso ao banco de dados PostgreSQL.
+
+As classes deste módulo têm os mesmos métodos das classes bloqueantes (`BdProduto`, `BdPedido`,
+`BdPedidoProduto` e `BdFuncionario`), porém todos devem ser aguardados com `await`. O esquema
+é criado pelas migrações de `bd_postgree_migracoes`, aplicadas pelas classes bloqueantes.
+
+Requer a dependência opcional `psycopg[binary,pool]`, instalada com `pip install funcao_postgree[async]`.
+"""
+
+import asyncio
+import json
+import random
+import string
+from contextlib import asynccontextmanager
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Tuple, TypeVar, Union
+from passlib.hash import pbkdf2_sha256 # type: ignore
+from .bd_postgree_modelos import Funcionario, ItemPedido, Pedido, Produto
+from .bd_postgree_pedido import CONDICAO_PEDIDOS_ABERTOS, CONSULTA_PEDIDOS
+from .bd_postgree_pedido_produto import CONSULTA_PEDIDOS_COMPLETOS, pedido_completo_de_linha
+
+try:
+    from psycopg.errors import CheckViolation
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:
+    CheckViolation = None
+    AsyncConnectionPool = None
+
+T = TypeVar("T")
+
+
+class Bd_BaseAsync:
+    """
+    Classe base assíncrona para conexão com o banco de dados PostgreSQL.
+
+    Mantém um pool de conexões assíncrono compartilhado por todas as classes. Cada operação
+    retira uma conexão do pool, executa sua transação e a devolve ao final, de forma que
+    várias tarefas do mesmo event loop consultem o banco ao mesmo tempo.
+
+    Atributos:
+        pool (psycopg_pool.AsyncConnectionPool): Pool de conexões assíncrono compartilhado.
+        host (str): Endereço do host do banco de dados.
+        database (str): Nome do banco de dados.
+        user (str): Nome do usuário para autenticação.
+        password (str): Senha do usuário para autenticação.
+        tamanho_minimo (int): Quantidade de conexões abertas na criação do pool.
+        tamanho_maximo (int): Quantidade máxima de conexões abertas ao mesmo tempo.
+    """
+
+    pool = None
+    host = None
+    database = None
+    user = None
+    password = None
+    tamanho_minimo = 1
+    tamanho_maximo = 20
+
+    _trava_pool = None
+
+    def __init__(self, host: str = "localhost", database: str = "database-postgres", user: str = "root", password: str = "root",
+                 tamanho_minimo: int = 1, tamanho_maximo: int | None = None) -> None:
+        """
+        Guarda os dados de conexão. O pool é aberto na primeira operação.
+
+        Args:
+            host (str): Endereço do host do banco de dados. Default é "localhost".
+            database (str): Nome do banco de dados. Default é "database-postgres".
+            user (str): Nome do usuário para autenticação. Default é "root".
+            password (str): Senha do usuário para autenticação. Default é "root".
+            tamanho_minimo (int): Conexões abertas na criação do pool. Default é 1.
+            tamanho_maximo (int | None): Limite de conexões simultâneas. Default é 20.
+
+        Raises:
+            ImportError: Se a dependência opcional psycopg não estiver instalada.
+        """
+        if AsyncConnectionPool is None:
+            raise ImportError("As classes assíncronas precisam do pacote 'psycopg[binary,pool]'.")
+
+        if Bd_BaseAsync.host is None:
+            Bd_BaseAsync.host = host
+            Bd_BaseAsync.database = database
+            Bd_BaseAsync.user = user
+            Bd_BaseAsync.password = password
+            Bd_BaseAsync.tamanho_minimo = tamanho_minimo
+            if tamanho_maximo is not None:
+                Bd_BaseAsync.tamanho_maximo = tamanho_maximo
+
+    async def _obter_pool(self) -> "AsyncConnectionPool":
+        """
+        Retorna o pool de conexões, abrindo-o na primeira chamada.
+
+        Returns:
+            AsyncConnectionPool: Pool de conexões aberto.
+        """
+        if Bd_BaseAsync.pool is None:
+            if Bd_BaseAsync._trava_pool is None:
+                Bd_BaseAsync._trava_pool = asyncio.Lock()
+            async with Bd_BaseAsync._trava_pool:
+                if Bd_BaseAsync.pool is None:
+                    print("[LOG INFO] Abrindo pool assíncrono do PostgreSQL em:", Bd_BaseAsync.host)
+                    pool = AsyncConnectionPool(
+                        kwargs={
+                            "host": Bd_BaseAsync.host,
+                            "dbname": Bd_BaseAsync.database,
+                            "user": Bd_BaseAsync.user,
+                            "password": Bd_BaseAsync.password,
+                        },
+                        min_size=Bd_BaseAsync.tamanho_minimo,
+                        max_size=Bd_BaseAsync.tamanho_maximo,
+                        open=False,
+                    )
+                    await pool.open(wait=True)
+                    Bd_BaseAsync.pool = pool
+                    print("[LOG INFO] Pool assíncrono conectado ao PostgreSQL em:", Bd_BaseAsync.host)
+        return Bd_BaseAsync.pool
+
+    @asynccontextmanager
+    async def conexao(self) -> AsyncIterator:
+        """
+        Retira uma conexão do pool durante o bloco `async with`.
+
+        A transação é confirmada ao final do bloco, ou desfeita se uma exceção for lançada.
+
+        Yields:
+            psycopg.AsyncConnection: Conexão retirada do pool.
+        """
+        pool = await self._obter_pool()
+        async with pool.connection() as conexao:
+            yield conexao
+
+    async def _executar_criando_particao(self, operacao: Callable[..., Awaitable[T]], data_hora: datetime) -> T:
+        """
+        Executa uma gravação em Pedido/Produto_Pedido, criando a partição do mês se ela faltar.
+
+        Mesmo comportamento de `Bd_Base._executar_criando_particao`: se o pedido cair em um mês
+        sem partição, as partições do mês de `data_hora` são criadas e a operação é repetida uma
+        vez, em uma nova transação.
+
+        Args:
+            operacao (Callable[..., Awaitable[T]]): Recebe a conexão e executa a gravação.
+            data_hora (datetime): Data/hora do pedido gravado.
+
+        Returns:
+            T: Retorno de `operacao`, após o commit.
+        """
+        try:
+            async with self.conexao() as conexao:
+                return await operacao(conexao)
+        except CheckViolation as erro:
+            falha = erro
+
+        async with self.conexao() as conexao:
+            cursor = await conexao.execute("SELECT criar_particoes_pedidos(%s::date, %s::date)", (data_hora, data_hora))
+            if not (await cursor.fetchone())[0]:
+                # A partição do mês já existia: a falha veio de outra restrição.
+                raise falha
+            print(f"[LOG AVISO] Partições de pedidos do mês de {data_hora} criadas na gravação. Verifique a manutenção das partições.")
+            return await operacao(conexao)
+
+    def estatisticas_pool(self) -> dict:
+        """
+        Retorna as estatísticas de uso do pool de conexões assíncrono.
+
+        Returns:
+            dict: Estatísticas fornecidas pelo psycopg_pool, ou um dicionário vazio se o pool não foi aberto.
+        """
+        if Bd_BaseAsync.pool is None:
+            return {}
+        return Bd_BaseAsync.pool.get_stats()
+
+    @classmethod
+    async def fechar_pool(cls) -> None:
+        """
+        Fecha todas as conexões do pool assíncrono.
+
+        A trava de abertura do pool também é descartada: ela fica presa ao event loop em que foi
+        usada, e o pool pode ser aberto de novo em outro loop (por exemplo em outro `asyncio.run`).
+        """
+        if Bd_BaseAsync.pool is not None:
+            await Bd_BaseAsync.pool.close()
+            Bd_BaseAsync.pool = None
+        Bd_BaseAsync._trava_pool = None
+
+
+class BdProdutoAsync(Bd_BaseAsync):
+    """
+    Versão assíncrona de `BdProduto`.
+    """
+
+    async def insert_produto(self, produto: Union[Produto, str]) -> bool:
+        """
+        Insere um produto no banco de dados.
+
+        Args:
+            produto (Union[Produto, str]): Produto, ou seus dados em formato JSON.
+
+        Returns:
+            bool: True se a inserção foi bem sucedida, False caso contrário.
+        """
+        retorno = True
+        try:
+            if not isinstance(produto, Produto):
+                produto = Produto(**json.loads(produto))
+            async with self.conexao() as conexao:
+                await conexao.execute("""
+                    INSERT INTO Produto (nome, preco, disponivel)
+                    VALUES (%s, %s, %s)
+                """, (produto.nome, produto.preco, produto.disponivel))
+        except Exception as e:
+            print("[LOG ERRO] Erro ao inserir produto: ", e)
+            retorno = False
+
+        return retorno
+
+    async def atualizar_produto(self, produto: Union[Produto, str], id_produto: int) -> bool:
+        """
+        Atualiza um produto no banco de dados.
+
+        Args:
+            produto (Union[Produto, str]): Produto, ou seus dados em formato JSON.
+            id_produto (int): ID do produto a ser atualizado.
+
+        Returns:
+            bool: True se a atualização foi bem sucedida, False caso contrário.
+        """
+        retorno = True
+        try:
+            if not isinstance(produto, Produto):
+                produto = Produto(**json.loads(produto))
+            async with self.conexao() as conexao:
+                await conexao.execute("""
+                    UPDATE Produto
+                    SET nome = %s, preco = %s, disponivel = %s
+                    WHERE id = %s
+                """, (produto.nome, produto.preco, produto.disponivel, id_produto))
+        except Exception as e:
+            print("[LOG ERRO] Erro ao atualizar produto: ", e)
+            retorno = False
+
+        return retorno
+
+    async def remover_produto(self, id_produto: int) -> bool:
+        """
+        Remove um produto do banco de dados.
+
+        Args:
+            id_produto (int): ID do produto a ser removido.
+
+        Returns:
+            bool: True se a remoção foi bem sucedida, False caso contrário.
+        """
+        retorno = True
+        try:
+            async with self.conexao() as conexao:
+                await conexao.execute("DELETE FROM Produto WHERE id = %s;", (id_produto,))
+        except Exception as e:
+            print("[LOG ERRO] Erro ao remover produto: ", e)
+            retorno = False
+
+        return retorno
+
+    async def trocar_disponibilidade(self, id_produto: int) -> bool:
+        """
+        Troca a disponibilidade de um produto no banco de dados, em um único UPDATE.
+
+        Args:
+            id_produto (int): ID do produto a ter a disponibilidade trocada.
+
+        Returns:
+            bool: True se a troca foi bem sucedida, False caso contrário ou se o produto não existe.
+        """
+        retorno = True
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute(
+                    "UPDATE Produto SET disponivel = NOT disponivel WHERE id = %s RETURNING disponivel;",
+                    [id_produto]
+                )
+                if await cursor.fetchone() is None:
+                    raise ValueError(f"produto {id_produto} não encontrado")
+        except Exception as e:
+            print("[LOG ERRO] Erro ao trocar disponibilidade: ", e)
+            retorno = False
+
+        return retorno
+
+    async def definir_disponibilidade(self, ids: Iterable[int], disponivel: bool) -> Union[List[int], None]:
+        """
+        Define a disponibilidade de vários produtos em um único UPDATE.
+
+        Args:
+            ids (Iterable[int]): IDs dos produtos.
+            disponivel (bool): Nova disponibilidade.
+
+        Returns:
+            Union[List[int], None]: IDs dos produtos alterados, em ordem, ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("""
+                    UPDATE Produto SET disponivel = %s
+                    WHERE id = ANY(%s) AND disponivel IS DISTINCT FROM %s
+                    RETURNING id;
+                """, (disponivel, [int(id) for id in ids], disponivel))
+                return sorted(id for (id,) in await cursor.fetchall())
+        except Exception as e:
+            print("[LOG ERRO] Erro ao definir disponibilidade: ", e)
+            return None
+
+    async def get(self, id: int) -> Union[Produto, None]:
+        """
+        Consulta um produto no banco de dados.
+
+        Args:
+            id (int): ID do produto a ser consultado.
+
+        Returns:
+            Union[Produto, None]: Produto encontrado, ou None caso não seja encontrado.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("SELECT * FROM Produto WHERE id = %s;", [id])
+                linha = await cursor.fetchone()
+            return Produto.de_linha(linha) if linha is not None else None
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar dados: {e}")
+            return None
+
+    async def get_all(self) -> List[Produto]:
+        """
+        Consulta todos os produtos no banco de dados.
+
+        Returns:
+            List[Produto]: Lista com os produtos.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("SELECT * FROM Produto ORDER BY id ASC;")
+                return [Produto.de_linha(linha) for linha in await cursor.fetchall()]
+        except Exception:
+            return []
+
+    async def get_produto_csv(self) -> str:
+        """
+        Busca os produtos do banco de dados e converte para um texto CSV.
+
+        Returns:
+            str: Texto CSV com os produtos, ou uma string vazia em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("SELECT * FROM Produto;")
+                produtos = await cursor.fetchall()
+
+            csv = "id,nome,preco,disponivel\n"
+            for produto in produtos:
+                csv += f"{produto[0]},{produto[1]},{produto[2]},{produto[3]}\n"
+            return csv
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao buscar produtos: {e}")
+            return ""
+
+
+class BdPedidoAsync(Bd_BaseAsync):
+    """
+    Versão assíncrona de `BdPedido`.
+    """
+
+    async def editar_status(self, status: str, id_pedido: int) -> bool:
+        """
+        Edita o status de um pedido no banco de dados.
+
+        Args:
+            status (str): Novo status do pedido.
+            id_pedido (int): ID do pedido a ser editado.
+
+        Returns:
+            bool: True se a edição foi bem-sucedida, False caso contrário.
+        """
+        retorno = True
+        try:
+            async with self.conexao() as conexao:
+                await conexao.execute("""
+                    UPDATE Pedido
+                    SET status = codigo_status_pedido(%s)
+                    WHERE id = %s
+                """, (status, id_pedido))
+        except Exception as e:
+            print("[LOG ERRO] Erro ao editar status do pedido: ", e)
+            retorno = False
+
+        return retorno
+
+    async def editar_status_em_lote(self, ids: Iterable[int], status: str) -> Union[List[int], None]:
+        """
+        Edita o status de vários pedidos em um único UPDATE.
+
+        Args:
+            ids (Iterable[int]): IDs dos pedidos.
+            status (str): Novo status dos pedidos.
+
+        Returns:
+            Union[List[int], None]: IDs dos pedidos alterados, em ordem, ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("""
+                    UPDATE Pedido SET status = codigo_status_pedido(%s)
+                    WHERE id = ANY(%s) AND status IS DISTINCT FROM codigo_status_pedido(%s)
+                    RETURNING id;
+                """, (status, [int(id) for id in ids], status))
+                return sorted(id for (id,) in await cursor.fetchall())
+        except Exception as e:
+            print("[LOG ERRO] Erro ao editar status dos pedidos: ", e)
+            return None
+
+    async def editar_status_dos_abertos(self, status: str, mesa: int | None = None, status_atual: str | None = None) -> Union[List[int], None]:
+        """
+        Edita o status dos pedidos abertos que atendem aos filtros em um único UPDATE.
+
+        Args:
+            status (str): Novo status dos pedidos.
+            mesa (int | None): Se informado, altera apenas os pedidos dessa mesa.
+            status_atual (str | None): Se informado, altera apenas os pedidos com esse status.
+
+        Returns:
+            Union[List[int], None]: IDs dos pedidos alterados, em ordem, ou None em caso de erro.
+        """
+        condicoes = [CONDICAO_PEDIDOS_ABERTOS, "status IS DISTINCT FROM codigo_status_pedido(%s)"]
+        parametros = [status, status]
+        if mesa is not None:
+            condicoes.append("mesa = %s")
+            parametros.append(mesa)
+        if status_atual is not None:
+            condicoes.append("status = codigo_status_pedido(%s)")
+            parametros.append(status_atual)
+
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute(
+                    f"UPDATE Pedido SET status = codigo_status_pedido(%s) WHERE {' AND '.join(condicoes)} RETURNING id;",
+                    parametros
+                )
+                return sorted(id for (id,) in await cursor.fetchall())
+        except Exception as e:
+            print("[LOG ERRO] Erro ao editar status dos pedidos abertos: ", e)
+            return None
+
+    async def insert_pedido(self, pedido: Union[Pedido, str]) -> bool:
+        """
+        Insere um pedido no banco de dados.
+
+        Args:
+            pedido (Union[Pedido, str]): Pedido, ou seus dados em formato JSON.
+
+        Returns:
+            bool: True se a inserção foi bem-sucedida, False caso contrário.
+        """
+        retorno = True
+        try:
+            if not isinstance(pedido, Pedido):
+                pedido = Pedido(**json.loads(pedido))
+            await self._executar_criando_particao(lambda conexao: conexao.execute("""
+                INSERT INTO Pedido (mesa, status, data_hora)
+                VALUES (%s, codigo_status_pedido(%s), %s)
+            """, (pedido.mesa, pedido.status, pedido.data_hora)), pedido.data_hora)
+        except Exception as e:
+            print("[LOG ERRO] Erro ao inserir pedido: ", e)
+            retorno = False
+
+        return retorno
+
+    async def get_last_1000(self) -> Union[List[Pedido], None]:
+        """
+        Retorna os 1000 últimos pedidos do banco de dados.
+
+        Returns:
+            Union[List[Pedido], None]: Lista com os pedidos ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute(CONSULTA_PEDIDOS + "ORDER BY Pedido.id DESC LIMIT 1000;")
+                return [Pedido.de_linha(linha) for linha in await cursor.fetchall()]
+        except Exception:
+            return None
+
+    async def get_abertos(self) -> Union[List[Pedido], None]:
+        """
+        Retorna a fila de pedidos abertos (status não final), do mais antigo ao mais recente.
+
+        Returns:
+            Union[List[Pedido], None]: Pedidos abertos ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute(
+                    CONSULTA_PEDIDOS + f"WHERE Pedido.{CONDICAO_PEDIDOS_ABERTOS} ORDER BY Pedido.data_hora, Pedido.id;"
+                )
+                return [Pedido.de_linha(linha) for linha in await cursor.fetchall()]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar pedidos abertos: {e}")
+            return None
+
+    async def get_por_periodo(self, inicio: datetime, fim: datetime) -> Union[List[Pedido], None]:
+        """
+        Retorna os pedidos feitos no período [inicio, fim), do mais antigo ao mais recente.
+
+        Args:
+            inicio (datetime): Início do período (inclusive).
+            fim (datetime): Fim do período (exclusive).
+
+        Returns:
+            Union[List[Pedido], None]: Pedidos do período ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute(
+                    CONSULTA_PEDIDOS + "WHERE Pedido.data_hora >= %s AND Pedido.data_hora < %s ORDER BY Pedido.data_hora, Pedido.id;",
+                    (inicio, fim)
+                )
+                return [Pedido.de_linha(linha) for linha in await cursor.fetchall()]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar pedidos do período: {e}")
+            return None
+
+    async def marcador_atual(self) -> Union[int, None]:
+        """
+        Retorna o marcador a partir do qual `get_alterados_desde` deve buscar as alterações.
+
+        Returns:
+            Union[int, None]: Marcador atual ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("SELECT txid_snapshot_xmin(txid_current_snapshot());")
+                return (await cursor.fetchone())[0]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar o marcador de alterações: {e}")
+            return None
+
+    async def get_alterados_desde(self, marcador: int) -> Union[Tuple[List[Pedido], int], None]:
+        """
+        Retorna os pedidos inseridos ou alterados desde o marcador.
+
+        Args:
+            marcador (int): Marcador retornado pela consulta anterior ou por `marcador_atual`.
+
+        Returns:
+            Union[Tuple[List[Pedido], int], None]: Pedidos alterados, do mais recente ao mais
+                antigo, e o marcador para a próxima consulta, ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("SELECT txid_snapshot_xmin(txid_current_snapshot());")
+                proximo_marcador = (await cursor.fetchone())[0]
+                cursor = await conexao.execute(
+                    CONSULTA_PEDIDOS + "WHERE Pedido.versao >= %s ORDER BY Pedido.id DESC;",
+                    (marcador,)
+                )
+                pedidos = [Pedido.de_linha(linha) for linha in await cursor.fetchall()]
+            return pedidos, proximo_marcador
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar pedidos alterados: {e}")
+            return None
+
+    async def get_all(self) -> Union[List[Pedido], None]:
+        """
+        Retorna todos os pedidos do banco de dados.
+
+        Returns:
+            Union[List[Pedido], None]: Lista com os pedidos ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute(CONSULTA_PEDIDOS + ";")
+                return [Pedido.de_linha(linha) for linha in await cursor.fetchall()]
+        except Exception:
+            return None
+
+    async def get_pedidos_csv(self) -> str:
+        """
+        Busca os pedidos do banco de dados e converte para um texto CSV.
+
+        Returns:
+            str: Texto CSV com os pedidos ou uma string vazia em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute(CONSULTA_PEDIDOS + ";")
+                rows = await cursor.fetchall()
+                headers = [desc[0] for desc in cursor.description]
+
+            csv_text = ",".join(headers) + "\n"
+            for row in rows:
+                csv_text += ",".join(str(cell) for cell in row) + "\n"
+            return csv_text
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao buscar pedidos: {e}")
+            return ""
+
+
+class BdPedidoProdutoAsync(Bd_BaseAsync):
+    """
+    Versão assíncrona de `BdPedidoProduto`.
+    """
+
+    async def inserir_pedido_com_produtos(self, produtos: List[Union[ItemPedido, Dict[str, int | float]]], mesa: int, status: str) -> Union[Tuple[int, Decimal], bool]:
+        """
+        Insere um pedido e seus produtos no banco de dados, em um único comando.
+
+        Args:
+            produtos (List[Union[ItemPedido, Dict[str, int | float]]]): Itens a serem inseridos no
+                pedido, ou dicionários com as chaves 'produto_id', 'quantidade' e 'preco_pago'.
+            mesa (int): Número da mesa do pedido.
+            status (str): Status do pedido.
+
+        Returns:
+            Union[Tuple[int, Decimal], bool]: ID do pedido criado e o total dos itens, ou False
+                caso a inserção falhe.
+        """
+        try:
+            itens = [
+                ItemPedido(**produto) if isinstance(produto, dict) else produto
+                for produto in produtos
+            ]
+            data_hora = datetime.now()
+
+            async def inserir(conexao):
+                cursor = await conexao.execute("""
+                    WITH novo_pedido AS (
+                        INSERT INTO Pedido (mesa, status, data_hora) VALUES (%s, codigo_status_pedido(%s), %s) RETURNING id, data_hora
+                    ), novos_itens AS (
+                        INSERT INTO Produto_Pedido (pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago)
+                        SELECT novo_pedido.id, novo_pedido.data_hora, item.produto_id, item.quantidade, item.preco_pago
+                        FROM novo_pedido, unnest(%s::int[], %s::int[], %s::numeric[])
+                            AS item (produto_id, quantidade, preco_pago)
+                        RETURNING quantidade * preco_pago AS total_item
+                    )
+                    SELECT novo_pedido.id, (SELECT COALESCE(SUM(total_item), 0) FROM novos_itens)
+                    FROM novo_pedido;
+                """, (
+                    mesa,
+                    status,
+                    data_hora,
+                    [item.produto_id for item in itens],
+                    [item.quantidade for item in itens],
+                    # Os preços vão como Decimal para que a lista tenha um único tipo.
+                    [Decimal(str(item.preco_pago)) for item in itens],
+                ))
+                return await cursor.fetchone()
+
+            pedido_id, total = await self._executar_criando_particao(inserir, data_hora)
+
+            print(f"[LOG INFO] Pedido {pedido_id} e produtos inseridos com sucesso!")
+            return pedido_id, total
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao inserir pedido e produtos: {e}")
+            return False
+
+    async def inserir_pedidos_em_lote(self, pedidos: Iterable[Tuple[Pedido, List[Union[ItemPedido, Dict[str, int | float]]]]]) -> Union[List[int], None]:
+        """
+        Insere vários pedidos com seus itens em uma única transação, com COPY para tabelas
+        temporárias e um INSERT ... SELECT para cada tabela. As partições dos meses do lote que
+        ainda não existirem são criadas na mesma transação.
+
+        Args:
+            pedidos (Iterable[Tuple[Pedido, List[Union[ItemPedido, Dict[str, int | float]]]]]): Pares
+                (pedido, itens).
+
+        Returns:
+            Union[List[int], None]: ID gravado para cada pedido, na mesma ordem da entrada, ou None
+                em caso de erro.
+        """
+        pedidos = list(pedidos)
+        if not pedidos:
+            return []
+
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute(
+                    "SELECT nextval(pg_get_serial_sequence('pedido', 'id')) FROM generate_series(1, %s);",
+                    (len(pedidos),)
+                )
+                ids = sorted(id for (id,) in await cursor.fetchall())
+
+                datas = [pedido.data_hora for pedido, _ in pedidos]
+                await conexao.execute("SELECT criar_particoes_pedidos(%s::date, %s::date)", (min(datas), max(datas)))
+
+                await conexao.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS lote_pedido (
+                        id INT, mesa INT, status VARCHAR(255), data_hora TIMESTAMP
+                    ) ON COMMIT DELETE ROWS
+                """)
+                await conexao.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS lote_produto_pedido (
+                        pedido_id INT, pedido_data_hora TIMESTAMP, produto_id INT, quantidade INT, preco_pago DECIMAL(10, 2)
+                    ) ON COMMIT DELETE ROWS
+                """)
+                await conexao.execute("TRUNCATE lote_pedido, lote_produto_pedido")
+
+                async with conexao.cursor() as cursor:
+                    async with cursor.copy("COPY lote_pedido (id, mesa, status, data_hora) FROM STDIN") as copia:
+                        for pedido_id, (pedido, _) in zip(ids, pedidos):
+                            await copia.write_row((pedido_id, pedido.mesa, pedido.status, pedido.data_hora))
+                    async with cursor.copy(
+                        "COPY lote_produto_pedido (pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago) FROM STDIN"
+                    ) as copia:
+                        for pedido_id, (pedido, itens) in zip(ids, pedidos):
+                            for item in itens:
+                                if isinstance(item, dict):
+                                    item = ItemPedido(**item)
+                                await copia.write_row((pedido_id, pedido.data_hora, item.produto_id, item.quantidade, item.preco_pago))
+
+                await conexao.execute("""
+                    INSERT INTO Pedido (id, mesa, status, data_hora)
+                    SELECT id, mesa, codigo_status_pedido(status), data_hora FROM lote_pedido
+                """)
+                await conexao.execute("""
+                    INSERT INTO Produto_Pedido (pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago)
+                    SELECT pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago FROM lote_produto_pedido
+                """)
+
+            print(f"[LOG INFO] {len(ids)} pedidos inseridos em lote.")
+            return ids
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao inserir pedidos em lote: {e}")
+            return None
+
+    async def get_produtos_do_pedido(self, id_pedido: int) -> List[ItemPedido] | None:
+        """
+        Busca os produtos de um pedido no banco de dados.
+
+        Args:
+            id_pedido (int): ID do pedido.
+
+        Returns:
+            List[ItemPedido] | None: Itens do pedido, com o nome do produto, ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("""
+                    SELECT Produto_Pedido.produto_id, Produto.nome, Produto_Pedido.quantidade, Produto_Pedido.preco_pago
+                    FROM Produto_Pedido
+                    JOIN Produto ON Produto_Pedido.produto_id = Produto.id
+                    -- A data/hora do pedido vem de uma subconsulta (executada antes da leitura dos itens):
+                    -- com ela, apenas a partição de Produto_Pedido do mês do pedido é lida. Em um JOIN com
+                    -- Pedido o planejador procura o pedido_id em todas as partições.
+                    WHERE Produto_Pedido.pedido_id = %s
+                      AND Produto_Pedido.pedido_data_hora = (SELECT data_hora FROM Pedido WHERE id = %s);
+                """, (id_pedido, id_pedido))
+                produtos = await cursor.fetchall()
+
+            return [
+                ItemPedido(produto_id, quantidade, preco_pago, nome, id_pedido)
+                for produto_id, nome, quantidade, preco_pago in produtos
+            ]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao buscar produtos do pedido: {e}")
+            return None
+
+    async def get_pedidos_completos(self, ids: Iterable[int]) -> List[Tuple[Pedido, List[ItemPedido]]] | None:
+        """
+        Busca vários pedidos com todos os seus itens em uma única consulta.
+
+        Args:
+            ids (Iterable[int]): IDs dos pedidos.
+
+        Returns:
+            List[Tuple[Pedido, List[ItemPedido]]] | None: Pares (pedido, itens com o nome do produto),
+                em ordem de id, ou None em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute(CONSULTA_PEDIDOS_COMPLETOS, ([int(id) for id in ids],))
+                return [pedido_completo_de_linha(linha) for linha in await cursor.fetchall()]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao buscar pedidos completos: {e}")
+            return None
+
+    async def get_pedidos_produto_csv(self) -> str:
+        """
+        Busca os pedidos e produtos do banco de dados e converte para um texto CSV.
+
+        Returns:
+            str: Texto CSV com os pedidos e produtos ou uma string vazia em caso de erro.
+        """
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("""
+                    SELECT Produto_Pedido.id, Produto_Pedido.pedido_id, Produto_Pedido.produto_id, Produto_Pedido.quantidade, Produto_Pedido.preco_pago
+                    FROM Produto_Pedido;
+                """)
+                rows = await cursor.fetchall()
+                headers = [desc[0] for desc in cursor.description]
+
+            csv_text = ",".join(headers) + "\n"
+            for row in rows:
+                csv_text += ",".join(str(cell) for cell in row) + "\n"
+            return csv_text
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao buscar pedidos e produtos: {e}")
+            return ""
+
+
+class BdFuncionarioAsync(Bd_BaseAsync):
+    """
+    Versão assíncrona de `BdFuncionario`.
+
+    O cálculo do hash das senhas é feito em uma thread separada para não bloquear o event loop.
+    """
+
+    async def insert_funcionario(self, funcionario: Union[Funcionario, str]) -> bool:
+        """
+        Insere um novo funcionário no banco de dados.
+
+        Args:
+            funcionario (Union[Funcionario, str]): Funcionário, ou seus dados em formato JSON.
+
+        Returns:
+            bool: True se a inserção foi bem-sucedida, False caso contrário.
+        """
+        retorno = True
+        try:
+            if not isinstance(funcionario, Funcionario):
+                funcionario = Funcionario(**json.loads(funcionario))
+            hash_senha = await asyncio.to_thread(pbkdf2_sha256.hash, funcionario.senha)
+            async with self.conexao() as conexao:
+                await conexao.execute("""
+                    INSERT INTO funcionario (usuario, senha, email)
+                    VALUES (%s, %s, %s)
+                """, (funcionario.usuario, hash_senha, funcionario.email))
+        except Exception as e:
+            print("[LOG ERRO] Erro ao inserir funcionario: ", e)
+            retorno = False
+
+        return retorno
+
+    async def get_email(self, usuario: str) -> str:
+        """
+        Recupera o e-mail de um funcionário com base no nome de usuário.
+
+        Args:
+            usuario (str): Nome de usuário do funcionário.
+
+        Returns:
+            str: E-mail do funcionário, ou uma string vazia se não encontrado.
+        """
+        retorno = ""
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("SELECT email FROM funcionario WHERE usuario = %s", (usuario,))
+                resultado = await cursor.fetchone()
+
+            if resultado:
+                retorno = resultado[0]
+        except Exception as e:
+            print("[LOG ERRO] Erro ao recuperar email: ", e)
+
+        return retorno
+
+    async def validar_acesso(self, usuario: str, senha: str) -> bool:
+        """
+        Valida o acesso de um funcionário com base no nome de usuário e senha.
+
+        Args:
+            usuario (str): Nome de usuário do funcionário.
+            senha (str): Senha do funcionário.
+
+        Returns:
+            bool: True se as credenciais forem válidas, False caso contrário.
+        """
+        retorno = False
+        try:
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("SELECT senha FROM funcionario WHERE usuario = %s", (usuario,))
+                resultado = await cursor.fetchone()
+
+            if resultado:
+                retorno = await asyncio.to_thread(pbkdf2_sha256.verify, senha, resultado[0])
+        except Exception as e:
+            print("[LOG ERRO] Erro ao validar acesso: ", e)
+
+        return retorno
+
+    async def recuperar_senha_usuario(self, email: str) -> Union[Tuple[str, str], bool]:
+        """
+        Gera uma nova senha para um funcionário e a atualiza no banco de dados.
+
+        Args:
+            email (str): E-mail do funcionário.
+
+        Returns:
+            Union[Tuple[str, str], bool]: Nome de usuário e nova senha gerada, ou False se não encontrado.
+        """
+        retorno = False
+        try:
+            nova_senha = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
+            hash_senha = await asyncio.to_thread(pbkdf2_sha256.hash, nova_senha)
+            async with self.conexao() as conexao:
+                cursor = await conexao.execute("""
+                    UPDATE funcionario
+                    SET senha = %s
+                    WHERE email = %s
+                    RETURNING usuario
+                """, (hash_senha, email))
+                resultado = await cursor.fetchone()
+
+            if resultado:
+                retorno = (resultado[0], nova_senha)
+        except Exception as e:
+            print("[LOG ERRO] Erro ao recuperar senha: ", e)
+
+        return retorno
+
+    async def trocar_senha(self, usuario: str, senha: str) -> bool:
+        """
+        Atualiza a senha de um funcionário no banco de dados.
+
+        Args:
+            usuario (str): Nome de usuário do funcionário.
+            senha (str): Nova senha do funcionário.
+
+        Returns:
+            bool: True se a senha foi atualizada com sucesso, False caso contrário.
+        """
+        retorno = False
+        try:
+            hash_senha = await asyncio.to_thread(pbkdf2_sha256.hash, senha)
+            # Se o comando falhar, o bloco `conexao()` desfaz a transação antes de devolver a conexão ao pool.
+            async with self.conexao() as conexao:
+                await conexao.execute("""
+                    UPDATE funcionario
+                    SET senha = %s
+                    WHERE usuario = %s
+                """, (hash_senha, usuario))
+            retorno = True
+        except Exception as e:
+            print("[LOG ERRO] Erro ao trocar senha: ", e)
+
+        return retorno
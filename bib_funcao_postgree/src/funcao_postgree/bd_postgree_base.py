@@ -3,108 +3,513 @@ Módulo com a classe base para conexão com o banco de dados PostgreSQL.
 """
 
 import psycopg2
-from time import sleep
+import psycopg2.errors
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+from .bd_postgree_metricas import CursorInstrumentado
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator, TypeVar
+from time import sleep, perf_counter
+import itertools
+import threading
 import os
 
+T = TypeVar("T")
+
+
+class ErroTransacao(Exception):
+    """
+    Exceção lançada quando um escopo de transação precisou ser desfeito.
+    """
+    pass
+
+
+class ConexaoBase(psycopg2.extensions.connection):
+    """
+    Conexão do pool que guarda quais declarações preparadas já foram registradas nela.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.declaracoes_preparadas = set()
+
+
 class Bd_Base:
     """
     Classe base para conexão com o banco de dados PostgreSQL.
 
-    Essa classe gerencia a conexão com o banco de dados, permitindo obter cursores,
-    realizar commits e reconectar automaticamente em caso de falhas na conexão.
+    Essa classe gerencia um pool de conexões compartilhado por todas as classes de acesso
+    a dados. Cada thread retira sua própria conexão do pool no primeiro uso e a devolve
+    ao final da transação (commit ou rollback), de forma que threads diferentes não
+    disputem a mesma conexão nem desfaçam o trabalho umas das outras.
 
     Atributos:
-        post_client (psycopg2.extensions.connection): Instância da conexão com o banco de dados PostgreSQL.
+        pool (psycopg2.pool.ThreadedConnectionPool): Pool de conexões compartilhado.
         host (str): Endereço do host do banco de dados.
         database (str): Nome do banco de dados.
         user (str): Nome do usuário para autenticação.
         password (str): Senha do usuário para autenticação.
+        tamanho_minimo (int): Quantidade de conexões abertas na criação do pool.
+        tamanho_maximo (int): Quantidade máxima de conexões abertas ao mesmo tempo.
+        tempo_limite_espera (float): Tempo máximo, em segundos, aguardando uma conexão livre.
+        tamanho_lote (int): Linhas buscadas por vez pelos métodos `iter_*` (ver `iterar_consulta`).
+        nome_aplicacao (str): Nome com que as conexões se identificam no PostgreSQL (pg_stat_activity).
+        DECLARACOES_PREPARADAS (dict): Consultas frequentes de cada classe, no formato
+            {nome: (tipos dos parâmetros, SQL com $1, $2, ...)}, executadas com `executar_preparada`.
+        metricas_ativas (bool): Se True, os cursores medem o tempo de cada consulta (ver `ativar_metricas`).
+            Começa ativo quando a variável de ambiente BD_METRICAS é "1".
     """
 
-    post_client = None
+    DECLARACOES_PREPARADAS = {}
 
-    def __init__(self, host: str = "localhost", database: str = "database-postgres", user: str = "root", password: str = "root") -> None:
+    pool = None
+    host = None
+    database = None
+    user = None
+    password = None
+    tamanho_minimo = 1
+    tamanho_maximo = (os.cpu_count() or 1) * 2
+    tempo_limite_espera = 30.0
+    tamanho_lote = 2000
+    nome_aplicacao = "funcao_postgree"
+    metricas_ativas = os.getenv("BD_METRICAS") == "1"
+
+    _local = threading.local()
+    _trava_pool = threading.Lock()
+    _trava_estatisticas = threading.Lock()
+    _trava_migracoes = threading.Lock()
+    _migracoes_aplicadas = False
+    _vagas = None
+    _retiradas = {}
+    _cursores_nomeados = itertools.count(1)
+    _estatisticas = {
+        "retiradas": 0,
+        "em_uso": 0,
+        "esperas": 0,
+        "tempo_espera_total": 0.0,
+        "tempo_espera_maximo": 0.0,
+    }
+
+    def __init__(self, host: str = "localhost", database: str = "database-postgres", user: str = "root", password: str = "root",
+                 tamanho_minimo: int = 1, tamanho_maximo: int | None = None, aplicar_migracoes: bool = True) -> None:
         """
-        Inicializa a conexão com o banco de dados.
+        Inicializa o pool de conexões com o banco de dados, caso ainda não exista.
+
+        Na primeira inicialização do processo também aplica as migrações pendentes do esquema
+        (ver `bd_postgree_migracoes`). As seguintes não executam nenhum comando no banco.
 
         Args:
             host (str): Endereço do host do banco de dados. Default é "localhost".
             database (str): Nome do banco de dados. Default é "database-postgres".
             user (str): Nome do usuário para autenticação. Default é "root".
             password (str): Senha do usuário para autenticação. Default é "root".
+            tamanho_minimo (int): Conexões abertas na criação do pool. Default é 1.
+            tamanho_maximo (int | None): Limite de conexões simultâneas. Default é o dobro de núcleos da máquina.
+            aplicar_migracoes (bool): Se False, não verifica as migrações do esquema. Default é True.
+        """
+        with Bd_Base._trava_pool:
+            if Bd_Base.pool is None:
+                Bd_Base.host = host
+                Bd_Base.database = database
+                Bd_Base.user = user
+                Bd_Base.password = password
+                Bd_Base.tamanho_minimo = tamanho_minimo
+                if tamanho_maximo is not None:
+                    Bd_Base.tamanho_maximo = tamanho_maximo
+                self._conectar()
+
+        if aplicar_migracoes and not Bd_Base._migracoes_aplicadas:
+            self._migrar()
+
+    def _migrar(self) -> None:
+        """
+        Aplica as migrações pendentes do esquema uma única vez por processo.
         """
-        if Bd_Base.post_client is None:
-            self.host = host
-            self.database = database
-            self.user = user
-            self.password = password
-            self._conectar()
+        from .bd_postgree_migracoes import BdMigracoes
+
+        with Bd_Base._trava_migracoes:
+            if not Bd_Base._migracoes_aplicadas:
+                BdMigracoes().aplicar()
+                Bd_Base._migracoes_aplicadas = True
 
     def _conectar(self) -> None:
         """
-        Conecta ao banco de dados PostgreSQL.
+        Cria o pool de conexões com o banco de dados PostgreSQL.
 
-        Estabelece uma conexão com o banco e tenta reconectar automaticamente
-        em caso de falha.
+        Tenta criar o pool repetidamente até que o banco esteja disponível.
         """
         while True:
             try:
-                print("[LOG INFO] Tentando conectar ao PostgreSQL em:", self.host)
-                print("[LOG INFO] database:", self.database)
-                Bd_Base.post_client = psycopg2.connect(
-                    host=self.host,
-                    database=self.database,
-                    user=self.user,
-                    password=self.password
+                print("[LOG INFO] Tentando conectar ao PostgreSQL em:", Bd_Base.host)
+                print("[LOG INFO] database:", Bd_Base.database)
+                Bd_Base.pool = ThreadedConnectionPool(
+                    Bd_Base.tamanho_minimo,
+                    Bd_Base.tamanho_maximo,
+                    host=Bd_Base.host,
+                    database=Bd_Base.database,
+                    user=Bd_Base.user,
+                    password=Bd_Base.password,
+                    application_name=Bd_Base.nome_aplicacao,
+                    connection_factory=ConexaoBase
                 )
-                print("[LOG INFO] Conectado ao PostgreSQL em:", self.host)
+                Bd_Base._vagas = threading.BoundedSemaphore(Bd_Base.tamanho_maximo)
+                with Bd_Base._trava_estatisticas:
+                    Bd_Base._retiradas = {}
+                print(f"[LOG INFO] Conectado ao PostgreSQL em: {Bd_Base.host} (pool de até {Bd_Base.tamanho_maximo} conexões)")
                 break
             except psycopg2.OperationalError as e:
                 print(f"[LOG ERRO] Erro ao conectar ao PostgreSQL: {e}")
                 print("[LOG INFO] Tentando novamente em 2 segundos...")
                 sleep(2)
 
+    @property
+    def post_client(self) -> psycopg2.extensions.connection:
+        """
+        Conexão em uso pela thread atual.
+
+        Retira uma conexão do pool caso a thread ainda não possua uma.
+
+        Returns:
+            psycopg2.extensions.connection: Conexão reservada para a thread atual.
+        """
+        conexao = getattr(Bd_Base._local, "conexao", None)
+        if conexao is None:
+            conexao = self._retirar_do_pool()
+            Bd_Base._local.conexao = conexao
+        return conexao
+
+    def _retirar_do_pool(self) -> psycopg2.extensions.connection:
+        """
+        Retira uma conexão do pool, aguardando uma vaga caso todas estejam em uso.
+
+        Returns:
+            psycopg2.extensions.connection: Conexão retirada do pool.
+
+        Raises:
+            PoolError: Se nenhuma conexão for liberada dentro de `tempo_limite_espera`.
+        """
+        if Bd_Base.pool is None or Bd_Base.pool.closed:
+            with Bd_Base._trava_pool:
+                if Bd_Base.pool is None or Bd_Base.pool.closed:
+                    self._conectar()
+
+        inicio = perf_counter()
+        if not Bd_Base._vagas.acquire(blocking=False):
+            self._recuperar_conexoes_abandonadas()
+            if not Bd_Base._vagas.acquire(timeout=Bd_Base.tempo_limite_espera):
+                raise PoolError(f"Nenhuma conexão livre após {Bd_Base.tempo_limite_espera} segundos.")
+        try:
+            conexao = Bd_Base.pool.getconn()
+        except Exception:
+            Bd_Base._vagas.release()
+            raise
+        espera = perf_counter() - inicio
+
+        with Bd_Base._trava_estatisticas:
+            Bd_Base._retiradas[conexao] = threading.current_thread()
+            estatisticas = Bd_Base._estatisticas
+            estatisticas["retiradas"] += 1
+            estatisticas["em_uso"] += 1
+            estatisticas["tempo_espera_total"] += espera
+            if espera > 0.001:
+                estatisticas["esperas"] += 1
+            if espera > estatisticas["tempo_espera_maximo"]:
+                estatisticas["tempo_espera_maximo"] = espera
+
+        return conexao
+
+    def _devolver_conexao(self, fechar: bool = False) -> None:
+        """
+        Devolve ao pool a conexão da thread atual, caso exista.
+
+        Args:
+            fechar (bool): Se True, a conexão é fechada em vez de reaproveitada.
+        """
+        conexao = getattr(Bd_Base._local, "conexao", None)
+        if conexao is None:
+            return
+
+        Bd_Base._local.conexao = None
+        if not fechar and not conexao.closed and conexao.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            print("[LOG AVISO] Conexão devolvida ao pool com uma transação aberta. A transação será desfeita.")
+        self._devolver_ao_pool(conexao, fechar)
+
+    def _devolver_ao_pool(self, conexao: psycopg2.extensions.connection, fechar: bool = False) -> None:
+        """
+        Devolve uma conexão ao pool e libera a sua vaga.
+
+        Uma conexão que não consta mais como retirada, porque foi recuperada de uma thread
+        encerrada ou porque o pool foi fechado depois da retirada, é apenas fechada: a sua vaga
+        já foi liberada ou pertence a um pool descartado.
+
+        Args:
+            conexao (psycopg2.extensions.connection): Conexão retirada com `_retirar_do_pool`.
+            fechar (bool): Se True, a conexão é fechada em vez de reaproveitada.
+        """
+        with Bd_Base._trava_estatisticas:
+            retirada = Bd_Base._retiradas.pop(conexao, None) is not None
+            if retirada:
+                Bd_Base._estatisticas["em_uso"] -= 1
+
+        if not retirada:
+            try:
+                if not conexao.closed:
+                    conexao.close()
+            except Exception as e:
+                print(f"[LOG ERRO] Erro ao fechar conexão descartada: {e}")
+            return
+
+        try:
+            Bd_Base.pool.putconn(conexao, close=fechar or bool(conexao.closed))
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao devolver conexão ao pool: {e}")
+        finally:
+            Bd_Base._vagas.release()
+
+    def _recuperar_conexoes_abandonadas(self) -> int:
+        """
+        Devolve ao pool, fechadas, as conexões retiradas por threads que já terminaram.
+
+        A conexão de cada thread só volta ao pool no commit ou rollback. Uma thread encerrada
+        antes disso, por exemplo por uma exceção em uma thread de segundo plano, deixaria a
+        vaga ocupada para sempre. Chamado quando não há vaga livre.
+
+        Returns:
+            int: Quantidade de conexões recuperadas.
+        """
+        with Bd_Base._trava_estatisticas:
+            abandonadas = [conexao for conexao, thread in Bd_Base._retiradas.items() if not thread.is_alive()]
+
+        for conexao in abandonadas:
+            print("[LOG AVISO] Conexão de uma thread encerrada recuperada. A transação dela foi desfeita.")
+            self._devolver_ao_pool(conexao, fechar=True)
+        return len(abandonadas)
+
     def get_cursor(self) -> psycopg2.extensions.cursor:
         """
-        Retorna um cursor para a conexão com o banco de dados.
+        Retorna um cursor para a conexão da thread atual.
 
         Verifica se a conexão está ativa antes de retornar o cursor.
 
         Returns:
             psycopg2.extensions.cursor: Cursor para a conexão com o banco de dados.
         """
-        if Bd_Base.post_client.closed:
+        conexao = self.post_client
+        if conexao.closed:
+            if self._escopos():
+                raise ErroTransacao("Conexão perdida durante a transação.")
             print("[LOG INFO] Conexão perdida. Tentando restabelecer...")
             self._reiniciar_coneccao()
-        return Bd_Base.post_client.cursor()
+            conexao = self.post_client
+        elif conexao.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+            self.rollback()
+            conexao = self.post_client
+        if Bd_Base.metricas_ativas:
+            return conexao.cursor(cursor_factory=CursorInstrumentado)
+        return conexao.cursor()
 
-    def _reiniciar_coneccao(self) -> None:
+    def executar_preparada(self, cursor: psycopg2.extensions.cursor, nome: str, parametros: tuple = ()) -> None:
+        """
+        Executa uma das `DECLARACOES_PREPARADAS` da classe pelo nome.
+
+        Na primeira execução em cada conexão a declaração é registrada com PREPARE, e o
+        PostgreSQL passa a reaproveitar a análise e o plano da consulta nas execuções seguintes.
+        Conexões novas, como as criadas após `_reiniciar_coneccao`, registram a declaração
+        novamente no primeiro uso.
+
+        Args:
+            cursor (psycopg2.extensions.cursor): Cursor em que a declaração será executada.
+            nome (str): Nome da declaração em `DECLARACOES_PREPARADAS`.
+            parametros (tuple): Valores dos parâmetros, na ordem de $1, $2, ...
+        """
+        conexao = cursor.connection
+        if nome not in conexao.declaracoes_preparadas:
+            tipos, sql = self.DECLARACOES_PREPARADAS[nome]
+            cursor.execute(f"PREPARE {nome} ({tipos}) AS {sql}")
+            conexao.declaracoes_preparadas.add(nome)
+
+        if parametros:
+            marcadores = ", ".join(["%s"] * len(parametros))
+            cursor.execute(f"EXECUTE {nome} ({marcadores})", parametros)
+        else:
+            cursor.execute(f"EXECUTE {nome}")
+
+    def _executar_criando_particao(self, operacao: Callable[[psycopg2.extensions.cursor], T], data_hora: datetime) -> T:
+        """
+        Executa uma gravação em Pedido/Produto_Pedido, criando a partição do mês se ela faltar.
+
+        As partições são criadas com antecedência pela manutenção do servidor (`BdParticoes`).
+        Se ela deixar de rodar e o pedido cair em um mês sem partição, a transação é desfeita,
+        as partições do mês de `data_hora` são criadas e a operação é repetida uma vez, em uma
+        nova transação. Dentro de `transacao()` a falha é repassada sem repetir, já que o
+        trabalho anterior do bloco foi perdido.
+
+        Args:
+            operacao (Callable[[psycopg2.extensions.cursor], T]): Executa a gravação no cursor recebido.
+            data_hora (datetime): Data/hora do pedido gravado.
+
+        Returns:
+            T: Retorno de `operacao`. A transação fica aberta para o commit de quem chamou.
+
+        Raises:
+            Exception: O erro da gravação, se não for a falta de partição ou se a repetição falhar.
+        """
+        cursor = self.get_cursor()
+        try:
+            return operacao(cursor)
+        except psycopg2.errors.CheckViolation as erro:
+            if self._escopos():
+                raise
+            falha = erro
+        finally:
+            cursor.close()
+
+        self.rollback()
+        cursor = self.get_cursor()
+        try:
+            cursor.execute("SELECT criar_particoes_pedidos(%s::date, %s::date);", (data_hora, data_hora))
+            if not cursor.fetchone()[0]:
+                # A partição do mês já existia: a falha veio de outra restrição.
+                raise falha
+            print(f"[LOG AVISO] Partições de pedidos do mês de {data_hora} criadas na gravação. Verifique a manutenção das partições.")
+            return operacao(cursor)
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def cursor_leitura(self) -> Iterator[psycopg2.extensions.cursor]:
+        """
+        Fornece um cursor para consultas somente de leitura.
+
+        Fora de um bloco `transacao()`, a consulta é executada em modo autocommit: nenhuma
+        transação fica aberta segurando um snapshot ("idle in transaction") e a conexão volta
+        ao pool ao final do bloco. Dentro de `transacao()`, a consulta participa da transação
+        em andamento.
+
+        Yields:
+            psycopg2.extensions.cursor: Cursor para a consulta.
+        """
+        cursor = self.get_cursor()
+        conexao = cursor.connection
+        autocommit = (
+            not self._escopos()
+            and conexao.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        )
+        if autocommit:
+            conexao.autocommit = True
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            if autocommit:
+                try:
+                    conexao.autocommit = False
+                    self._devolver_conexao()
+                except Exception:
+                    self._devolver_conexao(fechar=True)
+
+    def iterar_consulta(self, sql: str, parametros: tuple = (), tamanho_lote: int | None = None) -> Iterator[tuple]:
         """
-        Reinicia a conexão com o banco de dados.
+        Executa uma consulta em um cursor nomeado (do lado do servidor) e gera as linhas aos poucos.
+
+        As linhas são buscadas em lotes de `tamanho_lote`, de forma que a memória usada não
+        depende do tamanho do resultado. Dentro de um bloco `transacao()` a consulta usa a
+        conexão da transação; fora dele usa uma conexão própria do pool, que não interfere
+        nos commits feitos pela thread enquanto as linhas são consumidas, e a devolve ao
+        terminar ou quando o gerador é descartado.
+
+        Args:
+            sql (str): Consulta a ser executada.
+            parametros (tuple): Parâmetros da consulta.
+            tamanho_lote (int | None): Linhas por busca. Default é `tamanho_lote` da classe.
 
-        Fecha a conexão atual, se existir, e tenta estabelecer uma nova conexão.
+        Yields:
+            tuple: Cada linha do resultado.
         """
-        if Bd_Base.post_client is not None:
+        proprio = not self._escopos()
+        conexao = self._retirar_do_pool() if proprio else self.post_client
+        fabrica = CursorInstrumentado if Bd_Base.metricas_ativas else None
+        cursor = conexao.cursor(name=f"iter_{next(Bd_Base._cursores_nomeados)}", cursor_factory=fabrica)
+        cursor.itersize = tamanho_lote or self.tamanho_lote
+        try:
+            cursor.execute(sql, parametros)
+            yield from cursor
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao percorrer a consulta: {e}")
+            raise
+        finally:
+            fechar = False
             try:
-                Bd_Base.post_client.close()
-                print("[LOG INFO] Conexão anterior fechada.")
-            except Exception as e:
-                print(f"[LOG ERRO] Erro ao fechar a conexão anterior: {e}")
-        self._conectar()
+                if not conexao.closed:
+                    cursor.close()
+                    if proprio:
+                        conexao.rollback()
+            except Exception:
+                fechar = True
+            if proprio:
+                self._devolver_ao_pool(conexao, fechar)
+
+    def verificar_transacoes_ociosas(self, limite_segundos: float = 60.0) -> list:
+        """
+        Procura sessões deste banco paradas com uma transação aberta ("idle in transaction").
+
+        Sessões nesse estado seguram um snapshot antigo, impedindo o vacuum de limpar as tabelas.
+        Cada sessão encontrada é registrada no log.
+
+        Args:
+            limite_segundos (float): Tempo mínimo, em segundos, parado com a transação aberta.
+
+        Returns:
+            list: Tuplas (pid, nome da aplicação, segundos ociosa, última consulta) das sessões encontradas.
+        """
+        try:
+            with self.cursor_leitura() as cursor:
+                cursor.execute("""
+                    SELECT pid, application_name,
+                           EXTRACT(EPOCH FROM now() - state_change)::float AS segundos,
+                           query
+                    FROM pg_stat_activity
+                    WHERE datname = current_database()
+                      AND state IN ('idle in transaction', 'idle in transaction (aborted)')
+                      AND now() - state_change > make_interval(secs => %s)
+                    ORDER BY segundos DESC;
+                """, (limite_segundos,))
+                sessoes = cursor.fetchall()
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao verificar transações ociosas: {e}")
+            return []
+
+        for pid, aplicacao, segundos, consulta in sessoes:
+            print(f"[LOG AVISO] Sessão {pid} ({aplicacao}) ociosa em transação há {segundos:.0f}s. Última consulta: {consulta.strip()}")
+        return sessoes
+
+    def _reiniciar_coneccao(self) -> None:
+        """
+        Reinicia a conexão da thread atual.
+
+        Descarta a conexão atual, se existir, e a próxima operação retira uma nova do pool.
+        """
+        if getattr(Bd_Base._local, "conexao", None) is not None:
+            self._devolver_conexao(fechar=True)
+            print("[LOG INFO] Conexão anterior fechada.")
 
     def commit(self) -> None:
         """
-        Realiza o commit da transação.
+        Realiza o commit da transação da thread atual e devolve a conexão ao pool.
 
+        Dentro de um bloco `transacao()` o commit é adiado até o fim do bloco mais externo.
         Tenta executar o commit até 3 vezes em caso de falha, reconectando automaticamente.
 
         Raises:
             SystemExit: Se não for possível realizar o commit após 3 tentativas.
         """
+        if self._escopos():
+            return
+
         qtd_tentativas = 0
         while True and qtd_tentativas < 3:
             try:
-                Bd_Base.post_client.commit()
+                self.post_client.commit()
                 break
             except Exception as e:
                 print(f"[LOG ERRO] Erro ao tentar fazer commit: {e}")
@@ -115,3 +520,205 @@ class Bd_Base:
         if qtd_tentativas == 3:
             print("[LOG ERRO] Não foi possível fazer commit após 3 tentativas. Encerrando...")
             exit(1)
+
+        self._devolver_conexao()
+
+    def rollback(self) -> None:
+        """
+        Desfaz a transação da thread atual e devolve a conexão ao pool.
+
+        Dentro de um bloco `transacao()` desfaz apenas o escopo atual, que fica marcado como
+        revertido e lança `ErroTransacao` ao final do bloco.
+        """
+        conexao = getattr(Bd_Base._local, "conexao", None)
+        if conexao is None:
+            return
+
+        escopos = self._escopos()
+        if escopos:
+            escopos[-1]["revertido"] = True
+            self._desfazer_escopo(escopos[-1])
+            return
+
+        fechar = False
+        try:
+            if not conexao.closed:
+                conexao.rollback()
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao desfazer a transação: {e}")
+            fechar = True
+        self._devolver_conexao(fechar)
+
+    def _escopos(self) -> list:
+        """
+        Retorna a pilha de escopos de transação abertos pela thread atual.
+
+        Returns:
+            list: Escopos abertos, do mais externo para o mais interno.
+        """
+        escopos = getattr(Bd_Base._local, "escopos", None)
+        if escopos is None:
+            escopos = Bd_Base._local.escopos = []
+        return escopos
+
+    def _desfazer_escopo(self, escopo: dict) -> None:
+        """
+        Desfaz o trabalho feito dentro de um escopo de transação, sem devolver a conexão.
+
+        Args:
+            escopo (dict): Escopo a ser desfeito. Escopos aninhados voltam ao seu savepoint.
+        """
+        conexao = getattr(Bd_Base._local, "conexao", None)
+        if conexao is None or conexao.closed:
+            return
+        try:
+            if escopo["savepoint"] is None:
+                conexao.rollback()
+            else:
+                cursor = conexao.cursor()
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {escopo['savepoint']};")
+                cursor.close()
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao desfazer a transação: {e}")
+
+    @contextmanager
+    def transacao(self) -> Iterator[None]:
+        """
+        Agrupa várias operações, de qualquer classe de acesso a dados, em uma única transação.
+
+        Os commits feitos pelos métodos chamados dentro do bloco são adiados e um único commit
+        é feito ao final. Blocos aninhados usam savepoints, podendo ser desfeitos sem afetar
+        o bloco externo. Se uma exceção for lançada, ou se algum método desfizer sua
+        operação, o escopo é desfeito por completo.
+
+        Exemplo:
+            with bd_pedido.transacao():
+                bd_pedido.editar_status("Pedido finalizado", 1)
+                bd_produto.trocar_disponibilidade(3)
+
+        Raises:
+            ErroTransacao: Se alguma operação dentro do bloco foi desfeita.
+        """
+        escopos = self._escopos()
+        savepoint = None
+        if escopos:
+            savepoint = f"escopo_{len(escopos)}"
+            cursor = self.get_cursor()
+            cursor.execute(f"SAVEPOINT {savepoint};")
+            cursor.close()
+        else:
+            self.get_cursor().close()
+
+        escopo = {"savepoint": savepoint, "revertido": False}
+        escopos.append(escopo)
+        try:
+            yield
+        except BaseException:
+            escopos.pop()
+            self._encerrar_escopo_desfeito(escopo)
+            raise
+
+        escopos.pop()
+        if escopo["revertido"]:
+            self._encerrar_escopo_desfeito(escopo)
+            raise ErroTransacao("A transação foi desfeita porque uma das operações falhou.")
+
+        if savepoint is None:
+            self.commit()
+        else:
+            cursor = self.get_cursor()
+            cursor.execute(f"RELEASE SAVEPOINT {savepoint};")
+            cursor.close()
+
+    def _encerrar_escopo_desfeito(self, escopo: dict) -> None:
+        """
+        Desfaz um escopo que está sendo encerrado, liberando seu savepoint ou a conexão.
+
+        Args:
+            escopo (dict): Escopo que acabou de sair da pilha.
+        """
+        self._desfazer_escopo(escopo)
+        if escopo["savepoint"] is None:
+            self._devolver_conexao()
+            return
+
+        conexao = getattr(Bd_Base._local, "conexao", None)
+        try:
+            cursor = conexao.cursor()
+            cursor.execute(f"RELEASE SAVEPOINT {escopo['savepoint']};")
+            cursor.close()
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao liberar o savepoint: {e}")
+
+    @classmethod
+    def estatisticas_pool(cls) -> dict:
+        """
+        Retorna as estatísticas de uso do pool de conexões.
+
+        Returns:
+            dict: Tamanhos mínimo e máximo do pool, conexões em uso, total de retiradas,
+                quantidade de retiradas que precisaram esperar e os tempos de espera em segundos.
+        """
+        with Bd_Base._trava_estatisticas:
+            estatisticas = dict(Bd_Base._estatisticas)
+        estatisticas["tamanho_minimo"] = Bd_Base.tamanho_minimo
+        estatisticas["tamanho_maximo"] = Bd_Base.tamanho_maximo
+        return estatisticas
+
+    @classmethod
+    def fechar_pool(cls) -> None:
+        """
+        Fecha todas as conexões do pool e zera as estatísticas.
+        """
+        with Bd_Base._trava_pool:
+            if Bd_Base.pool is not None and not Bd_Base.pool.closed:
+                Bd_Base.pool.closeall()
+            Bd_Base.pool = None
+            Bd_Base._local = threading.local()
+            with Bd_Base._trava_estatisticas:
+                Bd_Base._retiradas = {}
+                Bd_Base._estatisticas.update(
+                    retiradas=0, em_uso=0, esperas=0, tempo_espera_total=0.0, tempo_espera_maximo=0.0
+                )
+
+    @classmethod
+    def ativar_metricas(cls, limite_consulta_lenta_ms: float = 200.0) -> None:
+        """
+        Passa a medir o tempo de cada consulta executada pelas classes de acesso a dados.
+
+        Cada execução é registrada em um histograma por consulta, e as mais lentas que o limite
+        são registradas no log com os parâmetros ocultados. Com as métricas desativadas os
+        cursores são os comuns do psycopg2, sem nenhum custo extra.
+
+        Args:
+            limite_consulta_lenta_ms (float): Tempo, em milissegundos, a partir do qual uma consulta é lenta.
+        """
+        CursorInstrumentado.metricas.limite_consulta_lenta_ms = limite_consulta_lenta_ms
+        Bd_Base.metricas_ativas = True
+
+    @classmethod
+    def desativar_metricas(cls) -> None:
+        """
+        Para de medir as consultas. As métricas já acumuladas são mantidas.
+        """
+        Bd_Base.metricas_ativas = False
+
+    @classmethod
+    def metricas_consultas(cls) -> dict:
+        """
+        Retorna as métricas acumuladas de cada consulta.
+
+        Returns:
+            dict: Execuções, erros, consultas lentas, tempos e percentis estimados de cada consulta.
+        """
+        return CursorInstrumentado.metricas.resumo()
+
+    @classmethod
+    def relatorio_metricas(cls) -> str:
+        """
+        Retorna as métricas das consultas e do pool formatadas como texto.
+
+        Returns:
+            str: Tabela com as métricas de cada consulta seguida das estatísticas do pool.
+        """
+        return f"{CursorInstrumentado.metricas.relatorio()}\npool: {cls.estatisticas_pool()}"
@@ -5,6 +5,7 @@ Modulo responsável pela adiministração do banco de dados dos funcionários.
 import random
 import string
 from .bd_postgree_base import Bd_Base
+from .bd_postgree_modelos import Funcionario
 from typing import Tuple, Union
 import json
 from passlib.hash import pbkdf2_sha256 # type: ignore
@@ -17,9 +18,14 @@ class BdFuncionario(Bd_Base):
     relacionados aos funcionários.
     """
 
+    DECLARACOES_PREPARADAS = {
+        "funcionario_email": ("VARCHAR", "SELECT email FROM funcionario WHERE usuario = $1"),
+        "funcionario_senha": ("VARCHAR", "SELECT senha FROM funcionario WHERE usuario = $1"),
+    }
+
     def __init__(self, host: str = 'localhost', database: str = 'database-postgres', user: str = 'root', password: str = 'root') -> None:
         """
-        Inicializa a conexão com o banco de dados e cria a tabela funcionario caso ela não exista.
+        Inicializa a conexão com o banco de dados. A tabela funcionario é criada pelas migrações do esquema.
 
         Args:
             host (str): Endereço do host do banco de dados.
@@ -28,53 +34,35 @@ class BdFuncionario(Bd_Base):
             password (str): Senha para autenticação.
         """
         super().__init__(host, database, user, password)
-        self.database_init()
-
-    def database_init(self) -> None:
-        """
-        Cria a tabela funcionario no banco de dados caso ela não exista.
-        """
-        try:
-            cursor = self.get_cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS funcionario (
-                    id SERIAL PRIMARY KEY,
-                    usuario VARCHAR(255) UNIQUE,
-                    senha VARCHAR(255) NOT NULL,
-                    email VARCHAR(255) NOT NULL UNIQUE
-                );
-            """)
-            self.commit()
-        except Exception as e:
-            print(f"[LOG ERRO] Não foi possível criar a tabela: {e}")
-        finally:
-            cursor.close()
 
-    def _format_from_inserct(self, funcionario: str) -> dict:
+    def _format_from_inserct(self, funcionario: Union[Funcionario, str]) -> tuple:
         """
         Formata os dados do funcionário para inserção no banco de dados.
 
         Args:
-            funcionario (str): Dados do funcionário em formato JSON.
+            funcionario (Union[Funcionario, str]): Funcionário, ou seus dados em formato JSON.
 
         Returns:
-            dict: Dicionário contendo os dados formatados para inserção.
+            tuple: Tupla (usuario, hash da senha, email).
         """
+        if isinstance(funcionario, Funcionario):
+            return (funcionario.usuario, pbkdf2_sha256.hash(funcionario.senha), funcionario.email)
         valor = json.loads(funcionario)
         valor["senha"] = pbkdf2_sha256.hash(valor["senha"])
         return (valor['usuario'], valor["senha"], valor["email"])
 
-    def insert_funcionario(self, funcionario: str) -> bool:
+    def insert_funcionario(self, funcionario: Union[Funcionario, str]) -> bool:
         """
         Insere um novo funcionário no banco de dados.
 
         Args:
-            funcionario (str): Dados do funcionário em formato JSON.
+            funcionario (Union[Funcionario, str]): Funcionário, ou seus dados em formato JSON.
 
         Returns:
             bool: True se a inserção foi bem-sucedida, False caso contrário.
         """
         retorno = True
+        cursor = None
         try:
             valor = self._format_from_inserct(funcionario)
             query = """
@@ -86,10 +74,11 @@ class BdFuncionario(Bd_Base):
             self.commit()
         except Exception as e:
             print("[LOG ERRO] Erro ao inserir funcionario: ", e)
-            self.post_client.rollback()
+            self.rollback()
             retorno = False
         finally:
-            cursor.close()
+            if cursor is not None:
+                cursor.close()
 
         return retorno
 
@@ -105,20 +94,14 @@ class BdFuncionario(Bd_Base):
         """
         retorno = ""
         try:
-            query = """
-                SELECT email FROM funcionario 
-                WHERE usuario = %s
-            """
-            cursor = self.get_cursor()
-            cursor.execute(query, (usuario,))
-            resultado = cursor.fetchone()
+            with self.cursor_leitura() as cursor:
+                self.executar_preparada(cursor, "funcionario_email", (usuario,))
+                resultado = cursor.fetchone()
 
             if resultado:
                 retorno = resultado[0]
         except Exception as e:
             print("[LOG ERRO] Erro ao recuperar email: ", e)
-        finally:
-            cursor.close()
 
         return retorno
 
@@ -135,20 +118,14 @@ class BdFuncionario(Bd_Base):
         """
         retorno = False
         try:
-            query = """
-                SELECT senha FROM funcionario 
-                WHERE usuario = %s
-            """
-            cursor = self.get_cursor()
-            cursor.execute(query, (usuario,))
-            resultado = cursor.fetchone()
+            with self.cursor_leitura() as cursor:
+                self.executar_preparada(cursor, "funcionario_senha", (usuario,))
+                resultado = cursor.fetchone()
 
             if resultado:
                 retorno = pbkdf2_sha256.verify(senha, resultado[0])
         except Exception as e:
             print("[LOG ERRO] Erro ao validar acesso: ", e)
-        finally:
-            cursor.close()
 
         return retorno
 
@@ -163,29 +140,29 @@ class BdFuncionario(Bd_Base):
             Union[Tuple[str, str], bool]: Nome de usuário e nova senha gerada, ou False se não encontrado.
         """
         retorno = False
+        cursor = None
 
         try:
-            query_select = """
-                SELECT usuario FROM funcionario
-                WHERE email = %s
-            """
-            query_update = """
+            nova_senha = ''.join(random.choices(string.ascii_letters + string.digits, k=8))  # Gera senha aleatória de 8 caracteres
+            hash_senha = pbkdf2_sha256.hash(nova_senha)
+            cursor = self.get_cursor()
+            # Um único comando: a transação termina logo em seguida, com ou sem funcionário encontrado.
+            cursor.execute("""
                 UPDATE funcionario
                 SET senha = %s
                 WHERE email = %s
-            """
-            cursor = self.get_cursor()
-            cursor.execute(query_select, (email,))
+                RETURNING usuario
+            """, (hash_senha, email))
             resultado = cursor.fetchone()
 
+            # Sem funcionário nada foi alterado: o commit apenas encerra a transação e, dentro de
+            # `transacao()`, é adiado sem desfazer o trabalho anterior do bloco.
+            self.commit()
             if resultado:
-                nova_senha = ''.join(random.choices(string.ascii_letters + string.digits, k=8))  # Gera senha aleatória de 8 caracteres
-                hash_senha = pbkdf2_sha256.hash(nova_senha)
-                cursor.execute(query_update, (hash_senha, email))
-                self.commit()
                 retorno = (resultado[0], nova_senha)
         except Exception as e:
             print("[LOG ERRO] Erro ao recuperar senha: ", e)
+            self.rollback()
         finally:
             if cursor:
                 cursor.close()
@@ -204,6 +181,7 @@ class BdFuncionario(Bd_Base):
             bool: True se a senha foi atualizada com sucesso, False caso contrário.
         """
         retorno = False
+        cursor = None
         try:
             query = """
                 UPDATE funcionario
@@ -216,7 +194,9 @@ class BdFuncionario(Bd_Base):
             retorno = True
         except Exception as e:
             print("[LOG ERRO] Erro ao trocar senha: ", e)
+            self.rollback()
         finally:
-            cursor.close()
+            if cursor is not None:
+                cursor.close()
 
         return retorno
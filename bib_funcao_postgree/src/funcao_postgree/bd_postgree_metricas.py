@@ -0,0 +1,211 @@
+"""
+Módulo com as métricas de tempo das consultas executadas pelas classes de acesso ao banco.
+"""
+
+import psycopg2.extensions
+from bisect import bisect_left
+from time import perf_counter
+import threading
+import sys
+
+
+class MetricasConsultas:
+    """
+    Acumula, para cada consulta nomeada, a quantidade de execuções, os erros e um histograma
+    das latências.
+
+    O nome de uma consulta é o da declaração preparada (EXECUTE nome) ou, nas demais, o método
+    que executou o cursor, por exemplo `BdPedido.get_last_1000`.
+
+    Atributos:
+        LIMITES_MS (tuple): Limite superior, em milissegundos, de cada faixa do histograma.
+            A última faixa guarda as execuções acima do maior limite.
+        limite_consulta_lenta_ms (float): Execuções acima desse tempo são registradas no log.
+    """
+
+    LIMITES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self, limite_consulta_lenta_ms: float = 200.0) -> None:
+        """
+        Inicializa as métricas vazias.
+
+        Args:
+            limite_consulta_lenta_ms (float): Tempo a partir do qual uma execução é considerada lenta.
+        """
+        self.limite_consulta_lenta_ms = limite_consulta_lenta_ms
+        self._trava = threading.Lock()
+        self._consultas = {}
+
+    def registrar(self, nome: str, duracao_ms: float, erro: bool = False) -> None:
+        """
+        Registra uma execução de consulta.
+
+        Args:
+            nome (str): Nome da consulta.
+            duracao_ms (float): Duração da execução em milissegundos.
+            erro (bool): Se a execução terminou com erro.
+        """
+        faixa = bisect_left(self.LIMITES_MS, duracao_ms)
+        with self._trava:
+            consulta = self._consultas.get(nome)
+            if consulta is None:
+                consulta = self._consultas[nome] = {
+                    "execucoes": 0,
+                    "erros": 0,
+                    "lentas": 0,
+                    "tempo_total_ms": 0.0,
+                    "tempo_maximo_ms": 0.0,
+                    "histograma": [0] * (len(self.LIMITES_MS) + 1),
+                }
+            consulta["execucoes"] += 1
+            consulta["tempo_total_ms"] += duracao_ms
+            consulta["histograma"][faixa] += 1
+            if erro:
+                consulta["erros"] += 1
+            if duracao_ms > self.limite_consulta_lenta_ms:
+                consulta["lentas"] += 1
+            if duracao_ms > consulta["tempo_maximo_ms"]:
+                consulta["tempo_maximo_ms"] = duracao_ms
+
+    def percentil(self, histograma: list, fracao: float) -> float:
+        """
+        Estima um percentil a partir do histograma, pelo limite superior da faixa em que ele cai.
+
+        Args:
+            histograma (list): Contagem de execuções por faixa.
+            fracao (float): Percentil desejado entre 0 e 1, por exemplo 0.99.
+
+        Returns:
+            float: Limite da faixa em milissegundos, ou infinito para a última faixa.
+        """
+        alvo = sum(histograma) * fracao
+        acumulado = 0
+        for indice, quantidade in enumerate(histograma):
+            acumulado += quantidade
+            if quantidade and acumulado >= alvo:
+                return self.LIMITES_MS[indice] if indice < len(self.LIMITES_MS) else float("inf")
+        return 0.0
+
+    def resumo(self) -> dict:
+        """
+        Retorna uma cópia das métricas de cada consulta, com a média e os percentis estimados.
+
+        Returns:
+            dict: {nome: {execucoes, erros, lentas, tempo_total_ms, tempo_maximo_ms, histograma,
+                media_ms, p50_ms, p95_ms, p99_ms}}.
+        """
+        with self._trava:
+            consultas = {nome: dict(dados, histograma=list(dados["histograma"])) for nome, dados in self._consultas.items()}
+        for dados in consultas.values():
+            dados["media_ms"] = dados["tempo_total_ms"] / dados["execucoes"]
+            dados["p50_ms"] = self.percentil(dados["histograma"], 0.50)
+            dados["p95_ms"] = self.percentil(dados["histograma"], 0.95)
+            dados["p99_ms"] = self.percentil(dados["histograma"], 0.99)
+        return consultas
+
+    def relatorio(self) -> str:
+        """
+        Formata o resumo das métricas como uma tabela de texto, da consulta com maior tempo total
+        para a de menor.
+
+        Returns:
+            str: Tabela com as métricas de cada consulta.
+        """
+        linhas = [f"{'consulta':<45} {'execuções':>9} {'erros':>6} {'lentas':>6} {'média ms':>9} {'p50':>6} {'p95':>6} {'p99':>6} {'máx ms':>9}"]
+        consultas = sorted(self.resumo().items(), key=lambda item: item[1]["tempo_total_ms"], reverse=True)
+        for nome, dados in consultas:
+            linhas.append(
+                f"{nome:<45} {dados['execucoes']:>9} {dados['erros']:>6} {dados['lentas']:>6} {dados['media_ms']:>9.2f} "
+                f"{dados['p50_ms']:>6} {dados['p95_ms']:>6} {dados['p99_ms']:>6} {dados['tempo_maximo_ms']:>9.2f}"
+            )
+        return "\n".join(linhas)
+
+    def limpar(self) -> None:
+        """
+        Descarta todas as métricas acumuladas.
+        """
+        with self._trava:
+            self._consultas.clear()
+
+
+def nome_da_consulta(query, quadro) -> str:
+    """
+    Retorna o nome com que uma execução é registrada nas métricas.
+
+    Args:
+        query: SQL executado.
+        quadro: Quadro (frame) de quem chamou o cursor.
+
+    Returns:
+        str: Nome da declaração preparada, para `EXECUTE nome` e `PREPARE nome`, ou o nome
+            qualificado do método chamador.
+    """
+    if isinstance(query, str) and query.startswith(("EXECUTE ", "PREPARE ")):
+        comando, nome = query.split(None, 2)[:2]
+        return nome if comando == "EXECUTE" else f"{comando} {nome}"
+    codigo = quadro.f_code
+    return getattr(codigo, "co_qualname", codigo.co_name)
+
+
+def descrever_parametros(vars) -> str:
+    """
+    Descreve os parâmetros de uma consulta sem expor os valores, que podem conter senhas ou emails.
+
+    Args:
+        vars: Parâmetros passados ao cursor.
+
+    Returns:
+        str: Tipos dos parâmetros, por exemplo "[int, str]".
+    """
+    if vars is None:
+        return "[]"
+    valores = vars.values() if isinstance(vars, dict) else vars
+    return f"[{', '.join(type(valor).__name__ for valor in valores)}]"
+
+
+class CursorInstrumentado(psycopg2.extensions.cursor):
+    """
+    Cursor que mede o tempo de cada execução e o registra nas métricas das consultas.
+
+    Execuções mais lentas que `limite_consulta_lenta_ms` são registradas no log com o SQL e
+    apenas os tipos dos parâmetros.
+
+    Atributos:
+        metricas (MetricasConsultas): Métricas em que as execuções são registradas.
+    """
+
+    metricas = MetricasConsultas()
+
+    def execute(self, query, vars=None):
+        nome = nome_da_consulta(query, sys._getframe(1))
+        inicio = perf_counter()
+        erro = True
+        try:
+            resultado = super().execute(query, vars)
+            erro = False
+            return resultado
+        finally:
+            self._registrar(nome, query, vars, inicio, erro)
+
+    def executemany(self, query, vars_list):
+        nome = nome_da_consulta(query, sys._getframe(1))
+        inicio = perf_counter()
+        erro = True
+        try:
+            resultado = super().executemany(query, vars_list)
+            erro = False
+            return resultado
+        finally:
+            self._registrar(nome, query, None, inicio, erro, lote=True)
+
+    def _registrar(self, nome: str, query, vars, inicio: float, erro: bool, lote: bool = False) -> None:
+        """
+        Registra a execução nas métricas e, se for lenta, no log.
+        """
+        duracao_ms = (perf_counter() - inicio) * 1000
+        metricas = CursorInstrumentado.metricas
+        metricas.registrar(nome, duracao_ms, erro)
+        if duracao_ms > metricas.limite_consulta_lenta_ms:
+            sql = " ".join(query.split()) if isinstance(query, str) else query
+            parametros = "[lote]" if lote else descrever_parametros(vars)
+            print(f"[LOG AVISO] Consulta lenta ({duracao_ms:.1f} ms) em {nome}: {sql} parâmetros: {parametros}")
@@ -0,0 +1,602 @@
+"""
+Modulo responsável pelas migrações do esquema do banco de dados.
+
+Cada migração tem um número de versão e é aplicada uma única vez. As versões já aplicadas
+ficam registradas na tabela versao_esquema.
+"""
+
+from .bd_postgree_base import Bd_Base
+from .bd_postgree_pedido import CONDICAO_PEDIDOS_ABERTOS
+from typing import List, Tuple
+
+# Chave do advisory lock que impede dois processos de migrarem o banco ao mesmo tempo.
+CHAVE_TRAVA_MIGRACOES = 7_314_202
+
+MIGRACOES: List[Tuple[int, str, str]] = [
+    (1, "Cria as tabelas funcionario, Produto, Pedido e Produto_Pedido", """
+        CREATE TABLE IF NOT EXISTS funcionario (
+            id SERIAL PRIMARY KEY,
+            usuario VARCHAR(255) UNIQUE,
+            senha VARCHAR(255) NOT NULL,
+            email VARCHAR(255) NOT NULL UNIQUE
+        );
+
+        CREATE TABLE IF NOT EXISTS Produto (
+            id SERIAL PRIMARY KEY,
+            nome VARCHAR(255) UNIQUE,
+            preco DECIMAL(10, 2) NOT NULL,
+            disponivel BOOLEAN DEFAULT TRUE
+        );
+
+        CREATE TABLE IF NOT EXISTS Pedido (
+            id SERIAL PRIMARY KEY,
+            mesa INT NOT NULL,
+            status VARCHAR(255) NOT NULL,
+            data_hora TIMESTAMP NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS Produto_Pedido (
+            id SERIAL PRIMARY KEY,
+            pedido_id INT NOT NULL,
+            produto_id INT NOT NULL,
+            quantidade INT NOT NULL,
+            preco_pago DECIMAL(10, 2) NOT NULL,
+            FOREIGN KEY (pedido_id) REFERENCES Pedido (id) ON DELETE CASCADE,
+            FOREIGN KEY (produto_id) REFERENCES Produto (id) ON DELETE CASCADE
+        );
+    """),
+    (2, "Cria os índices e restrições das tabelas de pedidos", """
+        -- Itens de um pedido (get_produtos_do_pedido) e ON DELETE CASCADE a partir de Pedido.
+        CREATE INDEX IF NOT EXISTS idx_produto_pedido_pedido_id ON Produto_Pedido (pedido_id);
+        -- ON DELETE CASCADE a partir de Produto (remover_produto).
+        CREATE INDEX IF NOT EXISTS idx_produto_pedido_produto_id ON Produto_Pedido (produto_id);
+        -- Relatórios por período.
+        CREATE INDEX IF NOT EXISTS idx_pedido_data_hora ON Pedido (data_hora);
+        -- Pedidos ainda não encerrados, a pequena parte da tabela consultada pela cozinha e pela entrega.
+        CREATE INDEX IF NOT EXISTS idx_pedido_ativos ON Pedido (status, data_hora)
+            WHERE status IN ('Pedido em andamento', 'Entregar');
+
+        -- NOT VALID: valem para as linhas novas sem varrer nem bloquear as tabelas existentes.
+        ALTER TABLE Produto_Pedido
+            ADD CONSTRAINT produto_pedido_quantidade_positiva CHECK (quantidade > 0) NOT VALID,
+            ADD CONSTRAINT produto_pedido_preco_pago_nao_negativo CHECK (preco_pago >= 0) NOT VALID;
+        ALTER TABLE Produto
+            ADD CONSTRAINT produto_preco_nao_negativo CHECK (preco >= 0) NOT VALID;
+    """),
+    (3, "Cria os gatilhos que notificam as alterações de Produto e Pedido", """
+        -- Envia, no canal recebido como argumento, os ids alterados pelo comando separados por vírgula.
+        -- Acima do limite de 8000 bytes do NOTIFY a lista vai vazia, indicando que tudo deve ser recarregado.
+        CREATE OR REPLACE FUNCTION notificar_alteracao() RETURNS trigger AS $$
+        DECLARE
+            ids TEXT;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                SELECT string_agg(id::text, ',' ORDER BY id) INTO ids FROM linhas_antigas;
+            ELSE
+                SELECT string_agg(id::text, ',' ORDER BY id) INTO ids FROM linhas_novas;
+            END IF;
+
+            IF ids IS NULL THEN
+                RETURN NULL;
+            END IF;
+            IF octet_length(ids) > 7900 THEN
+                ids := '';
+            END IF;
+
+            PERFORM pg_notify(TG_ARGV[0], ids);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER produto_notificar_insercao AFTER INSERT ON Produto
+            REFERENCING NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alteracao('sync_produto');
+        CREATE TRIGGER produto_notificar_atualizacao AFTER UPDATE ON Produto
+            REFERENCING NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alteracao('sync_produto');
+        CREATE TRIGGER produto_notificar_remocao AFTER DELETE ON Produto
+            REFERENCING OLD TABLE AS linhas_antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alteracao('sync_produto');
+
+        CREATE TRIGGER pedido_notificar_insercao AFTER INSERT ON Pedido
+            REFERENCING NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alteracao('sync_pedido');
+        CREATE TRIGGER pedido_notificar_atualizacao AFTER UPDATE ON Pedido
+            REFERENCING NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alteracao('sync_pedido');
+        CREATE TRIGGER pedido_notificar_remocao AFTER DELETE ON Pedido
+            REFERENCING OLD TABLE AS linhas_antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alteracao('sync_pedido');
+    """),
+    (4, "Cria o índice de busca por prefixo do nome do produto", """
+        -- text_pattern_ops permite usar o índice em lower(nome) LIKE 'prefixo%' em qualquer collation.
+        CREATE INDEX IF NOT EXISTS idx_produto_nome_prefixo ON Produto (lower(nome) text_pattern_ops);
+    """),
+    (5, "Adiciona a versão de alteração dos pedidos (BdPedido.get_alterados_desde)", """
+        -- Id da transação que gravou o pedido por último. As linhas existentes ficam com 0, sem
+        -- reescrever a tabela; as novas recebem o id da transação que as inseriu.
+        ALTER TABLE Pedido ADD COLUMN IF NOT EXISTS versao BIGINT NOT NULL DEFAULT 0;
+        ALTER TABLE Pedido ALTER COLUMN versao SET DEFAULT txid_current();
+
+        CREATE OR REPLACE FUNCTION definir_versao_pedido() RETURNS trigger AS $$
+        BEGIN
+            NEW.versao := txid_current();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Atualizações que não mudam nada (por exemplo o mesmo status) não geram uma nova versão.
+        CREATE TRIGGER pedido_definir_versao BEFORE UPDATE ON Pedido
+            FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+            EXECUTE FUNCTION definir_versao_pedido();
+
+        CREATE INDEX IF NOT EXISTS idx_pedido_versao ON Pedido (versao);
+    """),
+    (6, "Guarda o status dos pedidos como código da tabela status_pedido", """
+        CREATE TABLE IF NOT EXISTS status_pedido (
+            id SMALLINT PRIMARY KEY,
+            descricao VARCHAR(255) NOT NULL UNIQUE,
+            -- Pedidos com status final saem da fila de pedidos abertos (BdPedido.get_abertos).
+            final BOOLEAN NOT NULL
+        );
+        INSERT INTO status_pedido (id, descricao, final) VALUES
+            (1, 'Pedido em andamento', FALSE),
+            (2, 'Entregar', FALSE),
+            (3, 'Pedido cancelado', TRUE),
+            (4, 'Pedido finalizado', TRUE)
+        ON CONFLICT DO NOTHING;
+        -- Status gravados fora da lista acima são mantidos, como status finais.
+        INSERT INTO status_pedido (id, descricao, final)
+        SELECT 4 + row_number() OVER (ORDER BY status), status, TRUE
+        FROM (SELECT DISTINCT status FROM Pedido) AS existentes
+        WHERE status NOT IN (SELECT descricao FROM status_pedido);
+
+        -- Usada nas gravações, que continuam recebendo a descrição do status. Um status
+        -- desconhecido vira NULL e a gravação é recusada pelo NOT NULL da coluna.
+        CREATE OR REPLACE FUNCTION codigo_status_pedido(descricao_status TEXT) RETURNS SMALLINT AS $$
+            SELECT id FROM status_pedido WHERE descricao = descricao_status;
+        $$ LANGUAGE sql STABLE;
+
+        DROP INDEX IF EXISTS idx_pedido_ativos;
+        ALTER TABLE Pedido
+            ALTER COLUMN status TYPE SMALLINT USING codigo_status_pedido(status),
+            ADD CONSTRAINT pedido_status_fkey FOREIGN KEY (status) REFERENCES status_pedido (id);
+
+        -- Fila de pedidos abertos. O índice contém apenas os pedidos com status não final (1 e 2),
+        -- então o seu tamanho não cresce com o histórico. Um novo status não final exige recriá-lo.
+        CREATE INDEX IF NOT EXISTS idx_pedido_abertos ON Pedido (data_hora, id) WHERE """ + CONDICAO_PEDIDOS_ABERTOS + """;
+    """),
+    (7, "Cria os resumos de vendas mantidos por gatilhos", """
+        -- Totais de vendas (quantidade e quantidade * preco_pago) por hora, mesa e status, e por
+        -- dia, produto e status. O relatório lê estes resumos em vez de todos os itens de pedido.
+        CREATE TABLE IF NOT EXISTS resumo_vendas_hora (
+            hora TIMESTAMP NOT NULL,
+            mesa INT NOT NULL,
+            status SMALLINT NOT NULL,
+            quantidade BIGINT NOT NULL,
+            valor NUMERIC(14, 2) NOT NULL,
+            PRIMARY KEY (hora, mesa, status)
+        );
+        CREATE TABLE IF NOT EXISTS resumo_vendas_produto (
+            data DATE NOT NULL,
+            produto_id INT NOT NULL,
+            status SMALLINT NOT NULL,
+            quantidade BIGINT NOT NULL,
+            valor NUMERIC(14, 2) NOT NULL,
+            PRIMARY KEY (data, produto_id, status)
+        );
+
+        -- Soma as variações de itens (negativas para itens que saem de um grupo) nos dois resumos.
+        -- Os grupos são atualizados em ordem de chave, para que duas transações que alteram os
+        -- mesmos grupos esperem uma pela outra em vez de entrar em deadlock.
+        CREATE OR REPLACE FUNCTION acumular_vendas(
+            datas_hora TIMESTAMP[], mesas INT[], codigos_status SMALLINT[],
+            produtos INT[], quantidades BIGINT[], valores NUMERIC[]
+        ) RETURNS void AS $$
+        BEGIN
+            INSERT INTO resumo_vendas_hora AS resumo (hora, mesa, status, quantidade, valor)
+            SELECT date_trunc('hour', v.data_hora), v.mesa, v.status, SUM(v.quantidade), SUM(v.valor)
+            FROM unnest(datas_hora, mesas, codigos_status, quantidades, valores) AS v (data_hora, mesa, status, quantidade, valor)
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+            ON CONFLICT (hora, mesa, status) DO UPDATE
+                SET quantidade = resumo.quantidade + EXCLUDED.quantidade, valor = resumo.valor + EXCLUDED.valor;
+
+            INSERT INTO resumo_vendas_produto AS resumo (data, produto_id, status, quantidade, valor)
+            SELECT v.data_hora::date, v.produto_id, v.status, SUM(v.quantidade), SUM(v.valor)
+            FROM unnest(datas_hora, codigos_status, produtos, quantidades, valores) AS v (data_hora, status, produto_id, quantidade, valor)
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+            ON CONFLICT (data, produto_id, status) DO UPDATE
+                SET quantidade = resumo.quantidade + EXCLUDED.quantidade, valor = resumo.valor + EXCLUDED.valor;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Itens inseridos somam e itens removidos subtraem. Quando o pedido inteiro é removido, os
+        -- itens apagados em cascata já não encontram o pedido e a subtração fica com o gatilho de Pedido.
+        CREATE OR REPLACE FUNCTION resumir_vendas_itens() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM acumular_vendas(
+                    array_agg(p.data_hora), array_agg(p.mesa), array_agg(p.status), array_agg(i.produto_id),
+                    array_agg(-i.quantidade::BIGINT), array_agg(-i.quantidade * i.preco_pago)
+                )
+                FROM linhas_antigas i JOIN Pedido p ON p.id = i.pedido_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM acumular_vendas(
+                    array_agg(p.data_hora), array_agg(p.mesa), array_agg(p.status), array_agg(i.produto_id),
+                    array_agg(i.quantidade::BIGINT), array_agg(i.quantidade * i.preco_pago)
+                )
+                FROM linhas_novas i JOIN Pedido p ON p.id = i.pedido_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Pedidos que mudam de status, mesa ou data levam os seus itens do grupo antigo para o novo.
+        CREATE OR REPLACE FUNCTION resumir_vendas_pedidos() RETURNS trigger AS $$
+        BEGIN
+            PERFORM acumular_vendas(
+                array_agg(v.data_hora), array_agg(v.mesa), array_agg(v.status), array_agg(i.produto_id),
+                array_agg(v.sinal * i.quantidade::BIGINT), array_agg(v.sinal * i.quantidade * i.preco_pago)
+            )
+            FROM linhas_antigas antigo
+            JOIN linhas_novas novo ON novo.id = antigo.id
+            JOIN Produto_Pedido i ON i.pedido_id = novo.id
+            CROSS JOIN LATERAL (VALUES
+                (antigo.data_hora, antigo.mesa, antigo.status, -1),
+                (novo.data_hora, novo.mesa, novo.status, 1)
+            ) AS v (data_hora, mesa, status, sinal)
+            WHERE (antigo.data_hora, antigo.mesa, antigo.status) IS DISTINCT FROM (novo.data_hora, novo.mesa, novo.status);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Executado antes da remoção, enquanto os itens do pedido ainda existem.
+        CREATE OR REPLACE FUNCTION resumir_vendas_pedido_removido() RETURNS trigger AS $$
+        BEGIN
+            PERFORM acumular_vendas(
+                array_agg(OLD.data_hora), array_agg(OLD.mesa), array_agg(OLD.status), array_agg(i.produto_id),
+                array_agg(-i.quantidade::BIGINT), array_agg(-i.quantidade * i.preco_pago)
+            )
+            FROM Produto_Pedido i WHERE i.pedido_id = OLD.id;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Os gatilhos são criados antes da carga inicial: o bloqueio que eles tomam impede que
+        -- pedidos gravados durante a migração fiquem fora dos resumos.
+        CREATE TRIGGER produto_pedido_resumir_insercao AFTER INSERT ON Produto_Pedido
+            REFERENCING NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION resumir_vendas_itens();
+        CREATE TRIGGER produto_pedido_resumir_atualizacao AFTER UPDATE ON Produto_Pedido
+            REFERENCING OLD TABLE AS linhas_antigas NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION resumir_vendas_itens();
+        CREATE TRIGGER produto_pedido_resumir_remocao AFTER DELETE ON Produto_Pedido
+            REFERENCING OLD TABLE AS linhas_antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION resumir_vendas_itens();
+        CREATE TRIGGER pedido_resumir_atualizacao AFTER UPDATE ON Pedido
+            REFERENCING OLD TABLE AS linhas_antigas NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION resumir_vendas_pedidos();
+        CREATE TRIGGER pedido_resumir_remocao BEFORE DELETE ON Pedido
+            FOR EACH ROW EXECUTE FUNCTION resumir_vendas_pedido_removido();
+
+        INSERT INTO resumo_vendas_hora (hora, mesa, status, quantidade, valor)
+        SELECT date_trunc('hour', p.data_hora), p.mesa, p.status, SUM(i.quantidade), SUM(i.quantidade * i.preco_pago)
+        FROM Produto_Pedido i JOIN Pedido p ON p.id = i.pedido_id
+        GROUP BY 1, 2, 3;
+        INSERT INTO resumo_vendas_produto (data, produto_id, status, quantidade, valor)
+        SELECT p.data_hora::date, i.produto_id, p.status, SUM(i.quantidade), SUM(i.quantidade * i.preco_pago)
+        FROM Produto_Pedido i JOIN Pedido p ON p.id = i.pedido_id
+        GROUP BY 1, 2, 3;
+    """),
+    (8, "Particiona Pedido e Produto_Pedido por mês", """
+        -- Cria as partições mensais de Pedido e Produto_Pedido de cada mês entre inicio e fim
+        -- (inclusive) que ainda não existem. Retorna o número de partições criadas.
+        CREATE OR REPLACE FUNCTION criar_particoes_pedidos(inicio DATE, fim DATE) RETURNS INT AS $$
+        DECLARE
+            mes DATE := date_trunc('month', inicio);
+            tabela TEXT;
+            criadas INT := 0;
+        BEGIN
+            WHILE mes <= fim LOOP
+                FOREACH tabela IN ARRAY ARRAY['pedido', 'produto_pedido'] LOOP
+                    IF to_regclass(tabela || to_char(mes, '_YYYY_MM')) IS NULL THEN
+                        EXECUTE format(
+                            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                            tabela || to_char(mes, '_YYYY_MM'), tabela, mes, (mes + interval '1 month')::date
+                        );
+                        criadas := criadas + 1;
+                    END IF;
+                END LOOP;
+                mes := mes + interval '1 month';
+            END LOOP;
+            RETURN criadas;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Retira as partições dos meses inteiramente anteriores a `antes` e retorna os seus nomes.
+        -- Com apagar = FALSE elas continuam no banco como tabelas comuns, sem as chaves
+        -- estrangeiras, para serem arquivadas (por exemplo com pg_dump) e removidas depois. Remover
+        -- uma partição não dispara os gatilhos: os resumos de vendas mantêm os totais desses meses.
+        CREATE OR REPLACE FUNCTION remover_particoes_pedidos(antes DATE, apagar BOOLEAN) RETURNS SETOF TEXT AS $$
+        DECLARE
+            particao RECORD;
+            restricao TEXT;
+        BEGIN
+            FOR particao IN
+                SELECT filha.relname AS nome, pai.relname AS tabela
+                FROM pg_inherits
+                JOIN pg_class filha ON filha.oid = pg_inherits.inhrelid
+                JOIN pg_class pai ON pai.oid = pg_inherits.inhparent
+                WHERE pai.oid IN ('pedido'::regclass, 'produto_pedido'::regclass)
+                  AND filha.relname ~ '_[0-9]{4}_[0-9]{2}$'
+                  AND to_date(right(filha.relname, 7), 'YYYY_MM') + interval '1 month' <= antes
+                -- Os itens saem antes dos pedidos que eles referenciam.
+                ORDER BY pai.relname = 'pedido', filha.relname
+            LOOP
+                EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', particao.tabela, particao.nome);
+                IF apagar THEN
+                    EXECUTE format('DROP TABLE %I', particao.nome);
+                ELSE
+                    FOR restricao IN
+                        SELECT conname FROM pg_constraint WHERE conrelid = particao.nome::regclass AND contype = 'f'
+                    LOOP
+                        EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', particao.nome, restricao);
+                    END LOOP;
+                END IF;
+                RETURN NEXT particao.nome;
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- A chave primária de uma tabela particionada precisa conter a coluna de partição, então
+        -- Pedido passa a ter a chave (id, data_hora) e os itens guardam a data/hora do pedido
+        -- (pedido_data_hora) para referenciá-lo. Os itens de um pedido ficam na partição do mesmo
+        -- mês, e a data/hora de um pedido com itens não pode mais ser alterada.
+        DROP INDEX IF EXISTS idx_produto_pedido_pedido_id, idx_produto_pedido_produto_id,
+            idx_pedido_data_hora, idx_pedido_abertos, idx_pedido_versao;
+        ALTER SEQUENCE pedido_id_seq OWNED BY NONE;
+        ALTER SEQUENCE produto_pedido_id_seq OWNED BY NONE;
+        ALTER TABLE Produto_Pedido RENAME TO produto_pedido_antiga;
+        ALTER INDEX produto_pedido_pkey RENAME TO produto_pedido_antiga_pkey;
+        ALTER TABLE Pedido RENAME TO pedido_antiga;
+        ALTER INDEX pedido_pkey RENAME TO pedido_antiga_pkey;
+
+        CREATE TABLE Pedido (
+            id INT NOT NULL DEFAULT nextval('pedido_id_seq'),
+            mesa INT NOT NULL,
+            status SMALLINT NOT NULL,
+            data_hora TIMESTAMP NOT NULL,
+            versao BIGINT NOT NULL DEFAULT txid_current(),
+            CONSTRAINT pedido_pkey PRIMARY KEY (id, data_hora),
+            CONSTRAINT pedido_status_fkey FOREIGN KEY (status) REFERENCES status_pedido (id)
+        ) PARTITION BY RANGE (data_hora);
+
+        CREATE TABLE Produto_Pedido (
+            id INT NOT NULL DEFAULT nextval('produto_pedido_id_seq'),
+            pedido_id INT NOT NULL,
+            produto_id INT NOT NULL,
+            quantidade INT NOT NULL,
+            preco_pago DECIMAL(10, 2) NOT NULL,
+            pedido_data_hora TIMESTAMP NOT NULL,
+            CONSTRAINT produto_pedido_pkey PRIMARY KEY (id, pedido_data_hora),
+            CONSTRAINT produto_pedido_pedido_id_fkey FOREIGN KEY (pedido_id, pedido_data_hora)
+                REFERENCES Pedido (id, data_hora) ON DELETE CASCADE,
+            CONSTRAINT produto_pedido_produto_id_fkey FOREIGN KEY (produto_id) REFERENCES Produto (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (pedido_data_hora);
+
+        ALTER SEQUENCE pedido_id_seq OWNED BY Pedido.id;
+        ALTER SEQUENCE produto_pedido_id_seq OWNED BY Produto_Pedido.id;
+
+        -- Do mês do pedido mais antigo até três meses depois do mais recente (ou de hoje).
+        SELECT criar_particoes_pedidos(
+            COALESCE(MIN(data_hora), now())::date, (GREATEST(MAX(data_hora), now()) + interval '3 months')::date
+        ) FROM pedido_antiga;
+
+        -- Os gatilhos são criados depois da cópia: as linhas copiadas já estão nos resumos de vendas.
+        INSERT INTO Pedido (id, mesa, status, data_hora, versao)
+        SELECT id, mesa, status, data_hora, versao FROM pedido_antiga;
+        INSERT INTO Produto_Pedido (id, pedido_id, produto_id, quantidade, preco_pago, pedido_data_hora)
+        SELECT i.id, i.pedido_id, i.produto_id, i.quantidade, i.preco_pago, p.data_hora
+        FROM produto_pedido_antiga i JOIN pedido_antiga p ON p.id = i.pedido_id;
+        DROP TABLE produto_pedido_antiga, pedido_antiga;
+
+        -- NOT VALID, como na migração 2: as linhas copiadas não são verificadas de novo.
+        ALTER TABLE Produto_Pedido
+            ADD CONSTRAINT produto_pedido_quantidade_positiva CHECK (quantidade > 0) NOT VALID,
+            ADD CONSTRAINT produto_pedido_preco_pago_nao_negativo CHECK (preco_pago >= 0) NOT VALID;
+
+        -- Os mesmos índices das migrações 2, 5 e 6, criados em cada partição. O índice dos itens
+        -- de um pedido inclui pedido_data_hora para servir à nova chave estrangeira.
+        CREATE INDEX idx_produto_pedido_pedido_id ON Produto_Pedido (pedido_id, pedido_data_hora);
+        CREATE INDEX idx_produto_pedido_produto_id ON Produto_Pedido (produto_id);
+        CREATE INDEX idx_pedido_data_hora ON Pedido (data_hora);
+        CREATE INDEX idx_pedido_abertos ON Pedido (data_hora, id) WHERE """ + CONDICAO_PEDIDOS_ABERTOS + """;
+        CREATE INDEX idx_pedido_versao ON Pedido (versao);
+
+        -- Com a data/hora do pedido nos itens, as buscas do pedido de cada item acessam apenas a
+        -- partição do mês dele.
+        CREATE OR REPLACE FUNCTION resumir_vendas_itens() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM acumular_vendas(
+                    array_agg(p.data_hora), array_agg(p.mesa), array_agg(p.status), array_agg(i.produto_id),
+                    array_agg(-i.quantidade::BIGINT), array_agg(-i.quantidade * i.preco_pago)
+                )
+                FROM linhas_antigas i JOIN Pedido p ON p.id = i.pedido_id AND p.data_hora = i.pedido_data_hora;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM acumular_vendas(
+                    array_agg(p.data_hora), array_agg(p.mesa), array_agg(p.status), array_agg(i.produto_id),
+                    array_agg(i.quantidade::BIGINT), array_agg(i.quantidade * i.preco_pago)
+                )
+                FROM linhas_novas i JOIN Pedido p ON p.id = i.pedido_id AND p.data_hora = i.pedido_data_hora;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION resumir_vendas_pedidos() RETURNS trigger AS $$
+        BEGIN
+            PERFORM acumular_vendas(
+                array_agg(v.data_hora), array_agg(v.mesa), array_agg(v.status), array_agg(i.produto_id),
+                array_agg(v.sinal * i.quantidade::BIGINT), array_agg(v.sinal * i.quantidade * i.preco_pago)
+            )
+            FROM linhas_antigas antigo
+            JOIN linhas_novas novo ON novo.id = antigo.id
+            JOIN Produto_Pedido i ON i.pedido_id = novo.id AND i.pedido_data_hora = novo.data_hora
+            CROSS JOIN LATERAL (VALUES
+                (antigo.data_hora, antigo.mesa, antigo.status, -1),
+                (novo.data_hora, novo.mesa, novo.status, 1)
+            ) AS v (data_hora, mesa, status, sinal)
+            WHERE (antigo.data_hora, antigo.mesa, antigo.status) IS DISTINCT FROM (novo.data_hora, novo.mesa, novo.status);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION resumir_vendas_pedido_removido() RETURNS trigger AS $$
+        BEGIN
+            PERFORM acumular_vendas(
+                array_agg(OLD.data_hora), array_agg(OLD.mesa), array_agg(OLD.status), array_agg(i.produto_id),
+                array_agg(-i.quantidade::BIGINT), array_agg(-i.quantidade * i.preco_pago)
+            )
+            FROM Produto_Pedido i WHERE i.pedido_id = OLD.id AND i.pedido_data_hora = OLD.data_hora;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Os gatilhos das migrações 3, 5 e 7, agora nas tabelas particionadas.
+        CREATE TRIGGER pedido_notificar_insercao AFTER INSERT ON Pedido
+            REFERENCING NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alteracao('sync_pedido');
+        CREATE TRIGGER pedido_notificar_atualizacao AFTER UPDATE ON Pedido
+            REFERENCING NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alteracao('sync_pedido');
+        CREATE TRIGGER pedido_notificar_remocao AFTER DELETE ON Pedido
+            REFERENCING OLD TABLE AS linhas_antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_alteracao('sync_pedido');
+        CREATE TRIGGER pedido_definir_versao BEFORE UPDATE ON Pedido
+            FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+            EXECUTE FUNCTION definir_versao_pedido();
+        CREATE TRIGGER produto_pedido_resumir_insercao AFTER INSERT ON Produto_Pedido
+            REFERENCING NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION resumir_vendas_itens();
+        CREATE TRIGGER produto_pedido_resumir_atualizacao AFTER UPDATE ON Produto_Pedido
+            REFERENCING OLD TABLE AS linhas_antigas NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION resumir_vendas_itens();
+        CREATE TRIGGER produto_pedido_resumir_remocao AFTER DELETE ON Produto_Pedido
+            REFERENCING OLD TABLE AS linhas_antigas
+            FOR EACH STATEMENT EXECUTE FUNCTION resumir_vendas_itens();
+        CREATE TRIGGER pedido_resumir_atualizacao AFTER UPDATE ON Pedido
+            REFERENCING OLD TABLE AS linhas_antigas NEW TABLE AS linhas_novas
+            FOR EACH STATEMENT EXECUTE FUNCTION resumir_vendas_pedidos();
+        CREATE TRIGGER pedido_resumir_remocao BEFORE DELETE ON Pedido
+            FOR EACH ROW EXECUTE FUNCTION resumir_vendas_pedido_removido();
+
+        ANALYZE Pedido, Produto_Pedido;
+    """),
+]
+
+
+class BdMigracoes(Bd_Base):
+    """
+    Classe para aplicação das migrações do esquema do banco de dados PostgreSQL.
+
+    Essa classe é usada pela Bd_Base na criação do pool de conexões, de forma que o esquema
+    é verificado uma vez por processo e as classes de acesso a dados não executam DDL.
+    """
+
+    def __init__(self, host: str = 'localhost', database: str = 'database-postgres', user: str = 'root', password: str = 'root') -> None:
+        """
+        Inicializa a conexão com o banco de dados sem aplicar as migrações.
+
+        Args:
+            host (str): Endereço do host do banco de dados.
+            database (str): Nome do banco de dados.
+            user (str): Nome de usuário para autenticação.
+            password (str): Senha para autenticação.
+        """
+        super().__init__(host, database, user, password, aplicar_migracoes=False)
+
+    def criar_tabela_versao(self) -> None:
+        """
+        Cria a tabela versao_esquema caso ela não exista.
+
+        Usa o mesmo advisory lock das migrações, já que dois CREATE TABLE IF NOT EXISTS
+        simultâneos da mesma tabela podem falhar.
+        """
+        cursor = self.get_cursor()
+        try:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s);", (CHAVE_TRAVA_MIGRACOES,))
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS versao_esquema (
+                    versao INT PRIMARY KEY,
+                    descricao VARCHAR(255) NOT NULL,
+                    aplicada_em TIMESTAMP NOT NULL DEFAULT now()
+                );
+            """)
+            self.commit()
+        except Exception:
+            self.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def versao_atual(self) -> int:
+        """
+        Retorna a maior versão do esquema já aplicada.
+
+        Returns:
+            int: Versão atual do esquema, ou 0 se nenhuma migração foi aplicada.
+        """
+        with self.cursor_leitura() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(versao), 0) FROM versao_esquema;")
+            return cursor.fetchone()[0]
+
+    def aplicar(self, migracoes: List[Tuple[int, str, str]] = MIGRACOES) -> List[int]:
+        """
+        Aplica as migrações ainda não registradas em versao_esquema, em ordem de versão.
+
+        Cada migração roda em sua própria transação, junto com o seu registro na tabela de
+        versões. Um advisory lock serializa processos que iniciam ao mesmo tempo: quem chegar
+        depois encontra a versão já registrada e não a aplica de novo.
+
+        Args:
+            migracoes (List[Tuple[int, str, str]]): Migrações no formato (versão, descrição, SQL).
+
+        Returns:
+            List[int]: Versões aplicadas nesta chamada.
+
+        Raises:
+            Exception: Se alguma migração falhar. A migração com erro é desfeita.
+        """
+        self.criar_tabela_versao()
+
+        aplicadas = []
+        for versao, descricao, sql in sorted(migracoes):
+            with self.transacao():
+                cursor = self.get_cursor()
+                try:
+                    cursor.execute("SELECT pg_advisory_xact_lock(%s);", (CHAVE_TRAVA_MIGRACOES,))
+                    cursor.execute("SELECT 1 FROM versao_esquema WHERE versao = %s;", (versao,))
+                    if cursor.fetchone() is not None:
+                        continue
+
+                    print(f"[LOG INFO] Aplicando migração {versao}: {descricao}")
+                    cursor.execute(sql)
+                    cursor.execute(
+                        "INSERT INTO versao_esquema (versao, descricao) VALUES (%s, %s);",
+                        (versao, descricao)
+                    )
+                    aplicadas.append(versao)
+                except Exception as e:
+                    print(f"[LOG ERRO] Não foi possível aplicar a migração {versao}: {e}")
+                    raise
+                finally:
+                    cursor.close()
+
+        if aplicadas:
+            print(f"[LOG INFO] Esquema atualizado para a versão {aplicadas[-1]}.")
+        return aplicadas
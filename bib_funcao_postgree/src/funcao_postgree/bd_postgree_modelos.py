@@ -0,0 +1,159 @@
+"""
+Módulo com os registros aceitos e retornados pelas classes de acesso a dados.
+
+Os registros são dataclasses com `__slots__`: cada instância guarda apenas os seus campos, sem
+o dicionário de atributos, e pode ser repassada às classes de acesso a dados sem ser convertida
+para JSON e lida de volta.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Sequence
+
+
+@dataclass(slots=True)
+class Produto:
+    """
+    Produto do cardápio (tabela Produto).
+
+    Atributos:
+        nome (str): Nome do produto.
+        preco (Decimal | float): Preço do produto.
+        disponivel (bool): Se o produto pode ser pedido. Default é True.
+        id (int | None): ID do produto, None enquanto não foi inserido.
+    """
+
+    nome: str
+    preco: Decimal | float
+    disponivel: bool = True
+    id: int | None = None
+
+    @classmethod
+    def de_linha(cls, linha: Sequence) -> "Produto":
+        """
+        Cria o produto a partir de uma linha de `SELECT * FROM Produto`.
+
+        Args:
+            linha (Sequence): Linha no formato (id, nome, preco, disponivel).
+
+        Returns:
+            Produto: Produto da linha.
+        """
+        return cls(linha[1], linha[2], linha[3], linha[0])
+
+
+@dataclass(slots=True)
+class Pedido:
+    """
+    Pedido de uma mesa (tabela Pedido).
+
+    Atributos:
+        mesa (int): Número da mesa.
+        status (str): Status do pedido.
+        data_hora (datetime): Data e hora do pedido.
+        id (int | None): ID do pedido, None enquanto não foi inserido.
+    """
+
+    mesa: int
+    status: str
+    data_hora: datetime
+    id: int | None = None
+
+    @classmethod
+    def de_linha(cls, linha: Sequence) -> "Pedido":
+        """
+        Cria o pedido a partir de uma linha de `SELECT id, mesa, status, data_hora FROM Pedido`.
+
+        Args:
+            linha (Sequence): Linha no formato (id, mesa, status, data_hora).
+
+        Returns:
+            Pedido: Pedido da linha.
+        """
+        return cls(linha[1], linha[2], linha[3], linha[0])
+
+
+@dataclass(slots=True)
+class ItemPedido:
+    """
+    Produto incluído em um pedido (tabela Produto_Pedido).
+
+    Atributos:
+        produto_id (int): ID do produto.
+        quantidade (int): Quantidade pedida.
+        preco_pago (Decimal | float): Preço unitário cobrado.
+        nome (str | None): Nome do produto, preenchido nas consultas dos itens de um pedido.
+        pedido_id (int | None): ID do pedido.
+        id (int | None): ID do item, None enquanto não foi inserido.
+    """
+
+    produto_id: int
+    quantidade: int
+    preco_pago: Decimal | float
+    nome: str | None = None
+    pedido_id: int | None = None
+    id: int | None = None
+
+
+@dataclass(slots=True)
+class VendaHora:
+    """
+    Total vendido em uma hora, por mesa e status (tabela resumo_vendas_hora).
+
+    Atributos:
+        hora (datetime): Início da hora.
+        mesa (int): Número da mesa.
+        status (str): Status dos pedidos.
+        quantidade (int): Quantidade de itens vendidos.
+        valor (Decimal): Soma de quantidade * preço pago dos itens.
+    """
+
+    hora: datetime
+    mesa: int
+    status: str
+    quantidade: int
+    valor: Decimal
+
+
+@dataclass(slots=True)
+class VendaProduto:
+    """
+    Total vendido de um produto em um dia, por status (tabela resumo_vendas_produto).
+
+    Atributos:
+        data (date): Dia das vendas.
+        produto_id (int): ID do produto.
+        nome (str): Nome do produto.
+        status (str): Status dos pedidos.
+        quantidade (int): Quantidade vendida.
+        valor (Decimal): Soma de quantidade * preço pago.
+    """
+
+    data: date
+    produto_id: int
+    nome: str
+    status: str
+    quantidade: int
+    valor: Decimal
+
+
+@dataclass(slots=True)
+class Funcionario:
+    """
+    Funcionário com acesso ao sistema (tabela funcionario).
+
+    Atributos:
+        usuario (str): Nome de usuário.
+        email (str): E-mail do funcionário.
+        senha (str | None): Senha em texto, usada apenas na inserção; o banco guarda só o hash.
+        id (int | None): ID do funcionário, None enquanto não foi inserido.
+    """
+
+    usuario: str
+    email: str
+    senha: str | None = None
+    id: int | None = None
+
+    def __repr__(self) -> str:
+        return f"Funcionario(usuario={self.usuario!r}, email={self.email!r}, id={self.id!r})"
@@ -0,0 +1,159 @@
+"""
+Módulo responsável por escutar as notificações de alteração enviadas pelo banco de dados.
+
+Os gatilhos criados pela migração 3 enviam um NOTIFY a cada comando que altera Produto
+(canal sync_produto) ou Pedido (canal sync_pedido), com os ids alterados como conteúdo.
+"""
+
+from .bd_postgree_base import Bd_Base
+from psycopg2 import sql
+from typing import Callable, Iterable
+from time import sleep
+import psycopg2
+import select
+import threading
+
+
+class OuvinteAlteracoes:
+    """
+    Classe que mantém uma conexão dedicada com LISTEN nos canais de alteração e repassa cada
+    notificação recebida como uma mensagem de sincronização, por exemplo "sync_produto: 1,2".
+
+    Quando o banco não envia os ids (muitas linhas alteradas de uma vez) a mensagem é só o nome
+    do canal, por exemplo "sync_pedido".
+
+    Atributos:
+        CANAIS (tuple): Canais escutados por padrão.
+        intervalo_verificacao (float): Tempo máximo, em segundos, esperando notificações antes de
+            verificar se a escuta foi encerrada.
+    """
+
+    CANAIS = ("sync_produto", "sync_pedido")
+    intervalo_verificacao = 1.0
+
+    def __init__(self, ao_receber_mensagem: Callable[[str], None], canais: Iterable[str] = CANAIS,
+                 host: str | None = None, database: str | None = None, user: str | None = None, password: str | None = None) -> None:
+        """
+        Inicializa o ouvinte sem se conectar ao banco.
+
+        Args:
+            ao_receber_mensagem (Callable[[str], None]): Função chamada com cada mensagem de sincronização.
+            canais (Iterable[str]): Canais a escutar. Default é `CANAIS`.
+            host (str | None): Endereço do host do banco de dados. Default é o mesmo do pool da Bd_Base.
+            database (str | None): Nome do banco de dados. Default é o mesmo do pool da Bd_Base.
+            user (str | None): Nome de usuário. Default é o mesmo do pool da Bd_Base.
+            password (str | None): Senha. Default é a mesma do pool da Bd_Base.
+        """
+        self.ao_receber_mensagem = ao_receber_mensagem
+        self.canais = tuple(canais)
+        self.parametros = {"host": host, "database": database, "user": user, "password": password}
+        self.executando = False
+        self.conexao = None
+        self.thread_escuta = None
+
+    def iniciar(self) -> threading.Thread:
+        """
+        Inicia a escuta em uma thread separada.
+
+        Returns:
+            threading.Thread: Thread de escuta.
+        """
+        if self.executando:
+            return self.thread_escuta
+
+        self.executando = True
+        self.thread_escuta = threading.Thread(target=self._escutar, name="ouvinte_alteracoes", daemon=True)
+        self.thread_escuta.start()
+        return self.thread_escuta
+
+    def parar(self) -> None:
+        """
+        Encerra a escuta e fecha a conexão dedicada.
+        """
+        self.executando = False
+        if self.thread_escuta is not None and self.thread_escuta is not threading.current_thread():
+            self.thread_escuta.join(timeout=self.intervalo_verificacao * 2)
+        self._fechar_conexao()
+
+    def _conectar(self) -> None:
+        """
+        Abre a conexão dedicada em modo autocommit e executa LISTEN em cada canal.
+
+        Os parâmetros não informados são os do pool da Bd_Base.
+        """
+        parametros = {
+            "host": self.parametros["host"] or Bd_Base.host,
+            "database": self.parametros["database"] or Bd_Base.database,
+            "user": self.parametros["user"] or Bd_Base.user,
+            "password": self.parametros["password"] or Bd_Base.password,
+        }
+        self.conexao = psycopg2.connect(**parametros, application_name=f"{Bd_Base.nome_aplicacao}_ouvinte")
+        self.conexao.autocommit = True
+        cursor = self.conexao.cursor()
+        for canal in self.canais:
+            cursor.execute(sql.SQL("LISTEN {};").format(sql.Identifier(canal)))
+        cursor.close()
+        print(f"[LOG INFO] Escutando alterações do banco nos canais: {', '.join(self.canais)}")
+
+    def _fechar_conexao(self) -> None:
+        """
+        Fecha a conexão dedicada, caso esteja aberta.
+        """
+        conexao, self.conexao = self.conexao, None
+        if conexao is not None and not conexao.closed:
+            try:
+                conexao.close()
+            except Exception as e:
+                print(f"[LOG ERRO] Erro ao fechar a conexão do ouvinte: {e}")
+
+    def _escutar(self) -> None:
+        """
+        Aguarda notificações e as repassa até a escuta ser encerrada.
+
+        Se a conexão cair, tenta reconectar a cada 2 segundos. Alterações feitas enquanto a
+        conexão estava caída não são notificadas, por isso a reconexão é anunciada com uma
+        mensagem de cada canal sem ids, para que os clientes recarreguem tudo.
+        """
+        reconectando = False
+        while self.executando:
+            try:
+                if self.conexao is None:
+                    self._conectar()
+                    if reconectando:
+                        for canal in self.canais:
+                            self._repassar(canal)
+                    reconectando = False
+
+                if select.select([self.conexao], [], [], self.intervalo_verificacao) == ([], [], []):
+                    continue
+
+                self.conexao.poll()
+                mensagens = []
+                while self.conexao.notifies:
+                    notificacao = self.conexao.notifies.pop(0)
+                    mensagem = f"{notificacao.channel}: {notificacao.payload}" if notificacao.payload else notificacao.channel
+                    if mensagem not in mensagens:
+                        mensagens.append(mensagem)
+                for mensagem in mensagens:
+                    self._repassar(mensagem)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError, OSError) as e:
+                if not self.executando:
+                    break
+                print(f"[LOG ERRO] Conexão do ouvinte de alterações perdida: {e}")
+                print("[LOG INFO] Tentando novamente em 2 segundos...")
+                self._fechar_conexao()
+                reconectando = True
+                sleep(2)
+        self._fechar_conexao()
+
+    def _repassar(self, mensagem: str) -> None:
+        """
+        Repassa uma mensagem, sem deixar um erro de quem a recebe interromper a escuta.
+
+        Args:
+            mensagem (str): Mensagem de sincronização.
+        """
+        try:
+            self.ao_receber_mensagem(mensagem)
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao repassar a alteração '{mensagem}': {e}")
@@ -0,0 +1,136 @@
+"""
+Modulo responsável pela manutenção das partições mensais de Pedido e Produto_Pedido.
+
+A migração 8 particiona as duas tabelas por mês da data/hora do pedido e cria as funções
+criar_particoes_pedidos e remover_particoes_pedidos, usadas aqui. As partições dos próximos meses
+são criadas com antecedência, para que a gravação de pedidos não precise criá-las (ver
+`Bd_Base._executar_criando_particao`), e os meses mais antigos que a retenção podem ser retirados
+das tabelas sem apagar linha por linha.
+"""
+
+from .bd_postgree_base import Bd_Base
+from typing import List, Union
+
+
+class BdParticoes(Bd_Base):
+    """
+    Classe para manutenção das partições de pedidos no banco de dados PostgreSQL.
+
+    Atributos:
+        tempo_limite_trava (str): Tempo máximo aguardando as travas das tabelas. Criar e retirar
+            partições trava Pedido e Produto_Pedido; se houver uma consulta longa em andamento,
+            a manutenção desiste em vez de fazer os pedidos novos esperarem atrás dela.
+    """
+
+    tempo_limite_trava = "5s"
+
+    def __init__(self, host: str = 'localhost', database: str = 'database-postgres', user: str = 'root', password: str = 'root') -> None:
+        """
+        Inicializa a conexão com o banco de dados. As partições iniciais são criadas pelas migrações do esquema.
+
+        Args:
+            host (str): Endereço do host do banco de dados.
+            database (str): Nome do banco de dados.
+            user (str): Nome de usuário para autenticação.
+            password (str): Senha para autenticação.
+        """
+        super().__init__(host, database, user, password)
+
+    def criar_particoes_futuras(self, meses: int = 3) -> Union[int, None]:
+        """
+        Cria as partições do mês atual e dos próximos meses que ainda não existem.
+
+        Args:
+            meses (int): Quantidade de meses seguintes ao atual com partição garantida. Default é 3.
+
+        Returns:
+            Union[int, None]: Número de partições criadas (uma por tabela e mês), ou None em caso de erro.
+        """
+        retorno = None
+        cursor = None
+        try:
+            cursor = self.get_cursor()
+            cursor.execute("SET LOCAL lock_timeout = %s;", (self.tempo_limite_trava,))
+            cursor.execute(
+                "SELECT criar_particoes_pedidos(current_date, (current_date + %s * interval '1 month')::date);",
+                (meses,)
+            )
+            retorno = cursor.fetchone()[0]
+            self.commit()
+            if retorno:
+                print(f"[LOG INFO] {retorno} partições de pedidos criadas.")
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao criar partições de pedidos: {e}")
+            self.rollback()
+            retorno = None
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+        return retorno
+
+    def remover_particoes_antigas(self, meses_retencao: int, apagar: bool = False) -> Union[List[str], None]:
+        """
+        Retira de Pedido e Produto_Pedido as partições dos meses fora da retenção.
+
+        Os pedidos desses meses deixam de aparecer nas consultas, mas continuam nos resumos de
+        vendas. Sem `apagar`, as partições viram tabelas comuns com o mesmo nome (por exemplo
+        pedido_2024_01), para serem arquivadas e removidas manualmente.
+
+        Args:
+            meses_retencao (int): Quantidade de meses completos mantidos antes do mês atual.
+            apagar (bool): Se True, as partições retiradas são apagadas. Default é False.
+
+        Returns:
+            Union[List[str], None]: Nomes das partições retiradas, ou None em caso de erro.
+
+        Raises:
+            ValueError: Se `meses_retencao` for negativo.
+        """
+        if meses_retencao < 0:
+            raise ValueError("meses_retencao não pode ser negativo")
+
+        retorno = None
+        cursor = None
+        try:
+            cursor = self.get_cursor()
+            cursor.execute("SET LOCAL lock_timeout = %s;", (self.tempo_limite_trava,))
+            cursor.execute(
+                "SELECT remover_particoes_pedidos((date_trunc('month', current_date) - %s * interval '1 month')::date, %s);",
+                (meses_retencao, apagar)
+            )
+            retorno = [nome for (nome,) in cursor.fetchall()]
+            self.commit()
+            if retorno:
+                acao = "apagadas" if apagar else "desanexadas"
+                print(f"[LOG INFO] Partições de pedidos {acao}: {', '.join(retorno)}")
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao remover partições antigas de pedidos: {e}")
+            self.rollback()
+            retorno = None
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+        return retorno
+
+    def manter(self, meses_futuros: int = 3, meses_retencao: int | None = None, apagar: bool = False) -> bool:
+        """
+        Executa a manutenção das partições: cria as dos próximos meses e, se houver uma
+        retenção definida, retira as antigas. Pode ser executada várias vezes; o que já estiver
+        feito não é refeito.
+
+        Args:
+            meses_futuros (int): Meses seguintes ao atual com partição garantida. Default é 3.
+            meses_retencao (int | None): Meses completos mantidos antes do mês atual. None mantém
+                todo o histórico. Default é None.
+            apagar (bool): Se True, as partições retiradas são apagadas. Default é False.
+
+        Returns:
+            bool: True se a manutenção foi concluída, False caso contrário.
+        """
+        if self.criar_particoes_futuras(meses_futuros) is None:
+            return False
+        if meses_retencao is not None and self.remover_particoes_antigas(meses_retencao, apagar) is None:
+            return False
+        return True
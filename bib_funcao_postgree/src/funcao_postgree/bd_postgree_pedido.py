@@ -3,9 +3,23 @@ Modulo responsável por realizar a comunicação com o banco de dados dos pedido
 """
 
 from .bd_postgree_base import Bd_Base
-from typing import Union
+from .bd_postgree_modelos import Pedido
+from datetime import datetime
+from typing import Iterable, Iterator, List, Tuple, Union
 import json
 
+# Colunas de um pedido, com a descrição do status no lugar do código gravado em Pedido.status.
+CONSULTA_PEDIDOS = """
+    SELECT Pedido.id, Pedido.mesa, status_pedido.descricao AS status, Pedido.data_hora
+    FROM Pedido JOIN status_pedido ON status_pedido.id = Pedido.status
+"""
+
+# Condição dos pedidos abertos (status não final: 1 'Pedido em andamento' e 2 'Entregar'). Os
+# códigos ficam literais porque o PostgreSQL só usa o índice parcial idx_pedido_abertos quando
+# a condição da consulta é a do índice; com um parâmetro ou uma subconsulta em status_pedido.final
+# ele não é usado. As consultas e as migrações que criam o índice usam esta mesma constante.
+CONDICAO_PEDIDOS_ABERTOS = "status IN (1, 2)"
+
 
 class BdPedido(Bd_Base):
     """
@@ -15,9 +29,13 @@ class BdPedido(Bd_Base):
     como inserção, atualização e consulta de pedidos.
     """
 
+    DECLARACOES_PREPARADAS = {
+        "pedido_editar_status": ("VARCHAR, INT", "UPDATE Pedido SET status = codigo_status_pedido($1) WHERE id = $2"),
+    }
+
     def __init__(self, host: str = 'localhost', database: str = 'database-postgres', user: str = 'root', password: str = 'root') -> None:
         """
-        Inicializa a conexão com o banco de dados e cria a tabela Pedido caso ela não exista.
+        Inicializa a conexão com o banco de dados. A tabela Pedido é criada pelas migrações do esquema.
 
         Args:
             host (str): Endereço do host do banco de dados.
@@ -26,78 +44,136 @@ class BdPedido(Bd_Base):
             password (str): Senha para autenticação.
         """
         super().__init__(host, database, user, password)
-        self.database_init()
 
-    def database_init(self) -> None:
+    def editar_status(self, status: str, id_pedido: int) -> bool:
+        """
+        Edita o status de um pedido no banco de dados.
+
+        Args:
+            status (str): Novo status do pedido, uma das descrições da tabela status_pedido.
+            id_pedido (int): ID do pedido a ser editado.
+
+        Returns:
+            bool: True se a edição foi bem-sucedida, False caso contrário.
         """
-        Cria a tabela Pedido no banco de dados caso ela não exista.
+        retorno = True
+        cursor = None
+        try:
+            cursor = self.get_cursor()
+            self.executar_preparada(cursor, "pedido_editar_status", (status, id_pedido))
+            self.commit()
+        except Exception as e:
+            print("[LOG ERRO] Erro ao editar status do pedido: ", e)
+            self.rollback()
+            retorno = False
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+        return retorno
+
+    def editar_status_em_lote(self, ids: Iterable[int], status: str) -> Union[list[int], None]:
+        """
+        Edita o status de vários pedidos em um único UPDATE, por exemplo ao fechar uma mesa.
+
+        Apenas os pedidos que estavam com outro status são alterados, então a notificação de
+        sincronização do comando leva somente os ids que realmente mudaram.
+
+        Args:
+            ids (Iterable[int]): IDs dos pedidos.
+            status (str): Novo status dos pedidos, uma das descrições da tabela status_pedido.
+
+        Returns:
+            Union[list[int], None]: IDs dos pedidos alterados, em ordem, ou None em caso de erro.
         """
+        retorno = None
+        cursor = None
         try:
             cursor = self.get_cursor()
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS Pedido (
-                    id SERIAL PRIMARY KEY,
-                    mesa INT NOT NULL,
-                    status VARCHAR(255) NOT NULL,
-                    data_hora TIMESTAMP NOT NULL
-                );
-            """)
+                UPDATE Pedido SET status = codigo_status_pedido(%s)
+                WHERE id = ANY(%s) AND status IS DISTINCT FROM codigo_status_pedido(%s)
+                RETURNING id;
+            """, (status, [int(id) for id in ids], status))
+            retorno = sorted(id for (id,) in cursor.fetchall())
             self.commit()
-            print("[LOG INFO] Tabela inicializada com sucesso!")
         except Exception as e:
-            print(f"[LOG ERRO] Não foi possível criar a tabela: {e}")
+            print("[LOG ERRO] Erro ao editar status dos pedidos: ", e)
+            self.rollback()
+            retorno = None
         finally:
-            cursor.close()
+            if cursor is not None:
+                cursor.close()
 
-    def editar_status(self, status: str, id_pedido: int) -> bool:
+        return retorno
+
+    def editar_status_dos_abertos(self, status: str, mesa: int | None = None, status_atual: str | None = None) -> Union[list[int], None]:
         """
-        Edita o status de um pedido no banco de dados.
+        Edita o status dos pedidos abertos que atendem aos filtros em um único UPDATE, por
+        exemplo todos os pedidos da mesa 5 que estão em "Entregar", ou todos os pedidos
+        abertos ao final do expediente.
+
+        Apenas a fila de pedidos abertos (status não final) é considerada, de forma que o
+        comando lê o índice parcial idx_pedido_abertos em vez do histórico de pedidos.
 
         Args:
-            status (str): Novo status do pedido.
-            id_pedido (int): ID do pedido a ser editado.
+            status (str): Novo status dos pedidos, uma das descrições da tabela status_pedido.
+            mesa (int | None): Se informado, altera apenas os pedidos dessa mesa.
+            status_atual (str | None): Se informado, altera apenas os pedidos com esse status.
 
         Returns:
-            bool: True se a edição foi bem-sucedida, False caso contrário.
+            Union[list[int], None]: IDs dos pedidos alterados, em ordem, ou None em caso de erro.
         """
-        retorno = True
+        condicoes = [CONDICAO_PEDIDOS_ABERTOS, "status IS DISTINCT FROM codigo_status_pedido(%s)"]
+        parametros = [status, status]
+        if mesa is not None:
+            condicoes.append("mesa = %s")
+            parametros.append(mesa)
+        if status_atual is not None:
+            condicoes.append("status = codigo_status_pedido(%s)")
+            parametros.append(status_atual)
+
+        retorno = None
+        cursor = None
         try:
-            query = """
-                UPDATE Pedido 
-                SET status = %s
-                WHERE id = %s
-            """
             cursor = self.get_cursor()
-            cursor.execute(query, (status, id_pedido))
+            cursor.execute(
+                f"UPDATE Pedido SET status = codigo_status_pedido(%s) WHERE {' AND '.join(condicoes)} RETURNING id;",
+                parametros
+            )
+            retorno = sorted(id for (id,) in cursor.fetchall())
             self.commit()
         except Exception as e:
-            print("[LOG ERRO] Erro ao editar status do pedido: ", e)
-            self.post_client.rollback()
-            retorno = False
+            print("[LOG ERRO] Erro ao editar status dos pedidos abertos: ", e)
+            self.rollback()
+            retorno = None
         finally:
-            cursor.close()
+            if cursor is not None:
+                cursor.close()
 
         return retorno
 
-    def _format_from_inserct(self, pedido: str) -> dict:
+    def _format_from_inserct(self, pedido: Union[Pedido, str]) -> tuple:
         """
         Formata os dados do pedido para inserção no banco de dados.
 
         Args:
-            pedido (str): Dados do pedido em formato JSON.
+            pedido (Union[Pedido, str]): Pedido, ou seus dados em formato JSON.
 
         Returns:
-            dict: Dicionário contendo os dados formatados para inserção.
+            tuple: Tupla (mesa, status, data_hora).
         """
+        if isinstance(pedido, Pedido):
+            return (pedido.mesa, pedido.status, pedido.data_hora)
         valor = json.loads(pedido)
         return (valor['mesa'], valor["status"], valor["data_hora"])
 
-    def insert_pedido(self, pedido: str) -> bool:
+    def insert_pedido(self, pedido: Union[Pedido, str]) -> bool:
         """
         Insere um pedido no banco de dados.
 
         Args:
-            pedido (str): Dados do pedido em formato JSON.
+            pedido (Union[Pedido, str]): Pedido, ou seus dados em formato JSON.
 
         Returns:
             bool: True se a inserção foi bem-sucedida, False caso contrário.
@@ -107,76 +183,181 @@ class BdPedido(Bd_Base):
             valor = self._format_from_inserct(pedido)
             query = """
                 INSERT INTO Pedido (mesa, status, data_hora) 
-                VALUES (%s, %s, %s)
+                VALUES (%s, codigo_status_pedido(%s), %s)
             """
-            cursor = self.get_cursor()
-            cursor.execute(query, valor)
+            self._executar_criando_particao(lambda cursor: cursor.execute(query, valor), valor[2])
             self.commit()
         except Exception as e:
             print("[LOG ERRO] Erro ao inserir pedido: ", e)
-            self.post_client.rollback()
+            self.rollback()
             retorno = False
-        finally:
-            cursor.close()
 
         return retorno
 
-    def get_last_1000(self) -> Union[list, None]:
+    def get_last_1000(self) -> Union[list[Pedido], None]:
         """
         Retorna os 1000 últimos pedidos do banco de dados.
 
         Returns:
-            Union[list, None]: Lista com os pedidos ou None em caso de erro.
+            Union[list[Pedido], None]: Lista com os pedidos ou None em caso de erro.
         """
         try:
-            cursor = self.get_cursor()
-            cursor.execute("SELECT * FROM Pedido ORDER BY id DESC LIMIT 1000;")
-            resultados = cursor.fetchall()
-            return resultados
+            with self.cursor_leitura() as cursor:
+                cursor.execute(CONSULTA_PEDIDOS + "ORDER BY Pedido.id DESC LIMIT 1000;")
+                resultados = cursor.fetchall()
+            return [Pedido.de_linha(linha) for linha in resultados]
         except Exception:
             return None
-        finally:
-            cursor.close()
 
-    def get_all(self) -> Union[list, None]:
+    def get_abertos(self) -> Union[list[Pedido], None]:
+        """
+        Retorna a fila de pedidos abertos (status não final), do mais antigo ao mais recente.
+
+        A consulta lê apenas o índice parcial idx_pedido_abertos, que contém somente os pedidos
+        abertos, e não depende da quantidade de pedidos já encerrados.
+
+        Returns:
+            Union[list[Pedido], None]: Pedidos abertos ou None em caso de erro.
+        """
+        try:
+            with self.cursor_leitura() as cursor:
+                # A condição repete a do índice parcial, para que o planejador possa usá-lo.
+                cursor.execute(CONSULTA_PEDIDOS + f"WHERE Pedido.{CONDICAO_PEDIDOS_ABERTOS} ORDER BY Pedido.data_hora, Pedido.id;")
+                return [Pedido.de_linha(linha) for linha in cursor.fetchall()]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar pedidos abertos: {e}")
+            return None
+
+    def get_por_periodo(self, inicio: datetime, fim: datetime) -> Union[list[Pedido], None]:
+        """
+        Retorna os pedidos feitos no período, do mais antigo ao mais recente.
+
+        Pedido é particionado por mês de data_hora, então a consulta lê apenas as partições dos
+        meses do período.
+
+        Args:
+            inicio (datetime): Início do período (inclusive).
+            fim (datetime): Fim do período (exclusive).
+
+        Returns:
+            Union[list[Pedido], None]: Pedidos do período ou None em caso de erro.
+        """
+        try:
+            with self.cursor_leitura() as cursor:
+                cursor.execute(
+                    CONSULTA_PEDIDOS + "WHERE Pedido.data_hora >= %s AND Pedido.data_hora < %s ORDER BY Pedido.data_hora, Pedido.id;",
+                    (inicio, fim)
+                )
+                return [Pedido.de_linha(linha) for linha in cursor.fetchall()]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar pedidos do período: {e}")
+            return None
+
+    def marcador_atual(self) -> Union[int, None]:
+        """
+        Retorna o marcador a partir do qual `get_alterados_desde` deve buscar as alterações.
+
+        Deve ser obtido antes de uma carga completa (por exemplo `get_last_1000`), para que as
+        alterações feitas durante a carga sejam buscadas depois.
+
+        Returns:
+            Union[int, None]: Marcador atual ou None em caso de erro.
+        """
+        try:
+            with self.cursor_leitura() as cursor:
+                cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot());")
+                return cursor.fetchone()[0]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar o marcador de alterações: {e}")
+            return None
+
+    def get_alterados_desde(self, marcador: int) -> Union[Tuple[List[Pedido], int], None]:
+        """
+        Retorna os pedidos inseridos ou alterados desde o marcador, usando o índice da coluna
+        versao. O custo acompanha a quantidade de alterações, não o tamanho da tabela.
+
+        O marcador é o id da transação mais antiga ainda em andamento no momento da consulta.
+        Assim um pedido gravado por uma transação confirmada depois da consulta nunca é perdido;
+        em troca, um pedido pode ser retornado de novo na consulta seguinte. Pedidos removidos
+        não são retornados.
+
+        Args:
+            marcador (int): Marcador retornado pela consulta anterior ou por `marcador_atual`.
+
+        Returns:
+            Union[Tuple[List[Pedido], int], None]: Pedidos alterados, do mais recente ao mais
+                antigo, e o marcador para a próxima consulta, ou None em caso de erro.
+        """
+        try:
+            with self.cursor_leitura() as cursor:
+                # O marcador é lido antes dos pedidos: tudo o que foi confirmado antes dele já
+                # aparece na consulta seguinte.
+                cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot());")
+                proximo_marcador = cursor.fetchone()[0]
+                cursor.execute(
+                    CONSULTA_PEDIDOS + "WHERE Pedido.versao >= %s ORDER BY Pedido.id DESC;",
+                    (marcador,)
+                )
+                pedidos = [Pedido.de_linha(linha) for linha in cursor.fetchall()]
+            return pedidos, proximo_marcador
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar pedidos alterados: {e}")
+            return None
+
+    def get_all(self) -> Union[list[Pedido], None]:
         """
         Retorna todos os pedidos do banco de dados.
 
         Returns:
-            Union[list, None]: Lista com os pedidos ou None em caso de erro.
+            Union[list[Pedido], None]: Lista com os pedidos ou None em caso de erro.
         """
         try:
-            cursor = self.get_cursor()
-            cursor.execute("SELECT * FROM Pedido;")
-            resultados = cursor.fetchall()
-            return resultados
+            with self.cursor_leitura() as cursor:
+                cursor.execute(CONSULTA_PEDIDOS + ";")
+                resultados = cursor.fetchall()
+            return [Pedido.de_linha(linha) for linha in resultados]
         except Exception:
             return None
-        finally:
-            cursor.close()
+
+    def iter_all(self, tamanho_lote: int | None = None) -> Iterator[Pedido]:
+        """
+        Percorre todos os pedidos do banco de dados sem carregá-los de uma vez na memória.
+
+        Args:
+            tamanho_lote (int | None): Pedidos buscados por vez. Default é `tamanho_lote` da classe.
+
+        Yields:
+            Pedido: Cada pedido.
+        """
+        for linha in self.iterar_consulta(CONSULTA_PEDIDOS + ";", tamanho_lote=tamanho_lote):
+            yield Pedido.de_linha(linha)
+
+    def iter_pedidos_csv(self, tamanho_lote: int | None = None) -> Iterator[str]:
+        """
+        Gera o CSV dos pedidos linha a linha, começando pelo cabeçalho.
+
+        Args:
+            tamanho_lote (int | None): Pedidos buscados por vez. Default é `tamanho_lote` da classe.
+
+        Yields:
+            str: Cada linha do CSV, terminada em quebra de linha.
+        """
+        yield "id,mesa,status,data_hora\n"
+        consulta = CONSULTA_PEDIDOS + ";"
+        for linha in self.iterar_consulta(consulta, tamanho_lote=tamanho_lote):
+            yield ",".join(str(celula) for celula in linha) + "\n"
 
     def get_pedidos_csv(self) -> str:
         """
         Busca os pedidos do banco de dados e converte para um texto CSV.
 
+        Para gravar o CSV em um arquivo sem montar o texto inteiro, use `iter_pedidos_csv`.
+
         Returns:
             str: Texto CSV com os pedidos ou uma string vazia em caso de erro.
         """
         try:
-            cursor = self.get_cursor()
-            cursor.execute("""
-                SELECT * FROM Pedido;
-            """)
-
-            rows = cursor.fetchall()
-            headers = [desc[0] for desc in cursor.description]
-
-            csv_text = ",".join(headers) + "\n"
-            for row in rows:
-                csv_text += ",".join(str(cell) for cell in row) + "\n"
-            return csv_text
+            return "".join(self.iter_pedidos_csv())
         except Exception as e:
             print(f"[LOG ERRO] Erro ao buscar pedidos: {e}")
             return ""
-        finally:
-            cursor.close()
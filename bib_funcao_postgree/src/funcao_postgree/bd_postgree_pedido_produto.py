@@ -3,8 +3,51 @@ Modulo responsável por realizar a comunicação com o banco de dados dos pedido
 """
 
 from .bd_postgree_base import Bd_Base
-from typing import Union, List, Dict
+from .bd_postgree_modelos import ItemPedido, Pedido
+from typing import Iterable, Iterator, Union, List, Dict, Tuple
 from datetime import datetime
+from decimal import Decimal
+import io
+
+# Pedidos com todos os itens, uma linha por pedido. Os itens vêm agregados em arrays paralelos
+# (produto, nome, quantidade, preço), que o driver converte para listas com os tipos das colunas,
+# inclusive Decimal para o preço. Um pedido sem itens tem os arrays NULL.
+CONSULTA_PEDIDOS_COMPLETOS = """
+    SELECT Pedido.id, Pedido.mesa, status_pedido.descricao AS status, Pedido.data_hora,
+           itens.produto_ids, itens.nomes, itens.quantidades, itens.precos
+    FROM Pedido
+    JOIN status_pedido ON status_pedido.id = Pedido.status
+    CROSS JOIN LATERAL (
+        SELECT array_agg(Produto_Pedido.produto_id ORDER BY Produto_Pedido.id) AS produto_ids,
+               array_agg(Produto.nome ORDER BY Produto_Pedido.id) AS nomes,
+               array_agg(Produto_Pedido.quantidade ORDER BY Produto_Pedido.id) AS quantidades,
+               array_agg(Produto_Pedido.preco_pago ORDER BY Produto_Pedido.id) AS precos
+        FROM Produto_Pedido
+        JOIN Produto ON Produto.id = Produto_Pedido.produto_id
+        WHERE Produto_Pedido.pedido_id = Pedido.id AND Produto_Pedido.pedido_data_hora = Pedido.data_hora
+    ) AS itens
+    WHERE Pedido.id = ANY(%s)
+    ORDER BY Pedido.id;
+"""
+
+
+def pedido_completo_de_linha(linha: Tuple) -> Tuple[Pedido, List[ItemPedido]]:
+    """
+    Converte uma linha de `CONSULTA_PEDIDOS_COMPLETOS` no pedido e na lista dos seus itens.
+
+    Args:
+        linha (Tuple): Linha no formato (id, mesa, status, data_hora, produto_ids, nomes, quantidades, precos).
+
+    Returns:
+        Tuple[Pedido, List[ItemPedido]]: Pedido e itens, na ordem em que foram inseridos.
+    """
+    pedido = Pedido.de_linha(linha[:4])
+    produto_ids, nomes, quantidades, precos = (coluna or [] for coluna in linha[4:])
+    itens = [
+        ItemPedido(produto_id, quantidade, preco_pago, nome, pedido.id)
+        for produto_id, nome, quantidade, preco_pago in zip(produto_ids, nomes, quantidades, precos)
+    ]
+    return pedido, itens
 
 
 class BdPedidoProduto(Bd_Base):
@@ -15,9 +58,29 @@ class BdPedidoProduto(Bd_Base):
     como inserção, busca e exportação de dados relacionados aos pedidos e produtos.
     """
 
+    DECLARACOES_PREPARADAS = {
+        # Pedido e itens em um único comando: os itens chegam como três arrays paralelos
+        # (produto_id, quantidade, preco_pago) e são expandidos com unnest no servidor.
+        "produto_pedido_inserir_pedido": (
+            "INT, VARCHAR, TIMESTAMP, INT[], INT[], DECIMAL[]",
+            """
+            WITH novo_pedido AS (
+                INSERT INTO Pedido (mesa, status, data_hora) VALUES ($1, codigo_status_pedido($2), $3) RETURNING id, data_hora
+            ), novos_itens AS (
+                INSERT INTO Produto_Pedido (pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago)
+                SELECT novo_pedido.id, novo_pedido.data_hora, item.produto_id, item.quantidade, item.preco_pago
+                FROM novo_pedido, unnest($4, $5, $6) AS item (produto_id, quantidade, preco_pago)
+                RETURNING quantidade * preco_pago AS total_item
+            )
+            SELECT novo_pedido.id, (SELECT COALESCE(SUM(total_item), 0) FROM novos_itens)
+            FROM novo_pedido
+            """
+        ),
+    }
+
     def __init__(self, host: str = 'localhost', database: str = 'database-postgres', user: str = 'root', password: str = 'root') -> None:
         """
-        Inicializa a conexão com o banco de dados e cria a tabela Produto_Pedido caso ela não exista.
+        Inicializa a conexão com o banco de dados. A tabela Produto_Pedido é criada pelas migrações do esquema.
 
         Args:
             host (str): Endereço do host do banco de dados.
@@ -26,78 +89,154 @@ class BdPedidoProduto(Bd_Base):
             password (str): Senha para autenticação.
         """
         super().__init__(host, database, user, password)
-        self.database_init()
 
-    def database_init(self) -> None:
+    def inserir_pedido_com_produtos(self, produtos: List[Union[ItemPedido, Dict[str, int | float]]], mesa: int, status: str) -> Union[Tuple[int, Decimal], bool]:
         """
-        Cria a tabela Produto_Pedido no banco de dados caso ela não exista.
+        Insere um pedido e seus produtos no banco de dados.
+
+        O pedido e todos os itens são gravados por um único comando, em uma ida e volta ao
+        banco, independentemente da quantidade de itens.
+
+        Args:
+            produtos (List[Union[ItemPedido, Dict[str, int | float]]]): Itens a serem inseridos no
+                pedido, ou dicionários com as chaves 'produto_id', 'quantidade' e 'preco_pago'.
+            mesa (int): Número da mesa do pedido.
+            status (str): Status do pedido.
+
+        Returns:
+            Union[Tuple[int, Decimal], bool]: ID do pedido criado e o total (soma de quantidade x
+                preço pago dos itens), ou False caso a inserção falhe.
         """
         try:
-            cursor = self.get_cursor()
+            data_hora = datetime.now()
 
-            print("[LOG INFO] Criando tabela Produto_Pedido...")
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS Produto_Pedido (
-                    id SERIAL PRIMARY KEY,
-                    pedido_id INT NOT NULL,
-                    produto_id INT NOT NULL,
-                    quantidade INT NOT NULL,
-                    preco_pago DECIMAL(10, 2) NOT NULL,
-                    FOREIGN KEY (pedido_id) REFERENCES Pedido (id) ON DELETE CASCADE,
-                    FOREIGN KEY (produto_id) REFERENCES Produto (id) ON DELETE CASCADE
-                );
-            """)
+            itens = [
+                ItemPedido(**produto) if isinstance(produto, dict) else produto
+                for produto in produtos
+            ]
+
+            def inserir(cursor):
+                self.executar_preparada(cursor, "produto_pedido_inserir_pedido", (
+                    mesa,
+                    status,
+                    data_hora,
+                    [item.produto_id for item in itens],
+                    [item.quantidade for item in itens],
+                    [item.preco_pago for item in itens],
+                ))
+                return cursor.fetchone()
+
+            pedido_id, total = self._executar_criando_particao(inserir, data_hora)
 
             self.commit()
-            print("[LOG INFO] Estrutura do banco inicializada com sucesso!")
+            print(f"[LOG INFO] Pedido {pedido_id} e produtos inseridos com sucesso!")
+            return pedido_id, total
         except Exception as e:
-            print(f"[LOG ERRO] Não foi possível inicializar o banco: {e}")
-        finally:
-            cursor.close()
+            print(f"[LOG ERRO] Erro ao inserir pedido e produtos: {e}")
+            self.rollback()
+            return False
 
-    def inserir_pedido_com_produtos(self, produtos: List[Dict[int, float]], mesa: int, status: str) -> bool:
+    def _linha_copy(self, valores: tuple) -> str:
         """
-        Insere um pedido e seus produtos no banco de dados.
+        Formata uma linha no formato texto do COPY, separada por tabulações.
 
         Args:
-            produtos (List[Dict[int, float]]): Lista de produtos a serem inseridos no pedido.
-                Cada produto é um dicionário com as chaves 'produto_id', 'quantidade' e 'preco_pago'.
-            mesa (int): Número da mesa do pedido.
-            status (str): Status do pedido.
+            valores (tuple): Valores das colunas. None é gravado como NULL.
+
+        Returns:
+            str: Linha terminada em quebra de linha, com os caracteres especiais escapados.
+        """
+        campos = []
+        for valor in valores:
+            if valor is None:
+                campos.append("\\N")
+            else:
+                campos.append(
+                    str(valor).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+                )
+        return "\t".join(campos) + "\n"
+
+    def inserir_pedidos_em_lote(self, pedidos: Iterable[Tuple[Pedido, List[Union[ItemPedido, Dict[str, int | float]]]]]) -> Union[List[int], None]:
+        """
+        Insere vários pedidos com seus itens em uma única transação, por exemplo ao reenviar os
+        pedidos de um terminal que ficou sem conexão ou ao importar pedidos de um parceiro.
+
+        Os ids dos pedidos são reservados de uma vez na sequência da tabela Pedido. Pedidos e
+        itens são enviados com COPY para tabelas temporárias e passam para Pedido e
+        Produto_Pedido com um INSERT ... SELECT para cada tabela. As partições dos meses do lote
+        que ainda não existirem são criadas na mesma transação, para que pedidos antigos ou
+        adiantados sejam aceitos. Se algum pedido for recusado pelo banco, nenhum é gravado.
+
+        Args:
+            pedidos (Iterable[Tuple[Pedido, List[Union[ItemPedido, Dict[str, int | float]]]]]): Pares
+                (pedido, itens). A data/hora de cada pedido é mantida; os itens podem ser
+                dicionários com as chaves 'produto_id', 'quantidade' e 'preco_pago'.
 
         Returns:
-            bool: True se a inserção foi bem-sucedida, False caso contrário.
+            Union[List[int], None]: ID gravado para cada pedido, na mesma ordem da entrada, ou None
+                em caso de erro.
         """
+        pedidos = list(pedidos)
+        if not pedidos:
+            return []
+
+        cursor = None
         try:
             cursor = self.get_cursor()
-            data_hora = datetime.now()
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence('pedido', 'id')) FROM generate_series(1, %s);",
+                (len(pedidos),)
+            )
+            ids = sorted(id for (id,) in cursor.fetchall())
+
+            datas = [pedido.data_hora for pedido, _ in pedidos]
+            cursor.execute("SELECT criar_particoes_pedidos(%s::date, %s::date);", (min(datas), max(datas)))
 
-            print(f"[LOG INFO] Inserindo pedido com data/hora: {data_hora}")
+            # As tabelas temporárias ficam na conexão do pool e são esvaziadas a cada commit.
             cursor.execute("""
-                INSERT INTO Pedido (mesa, status, data_hora)
-                VALUES (%s, %s, %s) RETURNING id;
-            """, (mesa, status, data_hora))
+                CREATE TEMP TABLE IF NOT EXISTS lote_pedido (
+                    id INT, mesa INT, status VARCHAR(255), data_hora TIMESTAMP
+                ) ON COMMIT DELETE ROWS;
+                CREATE TEMP TABLE IF NOT EXISTS lote_produto_pedido (
+                    pedido_id INT, pedido_data_hora TIMESTAMP, produto_id INT, quantidade INT, preco_pago DECIMAL(10, 2)
+                ) ON COMMIT DELETE ROWS;
+                TRUNCATE lote_pedido, lote_produto_pedido;
+            """)
 
-            pedido_id = cursor.fetchone()[0]
-            print(f"[LOG INFO] Pedido inserido com ID: {pedido_id}")
+            linhas_pedidos = io.StringIO()
+            linhas_itens = io.StringIO()
+            for pedido_id, (pedido, itens) in zip(ids, pedidos):
+                linhas_pedidos.write(self._linha_copy((pedido_id, pedido.mesa, pedido.status, pedido.data_hora)))
+                for item in itens:
+                    if isinstance(item, dict):
+                        item = ItemPedido(**item)
+                    linhas_itens.write(self._linha_copy((pedido_id, pedido.data_hora, item.produto_id, item.quantidade, item.preco_pago)))
+            linhas_pedidos.seek(0)
+            linhas_itens.seek(0)
 
-            for produto in produtos:
-                cursor.execute("""
-                    INSERT INTO Produto_Pedido (pedido_id, produto_id, quantidade, preco_pago)
-                    VALUES (%s, %s, %s, %s);
-                """, (pedido_id, produto['produto_id'], produto['quantidade'], produto['preco_pago']))
+            cursor.copy_expert("COPY lote_pedido (id, mesa, status, data_hora) FROM STDIN", linhas_pedidos)
+            cursor.copy_expert(
+                "COPY lote_produto_pedido (pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago) FROM STDIN", linhas_itens
+            )
+            cursor.execute("""
+                INSERT INTO Pedido (id, mesa, status, data_hora)
+                SELECT id, mesa, codigo_status_pedido(status), data_hora FROM lote_pedido;
+                INSERT INTO Produto_Pedido (pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago)
+                SELECT pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago FROM lote_produto_pedido;
+            """)
 
             self.commit()
-            print("[LOG INFO] Pedido e produtos inseridos com sucesso!")
-            return True
+            print(f"[LOG INFO] {len(ids)} pedidos inseridos em lote.")
+            return ids
         except Exception as e:
-            print(f"[LOG ERRO] Erro ao inserir pedido e produtos: {e}")
+            print(f"[LOG ERRO] Erro ao inserir pedidos em lote: {e}")
             self.rollback()
-            return False
+            return None
         finally:
-            cursor.close()
+            if cursor is not None:
+                cursor.close()
 
-    def get_produtos_do_pedido(self, id_pedido: int) -> List[Dict[str, int | float]] | None:
+    def get_produtos_do_pedido(self, id_pedido: int) -> List[ItemPedido] | None:
         """
         Busca os produtos de um pedido no banco de dados.
 
@@ -105,59 +244,79 @@ class BdPedidoProduto(Bd_Base):
             id_pedido (int): ID do pedido.
 
         Returns:
-            List[Dict[str, int | float]] | None: Lista de produtos do pedido ou None em caso de erro.
-                A lista contém dicionários com as chaves 'produto_id', 'nome', 'quantidade' e 'preco_pago'.
+            List[ItemPedido] | None: Itens do pedido, com o nome do produto, ou None em caso de erro.
         """
         try:
-            cursor = self.get_cursor()
-            cursor.execute("""
-                SELECT Produto_Pedido.produto_id, Produto.nome, Produto_Pedido.quantidade, Produto_Pedido.preco_pago
-                FROM Produto_Pedido
-                JOIN Produto ON Produto_Pedido.produto_id = Produto.id
-                WHERE Produto_Pedido.pedido_id = %s;
-            """, (id_pedido,))
-
-            produtos = cursor.fetchall()
-            produtos = [
-                {
-                    'produto_id': produto[0],
-                    'nome': produto[1],
-                    'quantidade': produto[2],
-                    'preco_pago': produto[3]
-                }
-                for produto in produtos
-            ]
+            with self.cursor_leitura() as cursor:
+                cursor.execute("""
+                    SELECT Produto_Pedido.produto_id, Produto.nome, Produto_Pedido.quantidade, Produto_Pedido.preco_pago
+                    FROM Produto_Pedido
+                    JOIN Produto ON Produto_Pedido.produto_id = Produto.id
+                    -- A data/hora do pedido vem de uma subconsulta (executada antes da leitura dos itens):
+                    -- com ela, apenas a partição de Produto_Pedido do mês do pedido é lida. Em um JOIN com
+                    -- Pedido o planejador procura o pedido_id em todas as partições.
+                    WHERE Produto_Pedido.pedido_id = %s
+                      AND Produto_Pedido.pedido_data_hora = (SELECT data_hora FROM Pedido WHERE id = %s);
+                """, (id_pedido, id_pedido))
 
-            return produtos
+                produtos = cursor.fetchall()
+            return [
+                ItemPedido(produto_id, quantidade, preco_pago, nome, id_pedido)
+                for produto_id, nome, quantidade, preco_pago in produtos
+            ]
         except Exception as e:
             print(f"[LOG ERRO] Erro ao buscar produtos do pedido: {e}")
             return None
-        finally:
-            cursor.close()
+
+    def get_pedidos_completos(self, ids: Iterable[int]) -> List[Tuple[Pedido, List[ItemPedido]]] | None:
+        """
+        Busca vários pedidos com todos os seus itens em uma única consulta, em vez de uma
+        chamada a `get_produtos_do_pedido` por pedido.
+
+        Args:
+            ids (Iterable[int]): IDs dos pedidos.
+
+        Returns:
+            List[Tuple[Pedido, List[ItemPedido]]] | None: Pares (pedido, itens com o nome do produto),
+                em ordem de id, ou None em caso de erro. IDs inexistentes são ignorados.
+        """
+        try:
+            with self.cursor_leitura() as cursor:
+                cursor.execute(CONSULTA_PEDIDOS_COMPLETOS, ([int(id) for id in ids],))
+                return [pedido_completo_de_linha(linha) for linha in cursor.fetchall()]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao buscar pedidos completos: {e}")
+            return None
+
+    def iter_pedidos_produto_csv(self, tamanho_lote: int | None = None) -> Iterator[str]:
+        """
+        Gera o CSV dos produtos dos pedidos linha a linha, começando pelo cabeçalho.
+
+        Args:
+            tamanho_lote (int | None): Linhas buscadas por vez. Default é `tamanho_lote` da classe.
+
+        Yields:
+            str: Cada linha do CSV, terminada em quebra de linha.
+        """
+        yield "id,pedido_id,produto_id,quantidade,preco_pago\n"
+        consulta = """
+            SELECT Produto_Pedido.id, Produto_Pedido.pedido_id, Produto_Pedido.produto_id, Produto_Pedido.quantidade, Produto_Pedido.preco_pago
+            FROM Produto_Pedido;
+        """
+        for linha in self.iterar_consulta(consulta, tamanho_lote=tamanho_lote):
+            yield ",".join(str(celula) for celula in linha) + "\n"
 
     def get_pedidos_produto_csv(self) -> str:
         """
         Busca os pedidos e produtos do banco de dados e converte para um texto CSV.
 
+        Para gravar o CSV em um arquivo sem montar o texto inteiro, use `iter_pedidos_produto_csv`.
+
         Returns:
             str: Texto CSV com os pedidos e produtos ou uma string vazia em caso de erro.
         """
         try:
-            cursor = self.get_cursor()
-            cursor.execute("""
-                SELECT Produto_Pedido.id, Produto_Pedido.pedido_id, Produto_Pedido.produto_id, Produto_Pedido.quantidade, Produto_Pedido.preco_pago
-                FROM Produto_Pedido;
-            """)
-
-            rows = cursor.fetchall()
-            headers = [desc[0] for desc in cursor.description]
-
-            csv_text = ",".join(headers) + "\n"
-            for row in rows:
-                csv_text += ",".join(str(cell) for cell in row) + "\n"
-            return csv_text
+            return "".join(self.iter_pedidos_produto_csv())
         except Exception as e:
             print(f"[LOG ERRO] Erro ao buscar pedidos e produtos: {e}")
             return ""
-        finally:
-            cursor.close()
@@ -3,7 +3,10 @@ Módulo com a classe para manipulação de dados da tabela Produto no banco de d
 """
 
 from .bd_postgree_base import Bd_Base
-from typing import Union
+from .bd_postgree_modelos import Produto
+from psycopg2.extras import execute_values
+from decimal import Decimal
+from typing import Iterable, Iterator, Union
 import json
 
 class BdProduto(Bd_Base):
@@ -11,58 +14,43 @@ class BdProduto(Bd_Base):
     Classe para manipulação de dados da tabela Produto no banco de dados PostgreSQL.
     """
 
+    DECLARACOES_PREPARADAS = {
+        "produto_por_id": ("INT", "SELECT * FROM Produto WHERE id = $1"),
+    }
+
     def __init__(self, host: str = 'localhost', database: str = 'database-postgres', user: str = 'root', password: str = 'root') -> None:
         """
-        Inicializa a conexão com o banco de dados, e cria a tabela Produto caso não exista.
+        Inicializa a conexão com o banco de dados. A tabela Produto é criada pelas migrações do esquema.
         """
         super().__init__(host, database, user, password)
-        self.database_init()
-
-    def database_init(self) -> None:
-        """
-        Inicia a estrutura do banco de dados, criando a tabela Produto caso não exista.
-        """
-        try:
-            cursor = self.get_cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS Produto (
-                    id SERIAL PRIMARY KEY,
-                    nome VARCHAR(255) UNIQUE,
-                    preco DECIMAL(10, 2) NOT NULL,
-                    disponivel BOOLEAN DEFAULT TRUE
-                );
-            """)
-
-            self.commit()
-        except Exception as e:
-            print(f"[LOG ERRO] Não foi possível criar a tabela: {e}")
-        finally:
-            cursor.close()
 
-    def _format_from_inserct(self, produto: str) -> dict:
+    def _format_from_inserct(self, produto: Union[Produto, str]) -> tuple:
         """
         Formata os dados para inserção no banco de dados.
         
         Args:
-            produto (str): Dados do produto em formato JSON.
+            produto (Union[Produto, str]): Produto, ou seus dados em formato JSON.
         
         Returns:
-            dict: Dicionário com os dados formatados.
+            tuple: Tupla (nome, preco, disponivel).
         """
+        if isinstance(produto, Produto):
+            return (produto.nome, produto.preco, produto.disponivel)
         valor = json.loads(produto)
         return (valor['nome'], valor["preco"], valor["disponivel"])
 
-    def insert_produto(self, produto: str) -> bool:
+    def insert_produto(self, produto: Union[Produto, str]) -> bool:
         """
         Insere um produto no banco de dados.
         
         Args:
-            produto (str): Dados do produto em formato JSON.
+            produto (Union[Produto, str]): Produto, ou seus dados em formato JSON.
             
         returns:
             bool: True se a inserção foi bem sucedida, False caso contrário.
         """
         retorno = True
+        cursor = None
         try:
             valor = self._format_from_inserct(produto)
             query = """
@@ -75,25 +63,131 @@ class BdProduto(Bd_Base):
             
         except Exception as e:
             print("[LOG ERRO] Erro ao inserir produto: ", e)
-            self.post_client.rollback()
+            self.rollback()
             retorno = False
         finally:
-            cursor.close()
+            if cursor is not None:
+                cursor.close()
 
         return retorno
 
-    def atualizar_produto(self, produto: str, id_produto: int) -> bool:
+    def _validar_produto(self, produto: Union[Produto, str, dict]) -> tuple:
+        """
+        Valida e formata um produto para o upsert.
+
+        Args:
+            produto (Union[Produto, str, dict]): Produto, ou seus dados em JSON ou dicionário, com
+            as chaves 'nome', 'preco' e 'disponivel' (opcional, default True).
+
+        Returns:
+            tuple: Tupla (nome, preco, disponivel).
+
+        Raises:
+            ValueError: Se algum campo estiver ausente ou for inválido.
+        """
+        if isinstance(produto, Produto):
+            nome, preco, disponivel = produto.nome, produto.preco, produto.disponivel
+        else:
+            valor = json.loads(produto) if isinstance(produto, str) else produto
+            nome = valor.get("nome")
+            preco = valor.get("preco")
+            disponivel = valor.get("disponivel", True)
+        if not isinstance(nome, str) or not nome.strip() or len(nome) > 255:
+            raise ValueError(f"nome inválido: {nome!r}")
+        if isinstance(preco, bool) or not isinstance(preco, (int, float, Decimal)) or not 0 <= preco < 10 ** 8:
+            raise ValueError(f"preço inválido: {preco!r}")
+        if not isinstance(disponivel, bool):
+            raise ValueError(f"disponibilidade inválida: {disponivel!r}")
+        return (nome, preco, disponivel)
+
+    def upsert_produtos(self, produtos: Iterable[Union[Produto, str, dict]], tamanho_lote: int | None = None) -> dict[str, int]:
+        """
+        Insere ou atualiza vários produtos, identificados pelo nome, em uma única transação.
+
+        Os produtos são lidos da entrada em lotes de `tamanho_lote` e cada lote é enviado em um
+        único INSERT com várias linhas e ON CONFLICT (nome) DO UPDATE. Produtos cujos dados já
+        estão iguais no banco não são reescritos. Produtos inválidos, ou com um nome repetido na
+        entrada, são rejeitados sem interromper os demais; a primeira ocorrência de cada nome vale.
+
+        Dentro de um bloco `transacao()`, participa da transação em andamento.
+
+        Args:
+            produtos (Iterable[Union[Produto, str, dict]]): Produtos, ou seus dados em JSON ou
+            dicionário, com as chaves 'nome', 'preco' e 'disponivel' (opcional, default True).
+            tamanho_lote (int | None): Produtos enviados por comando. Default é `tamanho_lote` da classe.
+
+        Returns:
+            dict[str, int]: Quantidade de produtos 'inseridos', 'atualizados', 'inalterados' e
+            'rejeitados'. Se o banco recusar a operação, nada é gravado e todos os produtos lidos
+            contam como rejeitados.
+        """
+        query = """
+            INSERT INTO Produto (nome, preco, disponivel) VALUES %s
+            ON CONFLICT (nome) DO UPDATE
+                SET preco = EXCLUDED.preco, disponivel = EXCLUDED.disponivel
+                WHERE (Produto.preco, Produto.disponivel) IS DISTINCT FROM (EXCLUDED.preco, EXCLUDED.disponivel)
+            RETURNING xmax = 0;
+        """
+        tamanho_lote = tamanho_lote or self.tamanho_lote
+        contagem = {"inseridos": 0, "atualizados": 0, "inalterados": 0, "rejeitados": 0}
+        nomes = set()
+        lidos = 0
+
+        def gravar(lote: list[tuple]) -> None:
+            # xmax = 0 identifica as linhas inseridas; as que não voltam não precisaram ser alteradas.
+            resultado = execute_values(cursor, query, lote, page_size=len(lote), fetch=True)
+            inseridos = sum(1 for (inserido,) in resultado if inserido)
+            contagem["inseridos"] += inseridos
+            contagem["atualizados"] += len(resultado) - inseridos
+            contagem["inalterados"] += len(lote) - len(resultado)
+
+        cursor = None
+        try:
+            cursor = self.get_cursor()
+            lote = []
+            for produto in produtos:
+                lidos += 1
+                try:
+                    valor = self._validar_produto(produto)
+                    if valor[0] in nomes:
+                        raise ValueError(f"nome repetido na entrada: {valor[0]!r}")
+                except (ValueError, TypeError, AttributeError) as e:
+                    print(f"[LOG AVISO] Produto rejeitado: {e}")
+                    contagem["rejeitados"] += 1
+                    continue
+
+                nomes.add(valor[0])
+                lote.append(valor)
+                if len(lote) >= tamanho_lote:
+                    gravar(lote)
+                    lote = []
+            if lote:
+                gravar(lote)
+            self.commit()
+        except Exception as e:
+            print("[LOG ERRO] Erro ao gravar produtos: ", e)
+            self.rollback()
+            contagem = {"inseridos": 0, "atualizados": 0, "inalterados": 0, "rejeitados": lidos}
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+        print(f"[LOG INFO] Upsert de produtos: {contagem}")
+        return contagem
+
+    def atualizar_produto(self, produto: Union[Produto, str], id_produto: int) -> bool:
         """
         Atualiza um produto no banco de dados.
         
         Args:
-            produto (str): Dados do produto em formato JSON.
+            produto (Union[Produto, str]): Produto, ou seus dados em formato JSON.
             id_produto (int): ID do produto a ser atualizado.
         
         Returns:
             bool: True se a atualização foi bem sucedida, False caso contrário.
         """
         retorno = True
+        cursor = None
         try:
             valor = self._format_from_inserct(produto)
             query = """
@@ -110,10 +204,11 @@ class BdProduto(Bd_Base):
             
         except Exception as e:
             print("[LOG ERRO] Erro ao atualizar produto: ", e)
-            self.post_client.rollback() 
+            self.rollback() 
             retorno = False
         finally:
-            cursor.close()
+            if cursor is not None:
+                cursor.close()
 
         return retorno
 
@@ -129,46 +224,91 @@ class BdProduto(Bd_Base):
         """
         
         retorno = True
+        cursor = None
         try:
             cursor = self.get_cursor()
             cursor.execute("DELETE FROM Produto WHERE id = %s;", (id_produto,))
             self.commit()
         except Exception as e:
             print("[LOG ERRO] Erro ao remover produto: ", e)
-            self.post_client.rollback()
+            self.rollback()
             retorno = False
         finally:
-            cursor.close()
+            if cursor is not None:
+                cursor.close()
 
         return retorno
 
     def trocar_disponibilidade(self, id_produto: int) -> bool:
         """
         Troca a disponibilidade de um produto no banco de dados.
+
+        A troca é feita em um único UPDATE, sem ler o valor atual antes, de forma que duas
+        trocas simultâneas do mesmo produto não se perdem.
         
         Args:
             id_produto (int): ID do produto a ter a disponibilidade trocada.
         
         Returns:
-            bool: True se a troca foi bem sucedida, False caso contrário.
+            bool: True se a troca foi bem sucedida, False caso contrário ou se o produto não existe.
         """
         retorno = True
+        cursor = None
         try:
             cursor = self.get_cursor()
-            cursor.execute("SELECT disponivel FROM Produto WHERE id = %s;", [id_produto])
-            disponivel = cursor.fetchone()[0]
-            cursor.execute("UPDATE Produto SET disponivel = %s WHERE id = %s;", [not disponivel, id_produto])
+            cursor.execute(
+                "UPDATE Produto SET disponivel = NOT disponivel WHERE id = %s RETURNING disponivel;",
+                [id_produto]
+            )
+            if cursor.fetchone() is None:
+                raise ValueError(f"produto {id_produto} não encontrado")
             self.commit()
         except Exception as e:
             print("[LOG ERRO] Erro ao trocar disponibilidade: ", e)
-            self.post_client.rollback()
+            self.rollback()
             retorno = False
         finally:
-            cursor.close()
+            if cursor is not None:
+                cursor.close()
+
+        return retorno
+
+    def definir_disponibilidade(self, ids: Iterable[int], disponivel: bool) -> Union[list[int], None]:
+        """
+        Define a disponibilidade de vários produtos em um único UPDATE.
+
+        Apenas os produtos que estavam com outro valor são alterados, então a notificação de
+        sincronização do comando leva somente os ids que realmente mudaram.
+
+        Args:
+            ids (Iterable[int]): IDs dos produtos.
+            disponivel (bool): Nova disponibilidade.
+
+        Returns:
+            Union[list[int], None]: IDs dos produtos alterados, em ordem, ou None em caso de erro.
+        """
+        retorno = None
+        cursor = None
+        try:
+            cursor = self.get_cursor()
+            cursor.execute("""
+                UPDATE Produto SET disponivel = %s
+                WHERE id = ANY(%s) AND disponivel IS DISTINCT FROM %s
+                RETURNING id;
+            """, (disponivel, [int(id) for id in ids], disponivel))
+            retorno = sorted(id for (id,) in cursor.fetchall())
+            self.commit()
+        except Exception as e:
+            print("[LOG ERRO] Erro ao definir disponibilidade: ", e)
+            self.rollback()
+            retorno = None
+        finally:
+            if cursor is not None:
+                cursor.close()
 
         return retorno
         
-    def get(self, id: int) -> Union[tuple, None]:
+    def get(self, id: int) -> Union[Produto, None]:
         """
         Consulta um produto no banco de dados.
         
@@ -176,67 +316,180 @@ class BdProduto(Bd_Base):
             id (int): ID do produto a ser consultado.
             
         Returns:
-            Union[tuple, None]: Tupla com os dados do produto, ou None caso não seja encontrado.
+            Union[Produto, None]: Produto encontrado, ou None caso não seja encontrado.
         """
         
         try:
-            cursor = self.get_cursor()
-            cursor.execute("SELECT * FROM Produto WHERE id = %s;", [id])
-            resultado = cursor.fetchone()
+            with self.cursor_leitura() as cursor:
+                self.executar_preparada(cursor, "produto_por_id", (id,))
+                resultado = cursor.fetchone()
 
-            return resultado
+            return Produto.de_linha(resultado) if resultado else None
         except Exception as e:
             print(f"[LOG ERRO] Erro ao consultar dados: {e}")
             return None
-        finally:
-            cursor.close()
 
-    def get_all(self) -> Union[list]:
+    def get_por_ids(self, ids: list[int]) -> Union[list[Produto], None]:
+        """
+        Consulta vários produtos do banco de dados em uma única consulta.
+
+        Args:
+            ids (list[int]): IDs dos produtos a serem consultados.
+
+        Returns:
+            Union[list[Produto], None]: Produtos encontrados, em ordem de id, ou None em caso de erro. Os ids que não existem mais ficam de fora da lista.
+        """
+        try:
+            with self.cursor_leitura() as cursor:
+                cursor.execute("SELECT * FROM Produto WHERE id = ANY(%s) ORDER BY id ASC;", (list(ids),))
+                resultados = cursor.fetchall()
+            return [Produto.de_linha(linha) for linha in resultados]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar dados: {e}")
+            return None
+
+    def get_all(self) -> list[Produto]:
         """
         Consulta todos os produtos no banco de dados.
         
         Returns:
-            list: Lista com os dados dos produtos.
+            list[Produto]: Lista com os produtos, em ordem de id.
         """
         try:
-            cursor = self.get_cursor()
-            cursor.execute("SELECT * FROM Produto ORDER BY id ASC;")
-            resultados = cursor.fetchall()
-            return resultados
+            with self.cursor_leitura() as cursor:
+                cursor.execute("SELECT * FROM Produto ORDER BY id ASC;")
+                resultados = cursor.fetchall()
+            return [Produto.de_linha(linha) for linha in resultados]
         except Exception:
             return []
-        finally:
-            cursor.close()
+
+    def _padrao_prefixo(self, prefixo: str) -> str:
+        """
+        Monta o padrão do LIKE que encontra os nomes começando com o prefixo, sem diferenciar
+        maiúsculas. Compara com `lower(nome)`, a expressão do índice idx_produto_nome_prefixo.
+
+        Args:
+            prefixo (str): Início do nome.
+
+        Returns:
+            str: Padrão do LIKE, com os curingas do prefixo escapados.
+        """
+        prefixo = prefixo.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return prefixo + "%"
+
+    def buscar(self, prefixo: str, limite: int = 20, disponivel: bool | None = None) -> Union[list[Produto], None]:
+        """
+        Busca os produtos cujo nome começa com o prefixo, sem diferenciar maiúsculas, em ordem de nome.
+
+        A busca usa o índice idx_produto_nome_prefixo e não lê a tabela inteira.
+
+        Args:
+            prefixo (str): Início do nome.
+            limite (int): Quantidade máxima de produtos retornados.
+            disponivel (bool | None): Filtra pela disponibilidade. Default é None (todos).
+
+        Returns:
+            Union[list[Produto], None]: Produtos encontrados, ou None em caso de erro.
+        """
+        condicao = "" if disponivel is None else " AND disponivel = %s"
+        parametros = [self._padrao_prefixo(prefixo)] + ([] if disponivel is None else [disponivel]) + [limite]
+        try:
+            with self.cursor_leitura() as cursor:
+                cursor.execute(
+                    f"SELECT * FROM Produto WHERE lower(nome) LIKE %s{condicao} ORDER BY lower(nome), id LIMIT %s;",
+                    parametros
+                )
+                resultados = cursor.fetchall()
+            return [Produto.de_linha(linha) for linha in resultados]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar dados: {e}")
+            return None
+
+    def listar(self, apos_id: int = 0, limite: int = 100, disponivel: bool | None = None,
+               prefixo_nome: str | None = None) -> Union[list[Produto], None]:
+        """
+        Consulta uma página de produtos, em ordem de id, com os filtros aplicados no banco.
+
+        A paginação é por chave: a próxima página começa depois do último id da página atual,
+        de forma que o custo de cada página não depende de quantas já foram lidas.
+
+        Exemplo:
+            pagina = bd_produto.listar(limite=50, disponivel=True)
+            while pagina:
+                ...
+                pagina = bd_produto.listar(pagina[-1].id, 50, disponivel=True)
+
+        Args:
+            apos_id (int): Retorna apenas produtos com id maior que este. Default é 0 (primeira página).
+            limite (int): Quantidade máxima de produtos na página.
+            disponivel (bool | None): Filtra pela disponibilidade. Default é None (todos).
+            prefixo_nome (str | None): Filtra pelo início do nome, sem diferenciar maiúsculas. Default é None (todos).
+
+        Returns:
+            Union[list[Produto], None]: Produtos da página, ou None em caso de erro.
+        """
+        condicoes = ["id > %s"]
+        parametros = [apos_id]
+        if disponivel is not None:
+            condicoes.append("disponivel = %s")
+            parametros.append(disponivel)
+        if prefixo_nome:
+            # Escapa os curingas do LIKE para o prefixo ser comparado literalmente.
+            condicoes.append("lower(nome) LIKE %s")
+            parametros.append(self._padrao_prefixo(prefixo_nome))
+        parametros.append(limite)
+
+        try:
+            with self.cursor_leitura() as cursor:
+                cursor.execute(
+                    f"SELECT * FROM Produto WHERE {' AND '.join(condicoes)} ORDER BY id ASC LIMIT %s;",
+                    parametros
+                )
+                resultados = cursor.fetchall()
+            return [Produto.de_linha(linha) for linha in resultados]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar dados: {e}")
+            return None
+
+    def iter_all(self, tamanho_lote: int | None = None) -> Iterator[Produto]:
+        """
+        Percorre todos os produtos do banco de dados sem carregá-los de uma vez na memória.
+
+        Args:
+            tamanho_lote (int | None): Produtos buscados por vez. Default é `tamanho_lote` da classe.
+
+        Yields:
+            Produto: Cada produto, em ordem de id.
+        """
+        for linha in self.iterar_consulta("SELECT * FROM Produto ORDER BY id ASC;", tamanho_lote=tamanho_lote):
+            yield Produto.de_linha(linha)
+
+    def iter_produto_csv(self, tamanho_lote: int | None = None) -> Iterator[str]:
+        """
+        Gera o CSV dos produtos linha a linha, começando pelo cabeçalho.
+
+        Args:
+            tamanho_lote (int | None): Produtos buscados por vez. Default é `tamanho_lote` da classe.
+
+        Yields:
+            str: Cada linha do CSV, terminada em quebra de linha.
+        """
+        yield "id,nome,preco,disponivel\n"
+        consulta = "SELECT id, nome, preco, disponivel FROM Produto;"
+        for id, nome, preco, disponivel in self.iterar_consulta(consulta, tamanho_lote=tamanho_lote):
+            yield f"{id},{nome},{preco},{disponivel}\n"
 
     def get_produto_csv(self) -> str:
         """
         Busca os produtos do banco de dados e converte para um texto CSV.
-        
+
+        Para gravar o CSV em um arquivo sem montar o texto inteiro, use `iter_produto_csv`.
+
         Returns:
             str: Texto CSV com os produtos, ou uma string vazia em caso de erro.
         """
-        
         try:
-            cursor = self.get_cursor()
-            cursor.execute("SELECT * FROM Produto;")
-            produtos = cursor.fetchall()
-            produtos = [
-                {
-                    'id': produto[0],
-                    'nome': produto[1],
-                    'preco': produto[2],
-                    'disponivel': produto[3]
-                }
-                for produto in produtos
-            ]
-            
-            csv = "id,nome,preco,disponivel\n"
-            for produto in produtos:
-                csv += f"{produto['id']},{produto['nome']},{produto['preco']},{produto['disponivel']}\n"
-            
-            return csv
+            return "".join(self.iter_produto_csv())
         except Exception as e:
             print(f"[LOG ERRO] Erro ao buscar produtos: {e}")
             return ""
-        finally:
-            cursor.close()
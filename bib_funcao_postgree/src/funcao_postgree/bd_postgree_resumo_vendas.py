@@ -0,0 +1,83 @@
+"""
+Modulo responsável pela leitura dos resumos de vendas usados no relatório.
+
+As tabelas resumo_vendas_hora e resumo_vendas_produto são criadas pela migração 7 e mantidas
+pelos gatilhos de Pedido e Produto_Pedido: cada pedido gravado, alterado ou removido atualiza os
+totais do seu grupo na mesma transação. O tamanho dos resumos depende do número de horas e de
+dias com vendas, e não do número de pedidos.
+"""
+
+from .bd_postgree_base import Bd_Base
+from .bd_postgree_modelos import VendaHora, VendaProduto
+from datetime import date, datetime
+from typing import List, Union
+
+
+class BdResumoVendas(Bd_Base):
+    """
+    Classe para consulta dos resumos de vendas no banco de dados PostgreSQL.
+    """
+
+    def __init__(self, host: str = 'localhost', database: str = 'database-postgres', user: str = 'root', password: str = 'root') -> None:
+        """
+        Inicializa a conexão com o banco de dados. Os resumos são criados pelas migrações do esquema.
+        """
+        super().__init__(host, database, user, password)
+
+    def get_vendas_por_hora(self, inicio: datetime | None = None, fim: datetime | None = None) -> Union[List[VendaHora], None]:
+        """
+        Retorna os totais de vendas por hora, mesa e status.
+
+        Grupos que ficaram zerados (por exemplo o status anterior de pedidos que mudaram de
+        status) não são retornados.
+
+        Args:
+            inicio (datetime | None): Se informado, apenas as horas a partir dele.
+            fim (datetime | None): Se informado, apenas as horas anteriores a ele.
+
+        Returns:
+            Union[List[VendaHora], None]: Totais em ordem de hora, ou None em caso de erro.
+        """
+        try:
+            with self.cursor_leitura() as cursor:
+                cursor.execute("""
+                    SELECT resumo.hora, resumo.mesa, status_pedido.descricao, resumo.quantidade, resumo.valor
+                    FROM resumo_vendas_hora AS resumo
+                    JOIN status_pedido ON status_pedido.id = resumo.status
+                    WHERE resumo.quantidade <> 0
+                      AND (%(inicio)s::timestamp IS NULL OR resumo.hora >= %(inicio)s)
+                      AND (%(fim)s::timestamp IS NULL OR resumo.hora < %(fim)s)
+                    ORDER BY resumo.hora, resumo.mesa, resumo.status;
+                """, {"inicio": inicio, "fim": fim})
+                return [VendaHora(*linha) for linha in cursor.fetchall()]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar vendas por hora: {e}")
+            return None
+
+    def get_vendas_por_produto(self, inicio: date | None = None, fim: date | None = None) -> Union[List[VendaProduto], None]:
+        """
+        Retorna os totais de vendas por dia, produto e status.
+
+        Args:
+            inicio (date | None): Se informado, apenas os dias a partir dele.
+            fim (date | None): Se informado, apenas os dias anteriores a ele.
+
+        Returns:
+            Union[List[VendaProduto], None]: Totais em ordem de dia, ou None em caso de erro.
+        """
+        try:
+            with self.cursor_leitura() as cursor:
+                cursor.execute("""
+                    SELECT resumo.data, resumo.produto_id, Produto.nome, status_pedido.descricao, resumo.quantidade, resumo.valor
+                    FROM resumo_vendas_produto AS resumo
+                    JOIN Produto ON Produto.id = resumo.produto_id
+                    JOIN status_pedido ON status_pedido.id = resumo.status
+                    WHERE resumo.quantidade <> 0
+                      AND (%(inicio)s::date IS NULL OR resumo.data >= %(inicio)s)
+                      AND (%(fim)s::date IS NULL OR resumo.data < %(fim)s)
+                    ORDER BY resumo.data, resumo.produto_id, resumo.status;
+                """, {"inicio": inicio, "fim": fim})
+                return [VendaProduto(*linha) for linha in cursor.fetchall()]
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao consultar vendas por produto: {e}")
+            return None
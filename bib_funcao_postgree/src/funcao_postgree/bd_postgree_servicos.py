@@ -0,0 +1,146 @@
+"""
+Módulo com o registro das classes de acesso a dados construídas sob demanda.
+
+Permite declarar as classes de acesso a dados no nível do módulo sem abrir nenhuma conexão na
+importação. A conexão com o banco pode ser aberta em segundo plano enquanto a aplicação
+termina de iniciar, e cada classe é construída no primeiro uso.
+"""
+
+from .bd_postgree_base import Bd_Base
+from typing import Any, Type
+import threading
+
+
+class RegistroServicos:
+    """
+    Registro que guarda os dados de conexão e constrói cada classe de acesso a dados uma única vez.
+
+    Atributos:
+        parametros (dict): Dados de conexão repassados às classes (host, database, user, password).
+    """
+
+    def __init__(self) -> None:
+        """
+        Inicializa o registro sem dados de conexão e sem nenhuma instância.
+        """
+        self.parametros = {}
+        self._instancias = {}
+        self._trava = threading.Lock()
+        self._conexao_em_segundo_plano = None
+
+    def configurar(self, host: str, database: str, user: str, password: str) -> None:
+        """
+        Guarda os dados de conexão usados na construção das classes, sem se conectar ao banco.
+
+        Args:
+            host (str): Endereço do host do banco de dados.
+            database (str): Nome do banco de dados.
+            user (str): Nome de usuário para autenticação.
+            password (str): Senha para autenticação.
+        """
+        self.parametros = {"host": host, "database": database, "user": user, "password": password}
+
+    def conectar_em_segundo_plano(self) -> threading.Thread:
+        """
+        Cria o pool de conexões e aplica as migrações em uma thread separada.
+
+        A aplicação continua iniciando enquanto o banco é conectado. O primeiro uso de um serviço
+        aguarda o fim da conexão.
+
+        Returns:
+            threading.Thread: Thread responsável pela conexão.
+        """
+        with self._trava:
+            if self._conexao_em_segundo_plano is None:
+                self._conexao_em_segundo_plano = threading.Thread(
+                    target=self._conectar, name="conexao_bd", daemon=True
+                )
+                self._conexao_em_segundo_plano.start()
+        return self._conexao_em_segundo_plano
+
+    def _conectar(self) -> None:
+        """
+        Cria o pool de conexões com os dados configurados.
+        """
+        try:
+            Bd_Base(**self.parametros)
+        except Exception as e:
+            print(f"[LOG ERRO] Erro ao conectar ao banco em segundo plano: {e}")
+
+    def obter(self, classe: Type[Bd_Base]) -> Bd_Base:
+        """
+        Retorna a instância da classe, construindo-a no primeiro pedido.
+
+        Args:
+            classe (Type[Bd_Base]): Classe de acesso a dados.
+
+        Returns:
+            Bd_Base: Instância compartilhada da classe.
+        """
+        instancia = self._instancias.get(classe)
+        if instancia is not None:
+            return instancia
+
+        conexao = self._conexao_em_segundo_plano
+        if conexao is not None and conexao is not threading.current_thread():
+            conexao.join()
+
+        with self._trava:
+            instancia = self._instancias.get(classe)
+            if instancia is None:
+                instancia = self._instancias[classe] = classe(**self.parametros)
+        return instancia
+
+    def preguicoso(self, classe: Type[Bd_Base]) -> "ServicoPreguicoso":
+        """
+        Retorna um objeto que se comporta como a instância da classe, mas só a constrói no primeiro uso.
+
+        Args:
+            classe (Type[Bd_Base]): Classe de acesso a dados.
+
+        Returns:
+            ServicoPreguicoso: Representante da instância da classe.
+        """
+        return ServicoPreguicoso(self, classe)
+
+    def limpar(self) -> None:
+        """
+        Descarta as instâncias construídas e os dados de conexão.
+        """
+        with self._trava:
+            self._instancias.clear()
+            self.parametros = {}
+            self._conexao_em_segundo_plano = None
+
+
+class ServicoPreguicoso:
+    """
+    Representante de uma classe de acesso a dados que repassa todos os atributos à instância
+    construída pelo registro no primeiro uso.
+
+    Atributos privados e especiais (como `__code__` e `_is_coroutine`, consultados pelo
+    `unittest.mock.patch`) não são repassados, para que inspecionar o representante não abra uma conexão.
+    """
+
+    def __init__(self, registro: RegistroServicos, classe: Type[Bd_Base]) -> None:
+        """
+        Args:
+            registro (RegistroServicos): Registro que constrói a instância.
+            classe (Type[Bd_Base]): Classe de acesso a dados representada.
+        """
+        object.__setattr__(self, "_registro", registro)
+        object.__setattr__(self, "_classe", classe)
+
+    def __getattr__(self, nome: str) -> Any:
+        if nome.startswith("_"):
+            raise AttributeError(nome)
+        return getattr(self._registro.obter(self._classe), nome)
+
+    def __setattr__(self, nome: str, valor: Any) -> None:
+        setattr(self._registro.obter(self._classe), nome, valor)
+
+    def __repr__(self) -> str:
+        return f"<ServicoPreguicoso {self._classe.__name__}>"
+
+
+servicos = RegistroServicos()
@@ -7,30 +7,84 @@ class TestBdFuncionario(unittest.TestCase):
     Testes para a classe BdFuncionario
     """
 
+    @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.rollback")
+    @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.commit")
     @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.get_cursor")
+    def test_recuperar_senha_usuario(self, mock_get_cursor, mock_commit, mock_rollback):
+        """
+        Testa o método recuperar_senha_usuario
+
+        Verifica se a senha é trocada em um único UPDATE e a transação é confirmada
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = ("joao",)
+        mock_get_cursor.return_value = mock_cursor
+
+        bd_funcionario = BdFuncionario.__new__(BdFuncionario)
+        usuario, nova_senha = bd_funcionario.recuperar_senha_usuario("joao@email.com")
+
+        self.assertEqual(usuario, "joao")
+        self.assertEqual(len(nova_senha), 8)
+        mock_cursor.execute.assert_called_once()
+        self.assertIn("RETURNING usuario", mock_cursor.execute.call_args.args[0])
+        mock_commit.assert_called_once()
+        mock_rollback.assert_not_called()
+        mock_cursor.close.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.rollback")
     @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.commit")
-    def test_database_init(self, mock_commit, mock_get_cursor):
+    @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.get_cursor")
+    def test_recuperar_senha_usuario_email_desconhecido(self, mock_get_cursor, mock_commit, mock_rollback):
         """
-        Testa o método database_init
-        
-        Verifica se o método cria a tabela funcionario
+        Testa o método recuperar_senha_usuario com um e-mail que não está cadastrado
+
+        Verifica se a transação é encerrada com commit, que não desfaz o trabalho de um bloco
+        `transacao()` em andamento, e False é retornado
         """
         mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
         mock_get_cursor.return_value = mock_cursor
 
         bd_funcionario = BdFuncionario.__new__(BdFuncionario)
-        bd_funcionario.database_init()
-
-        mock_get_cursor.assert_called_once()
-        mock_cursor.execute.assert_called_once_with("""
-                CREATE TABLE IF NOT EXISTS funcionario (
-                    id SERIAL PRIMARY KEY,
-                    usuario VARCHAR(255) UNIQUE,
-                    senha VARCHAR(255) NOT NULL,
-                    email VARCHAR(255) NOT NULL
-                );
-            """)
+
+        self.assertFalse(bd_funcionario.recuperar_senha_usuario("ninguem@email.com"))
         mock_commit.assert_called_once()
+        mock_rollback.assert_not_called()
+        mock_cursor.close.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.rollback")
+    @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.get_cursor")
+    def test_recuperar_senha_usuario_erro(self, mock_get_cursor, mock_rollback):
+        """
+        Testa o método recuperar_senha_usuario quando o comando falha
+
+        Verifica se a transação é desfeita e False é retornado
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = Exception("erro")
+        mock_get_cursor.return_value = mock_cursor
+
+        bd_funcionario = BdFuncionario.__new__(BdFuncionario)
+
+        self.assertFalse(bd_funcionario.recuperar_senha_usuario("joao@email.com"))
+        mock_rollback.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.rollback")
+    @patch("src.funcao_postgree.bd_postgree_funcionario.BdFuncionario.get_cursor")
+    def test_trocar_senha_erro(self, mock_get_cursor, mock_rollback):
+        """
+        Testa o método trocar_senha quando o comando falha
+
+        Verifica se a transação é desfeita, devolvendo a conexão ao pool, e False é retornado
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = Exception("erro")
+        mock_get_cursor.return_value = mock_cursor
+
+        bd_funcionario = BdFuncionario.__new__(BdFuncionario)
+
+        self.assertFalse(bd_funcionario.trocar_senha("joao", "nova_senha"))
+        mock_rollback.assert_called_once()
         mock_cursor.close.assert_called_once()
 
 if __name__ == "__main__":
@@ -1,37 +1,164 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from src.funcao_postgree.bd_postgree_pedido import BdPedido
+from psycopg2.pool import PoolError
+from datetime import datetime
+from src.funcao_postgree.bd_postgree_pedido import BdPedido, CONDICAO_PEDIDOS_ABERTOS, CONSULTA_PEDIDOS
+from src.funcao_postgree.bd_postgree_modelos import Pedido
 
 class TestBdPedido(unittest.TestCase):
     """
     Testes para a classe BdPedido
     """
 
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.cursor_leitura")
+    def test_get_alterados_desde(self, mock_cursor_leitura):
+        """
+        Testa o método get_alterados_desde
+
+        Verifica se o próximo marcador é lido antes dos pedidos e se apenas os pedidos com
+        versão a partir do marcador são consultados
+        """
+        data_hora = datetime(2024, 1, 1, 12, 0)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (120,)
+        mock_cursor.fetchall.return_value = [(8, 2, "Entregar", data_hora)]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_pedido = BdPedido.__new__(BdPedido)
+        resultado = bd_pedido.get_alterados_desde(100)
+
+        self.assertEqual(resultado, ([Pedido(2, "Entregar", data_hora, 8)], 120))
+        consultas = [chamada.args for chamada in mock_cursor.execute.call_args_list]
+        self.assertEqual(consultas, [
+            ("SELECT txid_snapshot_xmin(txid_current_snapshot());",),
+            (CONSULTA_PEDIDOS + "WHERE Pedido.versao >= %s ORDER BY Pedido.id DESC;", (100,)),
+        ])
+
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.cursor_leitura")
+    def test_get_alterados_desde_erro(self, mock_cursor_leitura):
+        """
+        Testa o método get_alterados_desde quando a consulta falha
+
+        Verifica se None é retornado
+        """
+        mock_cursor_leitura.side_effect = Exception("erro")
+
+        bd_pedido = BdPedido.__new__(BdPedido)
+
+        self.assertIsNone(bd_pedido.get_alterados_desde(100))
+
     @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.get_cursor")
     @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.commit")
-    def test_database_init(self, mock_commit, mock_get_cursor):
+    def test_editar_status_em_lote(self, mock_commit, mock_get_cursor):
         """
-        Testa o método database_init
-        
-        Verifica se o método cria a tabela Pedido
+        Testa o método editar_status_em_lote
+
+        Verifica se os pedidos são alterados em um único comando e os ids alterados são retornados
         """
         mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(9,), (4,)]
         mock_get_cursor.return_value = mock_cursor
 
-        bd_funcionario = BdPedido.__new__(BdPedido)
-        bd_funcionario.database_init()
-
-        mock_get_cursor.assert_called_once()
-        mock_cursor.execute.assert_called_once_with("""
-                CREATE TABLE IF NOT EXISTS Pedido (
-                    id SERIAL PRIMARY KEY,
-                    mesa INT NOT NULL,
-                    status VARCHAR(255) NOT NULL,
-                    data_hora TIMESTAMP NOT NULL
-                );
-            """)
+        bd_pedido = BdPedido.__new__(BdPedido)
+        alterados = bd_pedido.editar_status_em_lote(["4", 9, 12], "Pedido finalizado")
+
+        self.assertEqual(alterados, [4, 9])
+        mock_cursor.execute.assert_called_once()
+        self.assertEqual(mock_cursor.execute.call_args.args[1], ("Pedido finalizado", [4, 9, 12], "Pedido finalizado"))
         mock_commit.assert_called_once()
-        mock_cursor.close.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.commit")
+    def test_editar_status_dos_abertos(self, mock_commit, mock_get_cursor):
+        """
+        Testa o método editar_status_dos_abertos com os filtros de mesa e status atual
+
+        Verifica se apenas os pedidos abertos são considerados e os filtros são enviados como parâmetros
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(7,)]
+        mock_get_cursor.return_value = mock_cursor
+
+        bd_pedido = BdPedido.__new__(BdPedido)
+        alterados = bd_pedido.editar_status_dos_abertos("Pedido finalizado", mesa=5, status_atual="Entregar")
+
+        self.assertEqual(alterados, [7])
+        sql, parametros = mock_cursor.execute.call_args.args
+        self.assertIn(CONDICAO_PEDIDOS_ABERTOS, sql)
+        self.assertIn("mesa = %s", sql)
+        self.assertEqual(parametros, ["Pedido finalizado", "Pedido finalizado", 5, "Entregar"])
+        mock_commit.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.rollback")
+    def test_editar_status_em_lote_erro(self, mock_rollback, mock_get_cursor):
+        """
+        Testa o método editar_status_em_lote quando o comando falha, por exemplo com um status desconhecido
+
+        Verifica se a transação é desfeita e None é retornado
+        """
+        mock_get_cursor.return_value.execute.side_effect = Exception("erro")
+
+        bd_pedido = BdPedido.__new__(BdPedido)
+
+        self.assertIsNone(bd_pedido.editar_status_em_lote([1], "Inexistente"))
+        mock_rollback.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.rollback")
+    def test_editar_status_sem_conexao(self, mock_rollback, mock_get_cursor):
+        """
+        Testa os métodos de edição de status quando não há conexão livre no pool
+
+        Verifica se a falha ao obter o cursor é tratada como as demais, sem tentar fechar um cursor
+        que não foi criado
+        """
+        mock_get_cursor.side_effect = PoolError("pool esgotado")
+
+        bd_pedido = BdPedido.__new__(BdPedido)
+
+        self.assertFalse(bd_pedido.editar_status("Entregar", 1))
+        self.assertIsNone(bd_pedido.editar_status_em_lote([1], "Entregar"))
+        self.assertIsNone(bd_pedido.editar_status_dos_abertos("Pedido finalizado", mesa=5))
+        self.assertEqual(mock_rollback.call_count, 3)
+
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.cursor_leitura")
+    def test_get_abertos(self, mock_cursor_leitura):
+        """
+        Testa o método get_abertos
+
+        Verifica se a consulta filtra pelos códigos do índice parcial e retorna a descrição do status
+        """
+        data_hora = datetime(2024, 1, 1, 12, 0)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(4, 1, "Pedido em andamento", data_hora), (6, 3, "Entregar", data_hora)]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_pedido = BdPedido.__new__(BdPedido)
+        pedidos = bd_pedido.get_abertos()
+
+        self.assertEqual(pedidos, [Pedido(1, "Pedido em andamento", data_hora, 4), Pedido(3, "Entregar", data_hora, 6)])
+        self.assertIn(f"WHERE Pedido.{CONDICAO_PEDIDOS_ABERTOS}", mock_cursor.execute.call_args.args[0])
+
+    @patch("src.funcao_postgree.bd_postgree_pedido.BdPedido.cursor_leitura")
+    def test_get_por_periodo(self, mock_cursor_leitura):
+        """
+        Testa o método get_por_periodo
+
+        Verifica se o período é filtrado diretamente em data_hora, a coluna de partição de Pedido
+        """
+        inicio = datetime(2024, 1, 1)
+        fim = datetime(2024, 1, 2)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(4, 1, "Pedido finalizado", datetime(2024, 1, 1, 12, 0))]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_pedido = BdPedido.__new__(BdPedido)
+        pedidos = bd_pedido.get_por_periodo(inicio, fim)
+
+        self.assertEqual(pedidos, [Pedido(1, "Pedido finalizado", datetime(2024, 1, 1, 12, 0), 4)])
+        self.assertIn("WHERE Pedido.data_hora >= %s AND Pedido.data_hora < %s", mock_cursor.execute.call_args.args[0])
+        self.assertEqual(mock_cursor.execute.call_args.args[1], (inicio, fim))
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,37 +1,171 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from src.funcao_postgree.bd_postgree_produto import BdProduto
+from src.funcao_postgree.bd_postgree_modelos import Produto
 
 class TestBdProduto(unittest.TestCase):
     """
     Testes para a classe BdProduto
     """
 
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.cursor_leitura")
+    def test_get_por_ids(self, mock_cursor_leitura):
+        """
+        Testa o método get_por_ids
+
+        Verifica se os produtos são buscados em uma única consulta
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(1, "Pizza", 30.0, True)]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_produto = BdProduto.__new__(BdProduto)
+        resultado = bd_produto.get_por_ids({1, 2})
+
+        self.assertEqual(resultado, [Produto("Pizza", 30.0, True, 1)])
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT * FROM Produto WHERE id = ANY(%s) ORDER BY id ASC;", ([1, 2],)
+        )
+
+    @patch("src.funcao_postgree.bd_postgree_produto.execute_values")
     @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.get_cursor")
     @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.commit")
-    def test_database_init(self, mock_commit, mock_get_cursor):
+    def test_upsert_produtos(self, mock_commit, mock_get_cursor, mock_execute_values):
         """
-        Testa o método database_init
-        
-        Verifica se o método cria a tabela Produto
+        Testa o método upsert_produtos
+
+        Verifica se os produtos válidos são enviados em lotes e se a contagem separa inseridos,
+        atualizados, inalterados e rejeitados
+        """
+        mock_execute_values.side_effect = [[(True,), (False,)], []]
+        produtos = [
+            {"nome": "Pizza", "preco": 30.0},
+            '{"nome": "Suco", "preco": 8, "disponivel": false}',
+            {"nome": "Pizza", "preco": 25.0},
+            {"nome": "Bolo", "preco": -1},
+            {"nome": "Água", "preco": 3},
+        ]
+
+        bd_produto = BdProduto.__new__(BdProduto)
+        contagem = bd_produto.upsert_produtos(produtos, tamanho_lote=2)
+
+        self.assertEqual(contagem, {"inseridos": 1, "atualizados": 1, "inalterados": 1, "rejeitados": 2})
+        lotes = [chamada.args[2] for chamada in mock_execute_values.call_args_list]
+        self.assertEqual(lotes, [[("Pizza", 30.0, True), ("Suco", 8, False)], [("Água", 3, True)]])
+        mock_commit.assert_called_once()
+        mock_get_cursor.return_value.close.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_produto.execute_values")
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.rollback")
+    def test_upsert_produtos_erro(self, mock_rollback, mock_get_cursor, mock_execute_values):
+        """
+        Testa o método upsert_produtos quando o banco recusa a operação
+
+        Verifica se a transação é desfeita e todos os produtos contam como rejeitados
+        """
+        mock_execute_values.side_effect = Exception("erro")
+
+        bd_produto = BdProduto.__new__(BdProduto)
+        contagem = bd_produto.upsert_produtos([{"nome": "Pizza", "preco": 30.0}, {"nome": "Suco", "preco": 8}])
+
+        self.assertEqual(contagem, {"inseridos": 0, "atualizados": 0, "inalterados": 0, "rejeitados": 2})
+        mock_rollback.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.commit")
+    def test_trocar_disponibilidade(self, mock_commit, mock_get_cursor):
+        """
+        Testa o método trocar_disponibilidade
+
+        Verifica se a troca é feita em um único UPDATE
         """
         mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (False,)
         mock_get_cursor.return_value = mock_cursor
 
-        bd_funcionario = BdProduto.__new__(BdProduto)
-        bd_funcionario.database_init()
-
-        mock_get_cursor.assert_called_once()
-        mock_cursor.execute.assert_called_once_with("""
-                CREATE TABLE IF NOT EXISTS Produto (
-                    id SERIAL PRIMARY KEY,
-                    nome VARCHAR(255) UNIQUE,
-                    preco DECIMAL(10, 2) NOT NULL,
-                    disponivel BOOLEAN DEFAULT TRUE
-                );
-            """)
+        bd_produto = BdProduto.__new__(BdProduto)
+
+        self.assertTrue(bd_produto.trocar_disponibilidade(3))
+        mock_cursor.execute.assert_called_once_with(
+            "UPDATE Produto SET disponivel = NOT disponivel WHERE id = %s RETURNING disponivel;", [3]
+        )
         mock_commit.assert_called_once()
-        mock_cursor.close.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.rollback")
+    def test_trocar_disponibilidade_produto_inexistente(self, mock_rollback, mock_get_cursor):
+        """
+        Testa o método trocar_disponibilidade com um produto que não existe
+
+        Verifica se False é retornado
+        """
+        mock_get_cursor.return_value.fetchone.return_value = None
+
+        bd_produto = BdProduto.__new__(BdProduto)
+
+        self.assertFalse(bd_produto.trocar_disponibilidade(99))
+        mock_rollback.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.commit")
+    def test_definir_disponibilidade(self, mock_commit, mock_get_cursor):
+        """
+        Testa o método definir_disponibilidade
+
+        Verifica se os produtos são alterados em um único comando e os ids alterados são retornados
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(5,), (2,)]
+        mock_get_cursor.return_value = mock_cursor
+
+        bd_produto = BdProduto.__new__(BdProduto)
+        alterados = bd_produto.definir_disponibilidade(["2", 5, 7], False)
+
+        self.assertEqual(alterados, [2, 5])
+        mock_cursor.execute.assert_called_once()
+        self.assertEqual(mock_cursor.execute.call_args.args[1], (False, [2, 5, 7], False))
+        mock_commit.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.cursor_leitura")
+    def test_listar(self, mock_cursor_leitura):
+        """
+        Testa o método listar
+
+        Verifica se a página é consultada a partir do último id, com os filtros aplicados no banco
+        e os curingas do prefixo escapados
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(11, "Pizza_G", 30.0, True)]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_produto = BdProduto.__new__(BdProduto)
+        resultado = bd_produto.listar(10, 20, disponivel=True, prefixo_nome="Pizza_")
+
+        self.assertEqual(resultado, [Produto("Pizza_G", 30.0, True, 11)])
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT * FROM Produto WHERE id > %s AND disponivel = %s AND lower(nome) LIKE %s ORDER BY id ASC LIMIT %s;",
+            [10, True, "pizza\\_%", 20]
+        )
+
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.cursor_leitura")
+    def test_buscar(self, mock_cursor_leitura):
+        """
+        Testa o método buscar
+
+        Verifica se a busca compara o prefixo com lower(nome), a expressão do índice de prefixos
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(3, "Pizza", 30.0, True)]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_produto = BdProduto.__new__(BdProduto)
+        resultado = bd_produto.buscar("PIZ", 5)
+
+        self.assertEqual(resultado, [Produto("Pizza", 30.0, True, 3)])
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT * FROM Produto WHERE lower(nome) LIKE %s ORDER BY lower(nome), id LIMIT %s;", ["piz%", 5]
+        )
 
 if __name__ == "__main__":
     unittest.main()
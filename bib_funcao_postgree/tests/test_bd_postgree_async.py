@@ -0,0 +1,116 @@
+import asyncio
+import unittest
+from contextlib import asynccontextmanager
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.funcao_postgree import bd_postgree_async
+from src.funcao_postgree.bd_postgree_async import BdProdutoAsync, BdPedidoAsync
+from datetime import datetime
+from src.funcao_postgree.bd_postgree_modelos import Pedido, Produto
+
+def criar_conexao_falsa(cursor: MagicMock) -> MagicMock:
+    """
+    Cria uma conexão assíncrona simulada cujo execute retorna o cursor informado.
+    """
+    conexao = MagicMock()
+    conexao.execute = AsyncMock(return_value=cursor)
+
+    @asynccontextmanager
+    async def conexao_falsa(self):
+        yield conexao
+
+    return conexao, conexao_falsa
+
+@patch.object(bd_postgree_async, "AsyncConnectionPool", MagicMock())
+class TestBdAsync(unittest.IsolatedAsyncioTestCase):
+    """
+    Testes para as classes assíncronas de acesso ao banco
+    """
+
+    async def test_get_produto(self):
+        """
+        Testa o método get de BdProdutoAsync
+
+        Verifica se a consulta é executada e a linha encontrada é retornada
+        """
+        cursor = MagicMock()
+        cursor.fetchone = AsyncMock(return_value=(1, "Pizza", 10, True))
+        conexao, conexao_falsa = criar_conexao_falsa(cursor)
+
+        with patch.object(BdProdutoAsync, "conexao", conexao_falsa):
+            resultado = await BdProdutoAsync().get(1)
+
+        conexao.execute.assert_awaited_once_with("SELECT * FROM Produto WHERE id = %s;", [1])
+        self.assertEqual(resultado, Produto("Pizza", 10, True, 1))
+
+    async def test_editar_status_falha(self):
+        """
+        Testa o método editar_status de BdPedidoAsync quando o banco falha
+
+        Verifica se o erro é tratado e False é retornado
+        """
+        conexao, conexao_falsa = criar_conexao_falsa(MagicMock())
+        conexao.execute.side_effect = Exception("falha")
+
+        with patch.object(BdPedidoAsync, "conexao", conexao_falsa):
+            resultado = await BdPedidoAsync().editar_status("Entregar", 1)
+
+        self.assertFalse(resultado)
+
+    async def test_insert_pedido_sem_particao(self):
+        """
+        Testa o método insert_pedido de BdPedidoAsync quando não há partição para o mês do pedido
+
+        Verifica se as partições do mês são criadas e o pedido é gravado na segunda tentativa
+        """
+        cursor = MagicMock()
+        cursor.fetchone = AsyncMock(return_value=(2,))
+        conexao, conexao_falsa = criar_conexao_falsa(cursor)
+        conexao.execute.side_effect = [bd_postgree_async.CheckViolation("sem partição"), cursor, cursor]
+        data_hora = datetime(2036, 2, 1, 12, 0)
+
+        with patch.object(BdPedidoAsync, "conexao", conexao_falsa):
+            resultado = await BdPedidoAsync().insert_pedido(Pedido(1, "Entregar", data_hora))
+
+        self.assertTrue(resultado)
+        self.assertEqual(conexao.execute.await_count, 3)
+        self.assertEqual(conexao.execute.await_args_list[1].args[1], (data_hora, data_hora))
+
+class TestPoolAsync(unittest.TestCase):
+    """
+    Testes para a abertura e o fechamento do pool assíncrono compartilhado
+    """
+
+    def tearDown(self):
+        """
+        Descarta o pool e a trava criados pelo teste.
+        """
+        bd_postgree_async.Bd_BaseAsync.pool = None
+        bd_postgree_async.Bd_BaseAsync._trava_pool = None
+
+    def test_reabrir_pool_em_outro_event_loop(self):
+        """
+        Testa a abertura do pool em dois event loops seguidos, com fechar_pool entre eles
+
+        Verifica se a trava de abertura é recriada no segundo loop e o pool é aberto uma vez em cada
+        """
+        async def abrir_simultaneamente():
+            # Várias tarefas disputam a trava enquanto o pool é aberto.
+            await asyncio.gather(*(BdProdutoAsync()._obter_pool() for _ in range(3)))
+            await BdProdutoAsync.fechar_pool()
+
+        async def abrir_pool(*args, **kwargs):
+            await asyncio.sleep(0)
+
+        pool_falso = MagicMock()
+        pool_falso.return_value.open = AsyncMock(side_effect=abrir_pool)
+        pool_falso.return_value.close = AsyncMock()
+
+        with patch.object(bd_postgree_async, "AsyncConnectionPool", pool_falso):
+            asyncio.run(abrir_simultaneamente())
+            asyncio.run(abrir_simultaneamente())
+
+        self.assertEqual(pool_falso.return_value.open.await_count, 2)
+        self.assertIsNone(bd_postgree_async.Bd_BaseAsync._trava_pool)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from psycopg2.pool import PoolError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from src.funcao_postgree.bd_postgree_base import Bd_Base, ErroTransacao
+from src.funcao_postgree.bd_postgree_metricas import CursorInstrumentado
+
+class TestBdBase(unittest.TestCase):
+    """
+    Testes para o pool de conexões da classe Bd_Base
+    """
+
+    def setUp(self):
+        """
+        Cria um pool simulado com no máximo duas conexões.
+        """
+        Bd_Base.fechar_pool()
+        patcher = patch("src.funcao_postgree.bd_postgree_base.ThreadedConnectionPool")
+        self.mock_pool_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(Bd_Base.fechar_pool)
+
+        self.mock_pool = self.mock_pool_class.return_value
+        self.mock_pool.closed = False
+        self.mock_pool.getconn.side_effect = self.criar_conexao_falsa
+
+        self.bd = Bd_Base(tamanho_maximo=2, aplicar_migracoes=False)
+
+    def criar_conexao_falsa(self) -> MagicMock:
+        """
+        Cria uma conexão simulada aberta e sem transação em andamento.
+        """
+        conexao = MagicMock(closed=False)
+        conexao.info.transaction_status = TRANSACTION_STATUS_IDLE
+        conexao.cursor.return_value.connection = conexao
+        conexao.declaracoes_preparadas = set()
+        return conexao
+
+    def test_conexao_por_thread(self):
+        """
+        Testa se cada thread recebe a sua própria conexão do pool
+
+        Verifica se a mesma thread reaproveita a conexão e se outra thread retira uma nova
+        """
+        self.bd.get_cursor()
+        self.bd.get_cursor()
+        self.assertEqual(self.mock_pool.getconn.call_count, 1)
+
+        conexao_principal = self.bd.post_client
+        conexoes_thread = []
+        thread = threading.Thread(target=lambda: conexoes_thread.append(self.bd.post_client))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(self.mock_pool.getconn.call_count, 2)
+        self.assertIsNot(conexoes_thread[0], conexao_principal)
+
+    def test_commit_devolve_conexao(self):
+        """
+        Testa se o commit devolve a conexão ao pool
+
+        Verifica se as estatísticas registram a retirada e a devolução
+        """
+        self.bd.get_cursor()
+        conexao = self.bd.post_client
+        self.bd.commit()
+
+        conexao.commit.assert_called_once()
+        self.mock_pool.putconn.assert_called_once_with(conexao, close=False)
+        estatisticas = Bd_Base.estatisticas_pool()
+        self.assertEqual(estatisticas["retiradas"], 1)
+        self.assertEqual(estatisticas["em_uso"], 0)
+        self.assertEqual(estatisticas["tamanho_maximo"], 2)
+
+    def test_pool_esgotado(self):
+        """
+        Testa a espera por uma conexão quando o pool está esgotado
+
+        Verifica se PoolError é lançado após o tempo limite de espera
+        """
+        Bd_Base._vagas.acquire()
+        Bd_Base._vagas.acquire()
+        self.addCleanup(Bd_Base._vagas.release)
+        self.addCleanup(Bd_Base._vagas.release)
+
+        with patch.object(Bd_Base, "tempo_limite_espera", 0.01):
+            with self.assertRaises(PoolError):
+                self.bd.get_cursor()
+
+    def test_conexao_de_thread_encerrada(self):
+        """
+        Testa o pool esgotado por threads que terminaram sem devolver a conexão
+
+        Verifica se as conexões dessas threads são fechadas e as vagas reaproveitadas, sem
+        esperar o tempo limite
+        """
+        conexoes_threads = []
+        for _ in range(2):
+            thread = threading.Thread(target=lambda: conexoes_threads.append(self.bd.post_client))
+            thread.start()
+            thread.join()
+
+        with patch.object(Bd_Base, "tempo_limite_espera", 0.01):
+            self.bd.get_cursor()
+
+        for conexao in conexoes_threads:
+            self.mock_pool.putconn.assert_any_call(conexao, close=True)
+        self.assertEqual(Bd_Base.estatisticas_pool()["em_uso"], 1)
+
+    def test_conexao_devolvida_apos_fechar_pool(self):
+        """
+        Testa a devolução de uma conexão retirada antes de o pool ser fechado e recriado
+
+        Verifica se a conexão é apenas fechada, sem liberar uma vaga do novo pool
+        """
+        self.bd.get_cursor()
+        conexao = self.bd.post_client
+
+        Bd_Base.fechar_pool()
+        bd = Bd_Base(tamanho_maximo=2, aplicar_migracoes=False)
+        self.mock_pool.putconn.reset_mock()
+
+        bd._devolver_ao_pool(conexao)
+
+        conexao.close.assert_called_once()
+        self.mock_pool.putconn.assert_not_called()
+        self.assertEqual(Bd_Base.estatisticas_pool()["em_uso"], 0)
+
+    def test_transacao_commit_unico(self):
+        """
+        Testa se várias operações dentro de transacao() fazem um único commit
+
+        Verifica se os commits intermediários são adiados até o fim do bloco
+        """
+        with self.bd.transacao():
+            self.bd.get_cursor()
+            self.bd.commit()
+            self.bd.get_cursor()
+            self.bd.commit()
+            conexao = self.bd.post_client
+            conexao.commit.assert_not_called()
+
+        conexao.commit.assert_called_once()
+        self.assertEqual(Bd_Base.estatisticas_pool()["em_uso"], 0)
+
+    def test_transacao_aninhada_desfeita(self):
+        """
+        Testa um bloco aninhado que lança exceção
+
+        Verifica se apenas o savepoint é desfeito e o bloco externo é confirmado
+        """
+        with self.bd.transacao():
+            conexao = self.bd.post_client
+            cursor = conexao.cursor.return_value
+            with self.assertRaises(ValueError):
+                with self.bd.transacao():
+                    raise ValueError("falha")
+
+        cursor.execute.assert_any_call("SAVEPOINT escopo_1;")
+        cursor.execute.assert_any_call("ROLLBACK TO SAVEPOINT escopo_1;")
+        conexao.rollback.assert_not_called()
+        conexao.commit.assert_called_once()
+
+    def test_transacao_com_operacao_desfeita(self):
+        """
+        Testa um bloco em que uma das operações chamou rollback()
+
+        Verifica se a transação inteira é desfeita e ErroTransacao é lançado
+        """
+        with self.assertRaises(ErroTransacao):
+            with self.bd.transacao():
+                conexao = self.bd.post_client
+                self.bd.rollback()
+                self.bd.commit()
+
+        conexao.commit.assert_not_called()
+        self.assertEqual(conexao.rollback.call_count, 2)
+        self.assertEqual(Bd_Base.estatisticas_pool()["em_uso"], 0)
+
+    def test_cursor_leitura_autocommit(self):
+        """
+        Testa o cursor de leitura fora de uma transação
+
+        Verifica se a consulta roda em autocommit e se a conexão volta ao pool sem commit
+        """
+        with self.bd.cursor_leitura() as cursor:
+            conexao = cursor.connection
+            self.assertTrue(conexao.autocommit)
+
+        self.assertFalse(conexao.autocommit)
+        conexao.commit.assert_not_called()
+        self.mock_pool.putconn.assert_called_once_with(conexao, close=False)
+
+    def test_cursor_leitura_dentro_da_transacao(self):
+        """
+        Testa o cursor de leitura dentro de transacao()
+
+        Verifica se a consulta participa da transação e a conexão continua reservada
+        """
+        with self.bd.transacao():
+            with self.bd.cursor_leitura() as cursor:
+                self.assertNotEqual(cursor.connection.autocommit, True)
+            self.mock_pool.putconn.assert_not_called()
+
+    def test_executar_preparada(self):
+        """
+        Testa a execução de uma declaração preparada
+
+        Verifica se o PREPARE é enviado apenas na primeira execução em cada conexão
+        """
+        declaracoes = {"produto_teste": ("INT", "SELECT * FROM Produto WHERE id = $1")}
+        with patch.object(Bd_Base, "DECLARACOES_PREPARADAS", declaracoes):
+            cursor = self.bd.get_cursor()
+            self.bd.executar_preparada(cursor, "produto_teste", (1,))
+            self.bd.executar_preparada(cursor, "produto_teste", (2,))
+
+        cursor.execute.assert_any_call("PREPARE produto_teste (INT) AS SELECT * FROM Produto WHERE id = $1")
+        cursor.execute.assert_any_call("EXECUTE produto_teste (%s)", (2,))
+        self.assertEqual(cursor.execute.call_count, 3)
+
+    def test_cursor_com_metricas(self):
+        """
+        Testa o cursor retornado com as métricas ativadas e desativadas
+
+        Verifica se o cursor instrumentado é usado apenas com as métricas ativas
+        """
+        metricas = CursorInstrumentado.metricas
+        self.addCleanup(setattr, metricas, "limite_consulta_lenta_ms", metricas.limite_consulta_lenta_ms)
+        with patch.object(Bd_Base, "metricas_ativas", False):
+            self.bd.get_cursor()
+            conexao = self.bd.post_client
+            conexao.cursor.assert_called_with()
+
+            Bd_Base.ativar_metricas(limite_consulta_lenta_ms=50)
+            self.bd.get_cursor()
+            conexao.cursor.assert_called_with(cursor_factory=CursorInstrumentado)
+            self.assertEqual(CursorInstrumentado.metricas.limite_consulta_lenta_ms, 50)
+
+    def test_iterar_consulta(self):
+        """
+        Testa o método iterar_consulta fora de uma transação
+
+        Verifica se as linhas vêm de um cursor nomeado em lotes e se a conexão própria volta ao pool
+        """
+        conexao = self.criar_conexao_falsa()
+        self.mock_pool.getconn.side_effect = None
+        self.mock_pool.getconn.return_value = conexao
+        cursor = conexao.cursor.return_value
+        cursor.__iter__.return_value = iter([(1,), (2,)])
+
+        linhas = list(self.bd.iterar_consulta("SELECT id FROM Pedido;", tamanho_lote=500))
+
+        self.assertEqual(linhas, [(1,), (2,)])
+        self.assertTrue(conexao.cursor.call_args.kwargs["name"].startswith("iter_"))
+        self.assertEqual(cursor.itersize, 500)
+        cursor.execute.assert_called_once_with("SELECT id FROM Pedido;", ())
+        conexao.rollback.assert_called_once()
+        self.mock_pool.putconn.assert_called_once_with(conexao, close=False)
+        self.assertEqual(Bd_Base.estatisticas_pool()["em_uso"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import unittest
+from src.funcao_postgree.bd_postgree_metricas import MetricasConsultas, nome_da_consulta, descrever_parametros
+
+class TestMetricasConsultas(unittest.TestCase):
+    """
+    Testes para as métricas de tempo das consultas
+    """
+
+    def test_registrar(self):
+        """
+        Testa o método registrar
+
+        Verifica as contagens, os tempos e os percentis de uma consulta
+        """
+        metricas = MetricasConsultas(limite_consulta_lenta_ms=100)
+        for _ in range(98):
+            metricas.registrar("BdPedido.get_last_1000", 0.8)
+        metricas.registrar("BdPedido.get_last_1000", 40)
+        metricas.registrar("BdPedido.get_last_1000", 300, erro=True)
+
+        resumo = metricas.resumo()["BdPedido.get_last_1000"]
+        self.assertEqual(resumo["execucoes"], 100)
+        self.assertEqual(resumo["erros"], 1)
+        self.assertEqual(resumo["lentas"], 1)
+        self.assertEqual(resumo["tempo_maximo_ms"], 300)
+        self.assertEqual(resumo["p50_ms"], 1)
+        self.assertEqual(resumo["p99_ms"], 50)
+        self.assertIn("BdPedido.get_last_1000", metricas.relatorio())
+
+        metricas.limpar()
+        self.assertEqual(metricas.resumo(), {})
+
+    def test_nome_da_consulta(self):
+        """
+        Testa a função nome_da_consulta
+
+        Verifica o nome das declarações preparadas e das consultas comuns
+        """
+        quadro = sys._getframe()
+        self.assertEqual(nome_da_consulta("EXECUTE produto_por_id (%s)", quadro), "produto_por_id")
+        self.assertEqual(nome_da_consulta("PREPARE produto_por_id (INT) AS SELECT 1", quadro), "PREPARE produto_por_id")
+        self.assertTrue(nome_da_consulta("SELECT 1", quadro).endswith("test_nome_da_consulta"))
+
+    def test_descrever_parametros(self):
+        """
+        Testa a função descrever_parametros
+
+        Verifica se apenas os tipos dos parâmetros aparecem
+        """
+        descricao = descrever_parametros(("senha-secreta", 10))
+        self.assertEqual(descricao, "[str, int]")
+        self.assertNotIn("senha-secreta", descricao)
+        self.assertEqual(descrever_parametros({"email": "a@b.com"}), "[str]")
+        self.assertEqual(descrever_parametros(None), "[]")
+
+if __name__ == "__main__":
+    unittest.main()
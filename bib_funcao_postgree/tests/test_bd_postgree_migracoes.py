@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch, MagicMock, call
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from src.funcao_postgree.bd_postgree_base import Bd_Base
+from src.funcao_postgree.bd_postgree_migracoes import BdMigracoes, CHAVE_TRAVA_MIGRACOES, MIGRACOES
+from src.funcao_postgree.bd_postgree_pedido import CONDICAO_PEDIDOS_ABERTOS
+
+class TestBdMigracoes(unittest.TestCase):
+    """
+    Testes para a classe BdMigracoes
+    """
+
+    def setUp(self):
+        """
+        Cria um pool simulado que sempre entrega a mesma conexão.
+        """
+        Bd_Base.fechar_pool()
+        patcher = patch("src.funcao_postgree.bd_postgree_base.ThreadedConnectionPool")
+        self.mock_pool_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(Bd_Base.fechar_pool)
+
+        self.conexao = MagicMock(closed=False)
+        self.conexao.info.transaction_status = TRANSACTION_STATUS_IDLE
+        self.cursor = self.conexao.cursor.return_value
+        self.cursor.connection = self.conexao
+
+        self.mock_pool = self.mock_pool_class.return_value
+        self.mock_pool.closed = False
+        self.mock_pool.getconn.return_value = self.conexao
+
+    def test_aplicar_somente_pendentes(self):
+        """
+        Testa o método aplicar com uma migração já registrada
+
+        Verifica se apenas a migração pendente é executada e registrada
+        """
+        self.cursor.fetchone.side_effect = [(1,), None]
+        migracoes = [(2, "segunda", "SQL 2"), (1, "primeira", "SQL 1")]
+
+        aplicadas = BdMigracoes().aplicar(migracoes)
+
+        self.assertEqual(aplicadas, [2])
+        self.cursor.execute.assert_any_call("SELECT pg_advisory_xact_lock(%s);", (CHAVE_TRAVA_MIGRACOES,))
+        self.cursor.execute.assert_any_call("SQL 2")
+        self.assertNotIn(call("SQL 1"), self.cursor.execute.call_args_list)
+        self.cursor.execute.assert_any_call(
+            "INSERT INTO versao_esquema (versao, descricao) VALUES (%s, %s);", (2, "segunda")
+        )
+
+    def test_aplicar_com_erro(self):
+        """
+        Testa o método aplicar quando uma migração falha
+
+        Verifica se a transação é desfeita e o erro é repassado
+        """
+        self.cursor.fetchone.return_value = None
+        self.cursor.execute.side_effect = lambda sql, *args: self._falhar_em("SQL 1", sql)
+
+        with self.assertRaises(ValueError):
+            BdMigracoes().aplicar([(1, "primeira", "SQL 1")])
+
+        self.conexao.rollback.assert_called()
+        self.assertEqual(Bd_Base.estatisticas_pool()["em_uso"], 0)
+
+    def test_migracoes_uma_vez_por_processo(self):
+        """
+        Testa a aplicação das migrações na inicialização da Bd_Base
+
+        Verifica se as migrações são aplicadas apenas na primeira inicialização
+        """
+        with patch.object(Bd_Base, "_migracoes_aplicadas", False), \
+             patch.object(BdMigracoes, "aplicar") as mock_aplicar:
+            Bd_Base()
+            Bd_Base()
+
+        mock_aplicar.assert_called_once()
+
+    def test_versoes_sequenciais(self):
+        """
+        Testa a lista de migrações
+
+        Verifica se as versões começam em 1 e não têm repetições nem lacunas
+        """
+        versoes = [versao for versao, _, _ in MIGRACOES]
+        self.assertEqual(versoes, list(range(1, len(MIGRACOES) + 1)))
+
+    def test_indice_pedidos_abertos(self):
+        """
+        Testa a criação do índice parcial idx_pedido_abertos
+
+        Verifica se toda migração que cria o índice usa a mesma condição das consultas de pedidos abertos
+        """
+        criacoes = [
+            linha.strip() for _, _, sql in MIGRACOES for linha in sql.splitlines()
+            if "INDEX" in linha and "idx_pedido_abertos ON" in linha
+        ]
+        self.assertEqual(len(criacoes), 2)
+        for criacao in criacoes:
+            self.assertTrue(criacao.endswith(f"WHERE {CONDICAO_PEDIDOS_ABERTOS};"), criacao)
+
+    def _falhar_em(self, esperado: str, sql: str) -> None:
+        """
+        Lança ValueError quando o SQL executado é o esperado.
+        """
+        if sql == esperado:
+            raise ValueError("falha")
+
+if __name__ == "__main__":
+    unittest.main()
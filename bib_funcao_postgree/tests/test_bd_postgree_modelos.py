@@ -0,0 +1,79 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from src.funcao_postgree.bd_postgree_modelos import Produto, Pedido, ItemPedido, Funcionario
+from src.funcao_postgree.bd_postgree_produto import BdProduto
+from src.funcao_postgree.bd_postgree_pedido_produto import BdPedidoProduto
+
+class TestModelos(unittest.TestCase):
+    """
+    Testes para os registros aceitos e retornados pelas classes de acesso a dados
+    """
+
+    def test_de_linha(self):
+        """
+        Testa a criação dos registros a partir das linhas de SELECT *
+
+        Verifica se as colunas são atribuídas aos campos certos
+        """
+        data_hora = datetime(2024, 1, 1, 12, 0)
+
+        self.assertEqual(Produto.de_linha((1, "Pizza", 30.0, False)), Produto("Pizza", 30.0, False, 1))
+        self.assertEqual(Pedido.de_linha((2, 5, "Pedido realizado", data_hora)), Pedido(5, "Pedido realizado", data_hora, 2))
+
+    def test_slots(self):
+        """
+        Testa se os registros não têm dicionário de atributos
+
+        Verifica se atributos fora dos campos são recusados
+        """
+        produto = Produto("Pizza", 30.0)
+
+        self.assertFalse(hasattr(produto, "__dict__"))
+        with self.assertRaises(AttributeError):
+            produto.preco_pago = 10
+
+    def test_funcionario_repr_sem_senha(self):
+        """
+        Testa a representação do funcionário
+
+        Verifica se a senha não aparece nos logs
+        """
+        funcionario = Funcionario("joao", "joao@email.com", "segredo")
+
+        self.assertNotIn("segredo", repr(funcionario))
+
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_produto.BdProduto.commit")
+    def test_insert_produto_com_registro(self, mock_commit, mock_get_cursor):
+        """
+        Testa o método insert_produto recebendo um Produto
+
+        Verifica se os campos são enviados sem passar por JSON
+        """
+        bd_produto = BdProduto.__new__(BdProduto)
+
+        bd_produto.insert_produto(Produto("Pizza", 30.0, False))
+
+        self.assertEqual(mock_get_cursor.return_value.execute.call_args.args[1], ("Pizza", 30.0, False))
+        mock_commit.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.cursor_leitura")
+    def test_get_produtos_do_pedido(self, mock_cursor_leitura):
+        """
+        Testa o método get_produtos_do_pedido
+
+        Verifica se cada linha é retornada como um ItemPedido do pedido consultado
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(3, "Pizza", 2, 30.0)]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+        itens = bd_pedido_produto.get_produtos_do_pedido(7)
+
+        self.assertEqual(itens, [ItemPedido(3, 2, 30.0, "Pizza", 7)])
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (7, 7))
+
+if __name__ == "__main__":
+    unittest.main()
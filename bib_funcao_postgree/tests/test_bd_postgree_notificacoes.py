@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from psycopg2.extensions import Notify
+from src.funcao_postgree import bd_postgree_notificacoes
+from src.funcao_postgree.bd_postgree_notificacoes import OuvinteAlteracoes
+
+class TestOuvinteAlteracoes(unittest.TestCase):
+    """
+    Testes para a classe OuvinteAlteracoes
+    """
+
+    @patch.object(bd_postgree_notificacoes.select, "select")
+    @patch.object(bd_postgree_notificacoes.psycopg2, "connect")
+    def test_repassar_notificacoes(self, mock_connect, mock_select):
+        """
+        Testa o repasse das notificações recebidas do banco
+
+        Verifica o formato das mensagens e se notificações repetidas no mesmo lote são repassadas uma vez
+        """
+        recebidas = []
+        ouvinte = OuvinteAlteracoes(recebidas.append, host="host", database="banco", user="usuario", password="senha")
+        conexao = mock_connect.return_value
+        conexao.closed = False
+        conexao.notifies = []
+
+        def chegar_notificacoes():
+            conexao.notifies.extend([
+                Notify(1, "sync_produto", "1,2"),
+                Notify(1, "sync_produto", "1,2"),
+                Notify(1, "sync_pedido", ""),
+            ])
+            ouvinte.executando = False
+
+        conexao.poll.side_effect = chegar_notificacoes
+        mock_select.return_value = ([conexao], [], [])
+
+        ouvinte.executando = True
+        ouvinte._escutar()
+
+        self.assertEqual(recebidas, ["sync_produto: 1,2", "sync_pedido"])
+        self.assertEqual(mock_connect.call_args.kwargs["host"], "host")
+        conexao.cursor.return_value.execute.assert_called()
+        conexao.close.assert_called_once()
+
+    def test_erro_ao_repassar(self):
+        """
+        Testa um erro na função que recebe as mensagens
+
+        Verifica se o erro é tratado sem interromper a escuta
+        """
+        ao_receber = MagicMock(side_effect=Exception("falha"))
+        ouvinte = OuvinteAlteracoes(ao_receber)
+
+        ouvinte._repassar("sync_produto: 1")
+
+        ao_receber.assert_called_once_with("sync_produto: 1")
+
+if __name__ == "__main__":
+    unittest.main()
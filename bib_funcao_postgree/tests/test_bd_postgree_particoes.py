@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from src.funcao_postgree.bd_postgree_particoes import BdParticoes
+
+class TestBdParticoes(unittest.TestCase):
+    """
+    Testes para a classe BdParticoes
+    """
+
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.commit")
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.get_cursor")
+    def test_criar_particoes_futuras(self, mock_get_cursor, mock_commit):
+        """
+        Testa o método criar_particoes_futuras
+
+        Verifica se a quantidade de meses é enviada à função do banco e o número de partições criadas é retornado
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (2,)
+        mock_get_cursor.return_value = mock_cursor
+
+        bd_particoes = BdParticoes.__new__(BdParticoes)
+
+        self.assertEqual(bd_particoes.criar_particoes_futuras(4), 2)
+        self.assertIn("criar_particoes_pedidos", mock_cursor.execute.call_args.args[0])
+        self.assertEqual(mock_cursor.execute.call_args.args[1], (4,))
+        mock_commit.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.commit")
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.get_cursor")
+    def test_remover_particoes_antigas(self, mock_get_cursor, mock_commit):
+        """
+        Testa o método remover_particoes_antigas
+
+        Verifica se a retenção e a opção de apagar são enviadas e os nomes das partições retornados
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [("produto_pedido_2024_01",), ("pedido_2024_01",)]
+        mock_get_cursor.return_value = mock_cursor
+
+        bd_particoes = BdParticoes.__new__(BdParticoes)
+
+        self.assertEqual(bd_particoes.remover_particoes_antigas(12, apagar=True), ["produto_pedido_2024_01", "pedido_2024_01"])
+        self.assertIn("remover_particoes_pedidos", mock_cursor.execute.call_args.args[0])
+        self.assertEqual(mock_cursor.execute.call_args.args[1], (12, True))
+        mock_commit.assert_called_once()
+
+    def test_remover_particoes_antigas_retencao_negativa(self):
+        """
+        Testa o método remover_particoes_antigas com uma retenção negativa
+
+        Verifica se ValueError é lançado
+        """
+        bd_particoes = BdParticoes.__new__(BdParticoes)
+
+        with self.assertRaises(ValueError):
+            bd_particoes.remover_particoes_antigas(-1)
+
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.rollback")
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.get_cursor")
+    def test_criar_particoes_futuras_erro(self, mock_get_cursor, mock_rollback):
+        """
+        Testa o método criar_particoes_futuras quando o banco recusa o comando
+
+        Verifica se a transação é desfeita e None é retornado
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = Exception("lock timeout")
+        mock_get_cursor.return_value = mock_cursor
+
+        bd_particoes = BdParticoes.__new__(BdParticoes)
+
+        self.assertIsNone(bd_particoes.criar_particoes_futuras())
+        mock_rollback.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.remover_particoes_antigas")
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.criar_particoes_futuras")
+    def test_manter(self, mock_criar, mock_remover):
+        """
+        Testa o método manter
+
+        Verifica se as partições antigas só são retiradas quando há uma retenção definida
+        """
+        mock_criar.return_value = 0
+        mock_remover.return_value = []
+        bd_particoes = BdParticoes.__new__(BdParticoes)
+
+        self.assertTrue(bd_particoes.manter())
+        mock_remover.assert_not_called()
+
+        self.assertTrue(bd_particoes.manter(meses_futuros=2, meses_retencao=24))
+        mock_criar.assert_called_with(2)
+        mock_remover.assert_called_once_with(24, False)
+
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.remover_particoes_antigas")
+    @patch("src.funcao_postgree.bd_postgree_particoes.BdParticoes.criar_particoes_futuras")
+    def test_manter_erro(self, mock_criar, mock_remover):
+        """
+        Testa o método manter quando as partições futuras não puderam ser criadas
+
+        Verifica se False é retornado sem retirar as partições antigas
+        """
+        mock_criar.return_value = None
+        bd_particoes = BdParticoes.__new__(BdParticoes)
+
+        self.assertFalse(bd_particoes.manter(meses_retencao=24))
+        mock_remover.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,41 +1,204 @@
 import unittest
 from unittest.mock import patch, MagicMock
+from datetime import datetime
+from decimal import Decimal
+from psycopg2.errors import CheckViolation
 from src.funcao_postgree.bd_postgree_pedido_produto import BdPedidoProduto
+from src.funcao_postgree.bd_postgree_modelos import ItemPedido, Pedido
 
 class TestBdFuncionario(unittest.TestCase):
     """
     Testes para a classe BdPedidoProduto
     """
 
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.executar_preparada")
     @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.get_cursor")
     @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.commit")
-    def test_database_init(self, mock_commit, mock_get_cursor):
+    def test_inserir_pedido_com_produtos(self, mock_commit, mock_get_cursor, mock_executar_preparada):
         """
-        Testa o método database_init
-        
-        Verifica se o método cria a tabela Produto_Pedido
+        Testa o método inserir_pedido_com_produtos
+
+        Verifica se o pedido e todos os itens são enviados em um único comando, com os itens em
+        arrays paralelos, e se o id e o total do pedido são retornados
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (42, Decimal("25.50"))
+        mock_get_cursor.return_value = mock_cursor
+
+        bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+        resultado = bd_pedido_produto.inserir_pedido_com_produtos(
+            [ItemPedido(1, 2, 10.0), {"produto_id": 2, "quantidade": 1, "preco_pago": 5.5}], 3, "Pedido realizado"
+        )
+
+        self.assertEqual(resultado, (42, Decimal("25.50")))
+        mock_executar_preparada.assert_called_once()
+        _, nome, parametros = mock_executar_preparada.call_args.args
+        self.assertEqual(nome, "produto_pedido_inserir_pedido")
+        self.assertEqual(parametros[:2], (3, "Pedido realizado"))
+        self.assertEqual(parametros[3:], ([1, 2], [2, 1], [10.0, 5.5]))
+        mock_commit.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.executar_preparada")
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.rollback")
+    def test_inserir_pedido_com_produtos_erro(self, mock_rollback, mock_get_cursor, mock_executar_preparada):
+        """
+        Testa o método inserir_pedido_com_produtos quando o banco recusa o comando
+
+        Verifica se a transação é desfeita e False é retornado
+        """
+        mock_executar_preparada.side_effect = Exception("produto inexistente")
+
+        bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+
+        self.assertFalse(bd_pedido_produto.inserir_pedido_com_produtos([ItemPedido(999, 1, 1.0)], 3, "Pedido realizado"))
+        mock_rollback.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.executar_preparada")
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.rollback")
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.commit")
+    def test_inserir_pedido_com_produtos_sem_particao(self, mock_commit, mock_rollback, mock_get_cursor, mock_executar_preparada):
+        """
+        Testa o método inserir_pedido_com_produtos quando não há partição para o mês do pedido
+
+        Verifica se a transação é desfeita, as partições do mês são criadas e o pedido é gravado
+        na segunda tentativa
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.side_effect = [(2,), (42, Decimal("10.00"))]
+        mock_get_cursor.return_value = mock_cursor
+        mock_executar_preparada.side_effect = [CheckViolation("no partition of relation \"pedido\" found for row"), None]
+
+        bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+        resultado = bd_pedido_produto.inserir_pedido_com_produtos([ItemPedido(1, 1, 10.0)], 3, "Entregar")
+
+        self.assertEqual(resultado, (42, Decimal("10.00")))
+        self.assertEqual(mock_executar_preparada.call_count, 2)
+        self.assertIn("criar_particoes_pedidos", mock_cursor.execute.call_args.args[0])
+        mock_rollback.assert_called_once()
+        mock_commit.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.executar_preparada")
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.rollback")
+    def test_inserir_pedido_com_produtos_restricao(self, mock_rollback, mock_get_cursor, mock_executar_preparada):
+        """
+        Testa o método inserir_pedido_com_produtos quando uma restrição recusa o pedido e a
+        partição do mês já existe
+
+        Verifica se o comando não é repetido e False é retornado
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (0,)
+        mock_get_cursor.return_value = mock_cursor
+        mock_executar_preparada.side_effect = CheckViolation("quantidade inválida")
+
+        bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+
+        self.assertFalse(bd_pedido_produto.inserir_pedido_com_produtos([ItemPedido(1, 0, 10.0)], 3, "Entregar"))
+        mock_executar_preparada.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.commit")
+    def test_inserir_pedidos_em_lote(self, mock_commit, mock_get_cursor):
+        """
+        Testa o método inserir_pedidos_em_lote
+
+        Verifica se os ids reservados são atribuídos aos pedidos na ordem da entrada e se pedidos
+        e itens são enviados com COPY, com os caracteres especiais escapados e a data/hora do
+        pedido em cada item
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(11,), (10,)]
+        copias = {}
+        mock_cursor.copy_expert.side_effect = lambda sql, arquivo: copias.__setitem__(sql.split()[1], arquivo.read())
+        mock_get_cursor.return_value = mock_cursor
+        data_hora = datetime(2024, 1, 1, 12, 0)
+
+        bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+        ids = bd_pedido_produto.inserir_pedidos_em_lote([
+            (Pedido(1, "Pedido\trealizado", data_hora), [ItemPedido(3, 2, 10.0)]),
+            (Pedido(2, "Entregar", data_hora), [{"produto_id": 4, "quantidade": 1, "preco_pago": 5}]),
+        ])
+
+        self.assertEqual(ids, [10, 11])
+        self.assertEqual(copias["lote_pedido"], (
+            "10\t1\tPedido\\trealizado\t2024-01-01 12:00:00\n"
+            "11\t2\tEntregar\t2024-01-01 12:00:00\n"
+        ))
+        self.assertEqual(copias["lote_produto_pedido"], (
+            "10\t2024-01-01 12:00:00\t3\t2\t10.0\n"
+            "11\t2024-01-01 12:00:00\t4\t1\t5\n"
+        ))
+        mock_commit.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.get_cursor")
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.commit")
+    def test_inserir_pedidos_em_lote_cria_particoes(self, mock_commit, mock_get_cursor):
+        """
+        Testa o método inserir_pedidos_em_lote com pedidos de meses fora das partições existentes
+
+        Verifica se as partições do mês mais antigo ao mais recente do lote são criadas antes de
+        gravar os pedidos, na mesma transação
         """
         mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(1,), (2,)]
         mock_get_cursor.return_value = mock_cursor
+        antigo = datetime(2019, 3, 5, 20, 0)
+        adiantado = datetime(2031, 7, 1, 9, 30)
 
-        # Instanciar sem chamar o __init__
-        bd_funcionario = BdPedidoProduto.__new__(BdPedidoProduto)
-        bd_funcionario.database_init()
-
-        mock_get_cursor.assert_called_once()
-        mock_cursor.execute.assert_called_once_with("""
-                CREATE TABLE IF NOT EXISTS Produto_Pedido (
-                    id SERIAL PRIMARY KEY,
-                    pedido_id INT NOT NULL,
-                    produto_id INT NOT NULL,
-                    quantidade INT NOT NULL,
-                    preco_pago DECIMAL(10, 2) NOT NULL,
-                    FOREIGN KEY (pedido_id) REFERENCES Pedido (id) ON DELETE CASCADE,
-                    FOREIGN KEY (produto_id) REFERENCES Produto (id) ON DELETE CASCADE
-                );
-            """)
+        bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+        ids = bd_pedido_produto.inserir_pedidos_em_lote([
+            (Pedido(1, "Entregar", adiantado), [ItemPedido(3, 2, 10.0)]),
+            (Pedido(2, "Entregar", antigo), [ItemPedido(4, 1, 5.0)]),
+        ])
+
+        self.assertEqual(ids, [1, 2])
+        consultas = [chamada.args[0] for chamada in mock_cursor.execute.call_args_list]
+        particoes = next(i for i, sql in enumerate(consultas) if "criar_particoes_pedidos" in sql)
+        insercao = next(i for i, sql in enumerate(consultas) if "INSERT INTO Pedido" in sql)
+        self.assertLess(particoes, insercao)
+        self.assertEqual(mock_cursor.execute.call_args_list[particoes].args[1], (antigo, adiantado))
         mock_commit.assert_called_once()
-        mock_cursor.close.assert_called_once()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.get_cursor")
+    def test_inserir_pedidos_em_lote_vazio(self, mock_get_cursor):
+        """
+        Testa o método inserir_pedidos_em_lote sem pedidos
+
+        Verifica se o banco não é consultado
+        """
+        bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+
+        self.assertEqual(bd_pedido_produto.inserir_pedidos_em_lote([]), [])
+        mock_get_cursor.assert_not_called()
+
+    @patch("src.funcao_postgree.bd_postgree_pedido_produto.BdPedidoProduto.cursor_leitura")
+    def test_get_pedidos_completos(self, mock_cursor_leitura):
+        """
+        Testa o método get_pedidos_completos
+
+        Verifica se os pedidos são buscados em uma única consulta e se os arrays de itens de cada
+        linha viram ItemPedido, com lista vazia para um pedido sem itens
+        """
+        data_hora = datetime(2024, 1, 1, 12, 0)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            (7, 5, "Entregar", data_hora, [3, 4], ["Pizza", "Suco"], [2, 1], [Decimal("30.00"), Decimal("8.00")]),
+            (9, 2, "Pedido em andamento", data_hora, None, None, None, None),
+        ]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_pedido_produto = BdPedidoProduto.__new__(BdPedidoProduto)
+        pedidos = bd_pedido_produto.get_pedidos_completos(["9", 7])
+
+        self.assertEqual(pedidos, [
+            (Pedido(5, "Entregar", data_hora, 7), [ItemPedido(3, 2, Decimal("30.00"), "Pizza", 7), ItemPedido(4, 1, Decimal("8.00"), "Suco", 7)]),
+            (Pedido(2, "Pedido em andamento", data_hora, 9), []),
+        ])
+        mock_cursor.execute.assert_called_once()
+        self.assertEqual(mock_cursor.execute.call_args.args[1], ([9, 7],))
 
 if __name__ == "__main__":
     unittest.main()
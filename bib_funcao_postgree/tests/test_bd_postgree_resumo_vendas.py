@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import date, datetime
+from decimal import Decimal
+from src.funcao_postgree.bd_postgree_resumo_vendas import BdResumoVendas
+from src.funcao_postgree.bd_postgree_modelos import VendaHora, VendaProduto
+
+class TestBdResumoVendas(unittest.TestCase):
+    """
+    Testes para a classe BdResumoVendas
+    """
+
+    @patch("src.funcao_postgree.bd_postgree_resumo_vendas.BdResumoVendas.cursor_leitura")
+    def test_get_vendas_por_hora(self, mock_cursor_leitura):
+        """
+        Testa o método get_vendas_por_hora
+
+        Verifica se o período é enviado como parâmetro e cada linha vira um VendaHora
+        """
+        hora = datetime(2024, 1, 1, 12, 0)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(hora, 5, "Entregar", 3, Decimal("45.00"))]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_resumo_vendas = BdResumoVendas.__new__(BdResumoVendas)
+        vendas = bd_resumo_vendas.get_vendas_por_hora(inicio=hora)
+
+        self.assertEqual(vendas, [VendaHora(hora, 5, "Entregar", 3, Decimal("45.00"))])
+        self.assertEqual(mock_cursor.execute.call_args.args[1], {"inicio": hora, "fim": None})
+
+    @patch("src.funcao_postgree.bd_postgree_resumo_vendas.BdResumoVendas.cursor_leitura")
+    def test_get_vendas_por_produto(self, mock_cursor_leitura):
+        """
+        Testa o método get_vendas_por_produto
+
+        Verifica se cada linha vira um VendaProduto com o nome do produto
+        """
+        dia = date(2024, 1, 1)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(dia, 2, "Pizza", "Pedido finalizado", 4, Decimal("120.00"))]
+        mock_cursor_leitura.return_value.__enter__.return_value = mock_cursor
+
+        bd_resumo_vendas = BdResumoVendas.__new__(BdResumoVendas)
+        vendas = bd_resumo_vendas.get_vendas_por_produto()
+
+        self.assertEqual(vendas, [VendaProduto(dia, 2, "Pizza", "Pedido finalizado", 4, Decimal("120.00"))])
+
+    @patch("src.funcao_postgree.bd_postgree_resumo_vendas.BdResumoVendas.cursor_leitura")
+    def test_get_vendas_por_hora_erro(self, mock_cursor_leitura):
+        """
+        Testa o método get_vendas_por_hora quando a consulta falha
+
+        Verifica se None é retornado
+        """
+        mock_cursor_leitura.side_effect = Exception("erro")
+
+        bd_resumo_vendas = BdResumoVendas.__new__(BdResumoVendas)
+
+        self.assertIsNone(bd_resumo_vendas.get_vendas_por_hora())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import threading
+import unittest
+from unittest.mock import patch
+from src.funcao_postgree import bd_postgree_servicos
+from src.funcao_postgree.bd_postgree_servicos import RegistroServicos
+
+class DaoFalso:
+    """
+    Classe de acesso a dados simulada que conta quantas vezes foi construída.
+    """
+
+    construcoes = []
+
+    def __init__(self, **parametros):
+        DaoFalso.construcoes.append(parametros)
+
+    def get(self, id):
+        return (id, "Pizza")
+
+class TestRegistroServicos(unittest.TestCase):
+    """
+    Testes para a classe RegistroServicos
+    """
+
+    def setUp(self):
+        """
+        Cria um registro vazio e zera as construções da classe simulada.
+        """
+        DaoFalso.construcoes = []
+        self.registro = RegistroServicos()
+        self.registro.configurar("host", "banco", "usuario", "senha")
+
+    def test_construcao_no_primeiro_uso(self):
+        """
+        Testa o representante preguiçoso de uma classe
+
+        Verifica se a classe só é construída no primeiro uso e apenas uma vez
+        """
+        bd_falso = self.registro.preguicoso(DaoFalso)
+        self.assertEqual(DaoFalso.construcoes, [])
+
+        self.assertEqual(bd_falso.get(1), (1, "Pizza"))
+        self.assertEqual(bd_falso.get(2), (2, "Pizza"))
+        self.assertEqual(DaoFalso.construcoes, [
+            {"host": "host", "database": "banco", "user": "usuario", "password": "senha"}
+        ])
+
+    def test_atributo_especial_nao_constroi(self):
+        """
+        Testa a consulta de um atributo especial no representante
+
+        Verifica se a classe não é construída, como acontece ao aplicar patch no representante
+        """
+        bd_falso = self.registro.preguicoso(DaoFalso)
+
+        self.assertFalse(hasattr(bd_falso, "__code__"))
+        self.assertEqual(DaoFalso.construcoes, [])
+
+    def test_conectar_em_segundo_plano(self):
+        """
+        Testa a conexão em segundo plano
+
+        Verifica se o primeiro uso aguarda a criação do pool feita pela outra thread
+        """
+        liberar = threading.Event()
+        conexoes = []
+
+        def conectar_falso(**parametros):
+            liberar.wait()
+            conexoes.append(parametros)
+
+        with patch.object(bd_postgree_servicos, "Bd_Base", side_effect=conectar_falso):
+            thread = self.registro.conectar_em_segundo_plano()
+            self.assertIs(self.registro.conectar_em_segundo_plano(), thread)
+            self.assertEqual(conexoes, [])
+
+            liberar.set()
+            self.registro.obter(DaoFalso)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(conexoes), 1)
+        self.assertEqual(len(DaoFalso.construcoes), 1)
+
+if __name__ == "__main__":
+    unittest.main()
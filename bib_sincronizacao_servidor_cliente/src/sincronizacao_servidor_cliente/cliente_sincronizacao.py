@@ -65,9 +65,13 @@ class ClienteSincronizado:
         """
         Função interna para escutar mensagens do servidor.
 
+        As mensagens do servidor terminam em quebra de linha. Mensagens que chegam juntas são
+        entregues uma a uma, e uma mensagem dividida entre recebimentos só é entregue completa.
+
         Args:
             ao_receber_mensagem (Callable[[str], None]): Função de callback para receber mensagens do servidor.
         """
+        pendente = b""
         try:
             while self.executando:
                 try:
@@ -76,9 +80,13 @@ class ClienteSincronizado:
                         print("[LOG INFO] Conexão com o servidor encerrada.")
                         break
 
-                    mensagem = dados.decode("utf-8").strip()
-                    print(f"[LOG INFO] Mensagem recebida do servidor: {mensagem}")
-                    ao_receber_mensagem(mensagem)
+                    *linhas, pendente = (pendente + dados).split(b"\n")
+                    for linha in linhas:
+                        mensagem = linha.decode("utf-8").strip()
+                        if not mensagem:
+                            continue
+                        print(f"[LOG INFO] Mensagem recebida do servidor: {mensagem}")
+                        ao_receber_mensagem(mensagem)
 
                 except ConnectionResetError:
                     print("[LOG ERRO] Conexão perdida com o servidor.")
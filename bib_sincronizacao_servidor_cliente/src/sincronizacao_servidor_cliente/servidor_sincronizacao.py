@@ -159,12 +159,17 @@ class ServidorSincronizacao:
     def enviar_msg_para_todos_clientes(self, mensagem: str) -> None:
         """
         Envia uma mensagem para todos os clientes conectados.
+
+        Cada mensagem termina com uma quebra de linha, que o cliente usa para separar mensagens
+        que chegam juntas ou divididas em mais de um recebimento.
         
         Args:
             mensagem (str): Mensagem a ser enviada.
         """
-        
-        for socket_endereco in self.sockets_enderecos_clientes:
+        if not mensagem.endswith("\n"):
+            mensagem += "\n"
+
+        for socket_endereco in list(self.sockets_enderecos_clientes):
             self._enviar_mensagem_para_cliente(socket_endereco[0], socket_endereco[1], mensagem)
 
     def _enviar_mensagem_para_cliente(self, cliente_socket: socket.socket, endereco: tuple, mensagem: str) -> None:
@@ -178,7 +183,7 @@ class ServidorSincronizacao:
         """
         try:
             cliente_socket.sendall(mensagem.encode("utf-8"))
-            print(f"[LOG INFO] Mensagem enviada para {endereco}: {mensagem}")
+            print(f"[LOG INFO] Mensagem enviada para {endereco}: {mensagem.strip()}")
         except Exception as e:
             print(f"[LOG ERRO] Erro ao enviar mensagem para {endereco}: {type(e).__name__} - {e}")
 
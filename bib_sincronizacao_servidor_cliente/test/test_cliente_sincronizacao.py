@@ -47,6 +47,26 @@ class TestClienteSincronizado(unittest.TestCase):
         self.cliente._escutar(mock_callback)  # Chama o método privado _escutar
         self.assertFalse(self.cliente.executando)  # Verifica se o cliente foi encerrado
 
+    def test_escutar_mensagens_agrupadas(self):
+        """
+        Testa o recebimento de mensagens que chegam juntas ou divididas.
+
+        Verifica se cada mensagem terminada em quebra de linha é entregue uma vez
+        ao callback, inteira e na ordem em que foi enviada.
+        """
+        mock_callback = Mock()  # Mock para o callback
+        self.cliente.soket_cliente = self.mock_socket_instance  # Configura o socket do cliente
+        self.cliente.executando = True  # Simula que o cliente está ativo
+        self.mock_socket_instance.recv.side_effect = [
+            b"sync_produto: 1,2\nsync_ped",  # Uma mensagem inteira e o início de outra
+            b"ido: 3\n",  # O restante da segunda mensagem
+            b"",  # Servidor encerrou a conexão
+        ]
+
+        self.cliente._escutar(mock_callback)  # Chama o método privado _escutar
+        mock_callback.assert_has_calls([call("sync_produto: 1,2"), call("sync_pedido: 3")])
+        self.assertEqual(mock_callback.call_count, 2)  # Verifica que nenhuma mensagem foi repetida
+
     def test_enviar_mensagem_sucesso(self):
         """
         Testa o envio bem-sucedido de uma mensagem para o servidor.
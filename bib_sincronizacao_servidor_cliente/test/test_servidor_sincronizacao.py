@@ -83,7 +83,7 @@ class TestServidorSincronizacao(unittest.TestCase):
 
         servidor.enviar_msg_para_todos_clientes("Test message")  # Envia uma mensagem para todos os clientes
 
-        mock_socket_instance.sendall.assert_called_with(b"Test message")  # Verifica a chamada do método sendall
+        mock_socket_instance.sendall.assert_called_with(b"Test message\n")  # Verifica a chamada do método sendall
 
     @patch('src.sincronizacao_servidor_cliente.servidor_sincronizacao.socket.socket')
     def test_remover_cliente(self, mock_socket):
@@ -1,17 +1,20 @@
 """
 Módulo principal do servidor.
 """
-from funcao_postgree.bd_postgree_base import Bd_Base
+from funcao_postgree.bd_postgree_servicos import servicos
 from dotenv import load_dotenv
 import os
 
 load_dotenv(".env")
-Bd_Base(os.getenv('HOST_BD'), os.getenv('DATABASE'), os.getenv('USER_BD'), os.getenv('PASSWORD_BD'))
+servicos.configurar(os.getenv('HOST_BD'), os.getenv('DATABASE'), os.getenv('USER_BD'), os.getenv('PASSWORD_BD'))
+servicos.conectar_em_segundo_plano()
 
 from src.screen.tela_principal_server_ui import TelaPrincipalServer
 from src.screen.autenticacao import Autenticacao
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from src.func.func_sincronizacao import iniciar_cliente_sincronizado
+from src.func.func_catalogo import catalogo
+from src.func.func_pedido import pedidos_recentes
 import sys
 
 
@@ -23,10 +26,16 @@ def sync_tratament(msg: str) -> None:
     """
     Método que é chamado quando uma mensagem de sincronização é recebida. O mesmo trata a mensagem e 
     atualiza a lista de produtos ou pedidos conforme necessário.
+
+    As alterações chegam do banco no formato "sync_produto: 1,2" ou apenas "sync_produto".
+    O cache do catálogo é atualizado antes da tela, que lê os produtos dele; a lista de
+    pedidos busca apenas os pedidos alterados desde a última atualização.
     """
-    if msg == 'sync_produto':
+    if msg.startswith('sync_produto'):
+        catalogo.tratar_mensagem(msg)
         tela_principal.signal_handler.atualizar_produto.emit()
-    elif msg == 'sync_pedido':
+    elif msg.startswith('sync_pedido'):
+        pedidos_recentes.tratar_mensagem(msg)
         tela_principal.signal_handler.atualizar_pedido.emit()
     elif msg == 'server_down':
         QMessageBox.critical(None, "Erro", "Servidor desconectado.")
@@ -1,14 +1,19 @@
 from funcao_postgree.bd_postgree_base import Bd_Base
+from funcao_postgree.bd_postgree_servicos import servicos
 from dotenv import load_dotenv
 import os
 
 load_dotenv(".env")
-Bd_Base(os.getenv('HOST_BD'), os.getenv('DATABASE'), os.getenv('USER_BD'), os.getenv('PASSWORD_BD'))
+servicos.configurar(os.getenv('HOST_BD'), os.getenv('DATABASE'), os.getenv('USER_BD'), os.getenv('PASSWORD_BD'))
+servicos.conectar_em_segundo_plano()
+if os.getenv('BD_METRICAS') == '1':
+    Bd_Base.ativar_metricas(float(os.getenv('BD_LIMITE_CONSULTA_LENTA_MS', '200')))
 
 from src.func.func_autenticacao import recuperar_senha
 from src.func.func_sincronizacao import close_server, enviar_mensagem_de_sincronizacao_server, iniciar_servidor_sincronizado
 from src.func.func_email import enviar_email_recuperacao_de_conta, enviar_relatorio_vendas, enviar_arquivos
 from src.func.func_relatorio import gerar_relatorio, criar_csv, remover_csv
+from src.func.func_manutencao import agendar_manutencao, manter_particoes
 
 
 def sync_tratament(msg: str) -> str | None:
@@ -30,6 +35,10 @@ def sync_tratament(msg: str) -> str | None:
             Gera e envia um relatório de vendas em formato HTML para o email especificado.
         - "enviar_arquivos: <email>":
             Gera e envia arquivos CSV para o email especificado.
+        - "metricas_bd":
+            Mostra no log as métricas das consultas ao banco e do pool de conexões.
+        - "manter_particoes":
+            Executa a manutenção das partições de pedidos sem esperar a execução diária.
         - Outras mensagens:
             Repassa mensagens desconhecidas para os clientes sincronizados.
     """
@@ -60,12 +69,20 @@ def sync_tratament(msg: str) -> str | None:
         remover_csv()
         print(f"[LOG INFO] Arquivos enviados para '{email}'.")
 
+    elif msg == "metricas_bd":
+        print(f"[LOG INFO] Métricas do banco de dados:\n{Bd_Base.relatorio_metricas()}")
+
+    elif msg == "manter_particoes":
+        print(f"[LOG INFO] Solicitação de manutenção das partições de pedidos.")
+        manter_particoes()
+
     else:
         print(f"[LOG INFO] Mensagem '{msg}' está sendo repassada para os clientes.")
         enviar_mensagem_de_sincronizacao_server(msg)
 
 if __name__ == "__main__":
     try:
+        agendar_manutencao()
         iniciar_servidor_sincronizado(sync_tratament)
     except KeyboardInterrupt:
         print("Servidor encerrado.")
@@ -5,9 +5,11 @@ Módulo responsável por gerenciar a autenticação do usuário.
 import json
 from typing import Tuple, Union
 from funcao_postgree.bd_postgree_funcionario import BdFuncionario
+from funcao_postgree.bd_postgree_modelos import Funcionario
+from funcao_postgree.bd_postgree_servicos import servicos
 
 CREDENCIAIS_FILE = "credenciais.json"
-bd_funcionario = BdFuncionario()
+bd_funcionario = servicos.preguicoso(BdFuncionario)
 
 
 def carregar_credenciais() -> Tuple[str, str] | tuple[None, None]:
@@ -39,7 +41,7 @@ def inserir_funcionario(funcionario: dict[str, str]) -> bool:
     """
     Insere um funcionário no banco de dados.
     """
-    confirm = bd_funcionario.insert_funcionario(json.dumps(funcionario))
+    confirm = bd_funcionario.insert_funcionario(Funcionario(**funcionario))
     with open(CREDENCIAIS_FILE, "w") as f:
         json.dump({"email": funcionario["email"],
                   "usuario": funcionario["usuario"]}, f)
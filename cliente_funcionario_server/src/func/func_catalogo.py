@@ -0,0 +1,250 @@
+"""
+Módulo responsável pelo cache do catálogo de produtos.
+
+O catálogo é lido do banco uma vez e mantido em memória, indexado pelo id do produto. Ele só
+é atualizado quando chega uma alteração de produto, seja pela sincronização ("sync_produto: 1,2")
+ou por uma escrita feita neste processo.
+
+O cache também mantém um índice de prefixos dos nomes, usado na busca do cardápio.
+"""
+
+from typing import Iterable
+import bisect
+import threading
+import unicodedata
+from funcao_postgree.bd_postgree_modelos import Produto
+from funcao_postgree.bd_postgree_produto import BdProduto
+from funcao_postgree.bd_postgree_servicos import servicos
+
+bd_produto = servicos.preguicoso(BdProduto)
+
+
+def normalizar(texto: str) -> str:
+    """
+    Normaliza um texto para a busca, sem diferenciar maiúsculas nem acentos.
+
+    Args:
+        texto (str): Texto a ser normalizado.
+
+    Returns:
+        str: Texto normalizado, por exemplo "Pão de Açúcar" -> "pao de acucar".
+    """
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+
+class CacheCatalogo:
+    """
+    Cache, compartilhado pelo processo, dos produtos cadastrados.
+
+    Atributos:
+        acertos (int): Leituras atendidas pelo cache.
+        faltas (int): Leituras que precisaram consultar o banco.
+    """
+
+    def __init__(self) -> None:
+        """
+        Inicializa o cache vazio. O catálogo é carregado na primeira leitura.
+        """
+        self._produtos: dict[int, Produto] = {}
+        self._carregado = False
+        # Incrementada a cada alteração, para descartar uma carga iniciada antes dela.
+        self._geracao = 0
+        # Índice de prefixos: chaves (cada palavra do nome normalizada) ordenadas, e os ids
+        # correspondentes na mesma posição. Feito na primeira busca após uma carga completa e
+        # atualizado produto a produto nas alterações.
+        self._chaves: list[str] = []
+        self._ids_chaves: list[int] = []
+        self._nomes: dict[int, str] = {}
+        self._indice_valido = False
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    def todos(self) -> list[Produto]:
+        """
+        Retorna todos os produtos, em ordem de id, consultando o banco apenas se o catálogo
+        não estiver carregado.
+
+        Returns:
+            list[Produto]: Lista com os produtos.
+        """
+        with self._trava:
+            if self._carregado:
+                self.acertos += 1
+                return [self._produtos[id] for id in sorted(self._produtos)]
+            self.faltas += 1
+            geracao = self._geracao
+
+        produtos = bd_produto.get_all()
+
+        with self._trava:
+            # Um catálogo vazio pode ser um erro de conexão, por isso não fica no cache.
+            if produtos and geracao == self._geracao:
+                self._produtos = {produto.id: produto for produto in produtos}
+                self._carregado = True
+                self._indice_valido = False
+        return produtos
+
+    def atualizar(self, ids: Iterable[int] | None = None) -> None:
+        """
+        Atualiza os produtos alterados. Sem ids, descarta o catálogo inteiro e a próxima
+        leitura o carrega de novo.
+
+        Args:
+            ids (Iterable[int] | None): IDs dos produtos alterados.
+        """
+        ids = None if ids is None else set(ids)
+        with self._trava:
+            self._geracao += 1
+            if not self._carregado:
+                return
+            if not ids:
+                self._descartar()
+                return
+
+        produtos = bd_produto.get_por_ids(sorted(ids))
+
+        with self._trava:
+            if not self._carregado:
+                return
+            if produtos is None:
+                self._descartar()
+                return
+            for id in ids:
+                self._produtos.pop(id, None)
+                if self._indice_valido:
+                    self._desindexar(id)
+            for produto in produtos:
+                self._produtos[produto.id] = produto
+                if self._indice_valido:
+                    self._indexar_produto(produto.id)
+
+    def buscar(self, termo: str, limite: int = 50) -> list[Produto]:
+        """
+        Busca produtos cujo nome tenha palavras começando com as palavras do termo, sem
+        diferenciar maiúsculas nem acentos. Por exemplo, "piz cal" encontra "Pizza Calabresa".
+
+        A busca usa o índice de prefixos em memória (busca binária), sem consultar o banco
+        depois que o catálogo está carregado.
+
+        Args:
+            termo (str): Texto digitado.
+            limite (int): Quantidade máxima de produtos retornados.
+
+        Returns:
+            list[Produto]: Produtos encontrados, em ordem de nome. Com o termo vazio, os primeiros
+            produtos em ordem de id.
+        """
+        palavras = normalizar(termo).split()
+        if not palavras:
+            return self.todos()[:limite]
+        if not self._carregado:
+            self.todos()
+
+        with self._trava:
+            if not self._indice_valido:
+                self._indexar()
+
+            # A palavra mais longa costuma ter menos candidatos; as demais filtram o resultado.
+            palavras.sort(key=len, reverse=True)
+            inicio = bisect.bisect_left(self._chaves, palavras[0])
+            fim = bisect.bisect_left(self._chaves, palavras[0] + "\uffff", inicio)
+            candidatos = {self._ids_chaves[i] for i in range(inicio, fim)}
+
+            if len(palavras) > 1:
+                candidatos = [
+                    id for id in candidatos
+                    if all(any(chave.startswith(palavra) for chave in self._nomes[id].split()) for palavra in palavras[1:])
+                ]
+            ids = sorted(candidatos, key=lambda id: (self._nomes[id], id))[:limite]
+            return [self._produtos[id] for id in ids]
+
+    def tratar_mensagem(self, msg: str) -> None:
+        """
+        Atualiza o cache a partir de uma mensagem de sincronização de produtos, no formato
+        "sync_produto: 1,2" ou apenas "sync_produto" quando todos devem ser recarregados.
+
+        Args:
+            msg (str): Mensagem de sincronização.
+        """
+        _, _, ids = msg.partition(":")
+        try:
+            self.atualizar([int(id) for id in ids.split(",") if id.strip()] or None)
+        except ValueError:
+            print(f"[LOG AVISO] Mensagem de sincronização inválida: '{msg}'")
+            self.atualizar()
+
+    def estatisticas(self) -> dict[str, int]:
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            dict[str, int]: Acertos, faltas e produtos em memória.
+        """
+        with self._trava:
+            return {"acertos": self.acertos, "faltas": self.faltas, "produtos": len(self._produtos)}
+
+    def limpar(self) -> None:
+        """
+        Descarta o catálogo e zera os contadores.
+        """
+        with self._trava:
+            self._descartar()
+            self.acertos = 0
+            self.faltas = 0
+
+    def _descartar(self) -> None:
+        """
+        Descarta o catálogo. Deve ser chamado com a trava adquirida.
+        """
+        self._produtos = {}
+        self._carregado = False
+        self._geracao += 1
+        self._indice_valido = False
+
+    def _indexar(self) -> None:
+        """
+        Refaz o índice de prefixos dos nomes. Deve ser chamado com a trava adquirida.
+        """
+        self._nomes = {id: normalizar(produto.nome) for id, produto in self._produtos.items()}
+        entradas = sorted((chave, id) for id, nome in self._nomes.items() for chave in set(nome.split()))
+        self._chaves = [chave for chave, _ in entradas]
+        self._ids_chaves = [id for _, id in entradas]
+        self._indice_valido = True
+
+    def _indexar_produto(self, id: int) -> None:
+        """
+        Adiciona um produto ao índice de prefixos, sem refazê-lo. Deve ser chamado com a trava adquirida.
+
+        Args:
+            id (int): ID de um produto do catálogo.
+        """
+        nome = self._nomes[id] = normalizar(self._produtos[id].nome)
+        for chave in set(nome.split()):
+            posicao = bisect.bisect_left(self._chaves, chave)
+            fim = bisect.bisect_right(self._chaves, chave, posicao)
+            posicao = bisect.bisect_left(self._ids_chaves, id, posicao, fim)
+            self._chaves.insert(posicao, chave)
+            self._ids_chaves.insert(posicao, id)
+
+    def _desindexar(self, id: int) -> None:
+        """
+        Remove um produto do índice de prefixos, sem refazê-lo. Deve ser chamado com a trava adquirida.
+
+        Args:
+            id (int): ID do produto.
+        """
+        nome = self._nomes.pop(id, None)
+        if nome is None:
+            return
+        for chave in set(nome.split()):
+            posicao = bisect.bisect_left(self._chaves, chave)
+            fim = bisect.bisect_right(self._chaves, chave, posicao)
+            posicao = bisect.bisect_left(self._ids_chaves, id, posicao, fim)
+            if posicao < fim and self._ids_chaves[posicao] == id:
+                del self._chaves[posicao]
+                del self._ids_chaves[posicao]
+
+
+catalogo = CacheCatalogo()
@@ -0,0 +1,59 @@
+"""
+Módulo responsável pela manutenção periódica do banco de dados feita pelo servidor.
+
+As partições mensais de pedidos são mantidas pelo servidor: na inicialização e uma vez por dia
+ele cria as partições dos próximos meses e, se houver retenção configurada, retira as antigas.
+A manutenção é configurada pelas variáveis de ambiente:
+    - MESES_PARTICOES_FUTURAS: meses seguintes ao atual com partição criada (padrão 3).
+    - MESES_RETENCAO_PEDIDOS: meses completos de pedidos mantidos antes do mês atual. Se não
+      for definida, todo o histórico é mantido.
+    - APAGAR_PARTICOES_ANTIGAS: "1" para apagar as partições retiradas em vez de mantê-las
+      como tabelas separadas para arquivo.
+"""
+
+import os
+import threading
+from funcao_postgree.bd_postgree_particoes import BdParticoes
+from funcao_postgree.bd_postgree_servicos import servicos
+
+INTERVALO_MANUTENCAO = 24 * 60 * 60
+bd_particoes = servicos.preguicoso(BdParticoes)
+
+
+def manter_particoes() -> bool:
+    """
+    Executa a manutenção das partições de pedidos com a configuração das variáveis de ambiente.
+
+    Returns:
+        bool: True se a manutenção foi concluída, False caso contrário.
+    """
+    meses_retencao = os.getenv('MESES_RETENCAO_PEDIDOS')
+    return bd_particoes.manter(
+        meses_futuros=int(os.getenv('MESES_PARTICOES_FUTURAS', '3')),
+        meses_retencao=int(meses_retencao) if meses_retencao else None,
+        apagar=os.getenv('APAGAR_PARTICOES_ANTIGAS') == '1',
+    )
+
+
+def agendar_manutencao(intervalo: float = INTERVALO_MANUTENCAO, atraso: float = 0) -> threading.Timer:
+    """
+    Agenda a manutenção das partições em segundo plano. Cada execução agenda a seguinte.
+
+    Args:
+        intervalo (float): Segundos entre as execuções. Default é um dia.
+        atraso (float): Segundos até a primeira execução. Default é 0 (imediatamente).
+
+    Returns:
+        threading.Timer: Timer da primeira execução.
+    """
+    def executar() -> None:
+        try:
+            manter_particoes()
+        except Exception as e:
+            print(f"[LOG ERRO] Erro na manutenção das partições de pedidos: {e}")
+        agendar_manutencao(intervalo, intervalo)
+
+    timer = threading.Timer(atraso, executar)
+    timer.daemon = True
+    timer.start()
+    return timer
@@ -2,12 +2,98 @@
 Módulo que contém funções relacionadas a pedidos.
 """
 
+from datetime import datetime
 from typing import Tuple
+import threading
+from funcao_postgree.bd_postgree_base import ErroTransacao
+from funcao_postgree.bd_postgree_modelos import ItemPedido, Pedido
 from funcao_postgree.bd_postgree_pedido import BdPedido
 from funcao_postgree.bd_postgree_pedido_produto import BdPedidoProduto
+from funcao_postgree.bd_postgree_servicos import servicos
 
-bd_pedido = BdPedido()
-bd_pedido_produto = BdPedidoProduto()
+bd_pedido = servicos.preguicoso(BdPedido)
+bd_pedido_produto = servicos.preguicoso(BdPedidoProduto)
+
+
+class PedidosRecentes:
+    """
+    Últimos pedidos exibidos por este cliente, mantidos em memória.
+
+    A primeira leitura carrega os 1000 últimos pedidos. As seguintes buscam no banco apenas os
+    pedidos inseridos ou alterados desde a leitura anterior, a partir do marcador guardado.
+    """
+
+    LIMITE = 1000
+
+    def __init__(self) -> None:
+        """
+        Inicializa a lista vazia. Os pedidos são carregados na primeira leitura.
+        """
+        self._pedidos: dict[int, Pedido] = {}
+        self._marcador: int | None = None
+        self._trava = threading.Lock()
+
+    def listar(self) -> list[Pedido]:
+        """
+        Retorna os últimos pedidos, do mais recente ao mais antigo, buscando as alterações
+        desde a leitura anterior.
+
+        Returns:
+            list[Pedido]: Até `LIMITE` pedidos.
+        """
+        with self._trava:
+            if self._marcador is None:
+                self._carregar()
+            else:
+                alterados = bd_pedido.get_alterados_desde(self._marcador)
+                # Em caso de erro a lista anterior é mantida e as alterações são buscadas na próxima leitura.
+                if alterados is not None:
+                    pedidos, self._marcador = alterados
+                    for pedido in pedidos:
+                        self._pedidos[pedido.id] = pedido
+                    if len(self._pedidos) > self.LIMITE:
+                        for id in sorted(self._pedidos)[:-self.LIMITE]:
+                            del self._pedidos[id]
+            return [self._pedidos[id] for id in sorted(self._pedidos, reverse=True)]
+
+    def tratar_mensagem(self, msg: str) -> None:
+        """
+        Trata uma mensagem de sincronização de pedidos. Uma mensagem sem ids ("sync_pedido"),
+        enviada após uma reconexão ou quando muitos pedidos mudaram, faz a próxima leitura
+        carregar a lista inteira de novo; com ids, as alterações são buscadas pelo marcador.
+
+        Args:
+            msg (str): Mensagem de sincronização.
+        """
+        _, _, ids = msg.partition(":")
+        if not ids.strip():
+            self.limpar()
+
+    def limpar(self) -> None:
+        """
+        Descarta os pedidos e o marcador.
+        """
+        with self._trava:
+            self._pedidos = {}
+            self._marcador = None
+
+    def _carregar(self) -> None:
+        """
+        Carrega os últimos pedidos. Deve ser chamado com a trava adquirida.
+
+        O marcador é lido antes dos pedidos, para que as alterações feitas durante a carga
+        sejam buscadas na leitura seguinte.
+        """
+        marcador = bd_pedido.marcador_atual()
+        pedidos = bd_pedido.get_last_1000()
+        if marcador is None or pedidos is None:
+            self._pedidos = {}
+            return
+        self._pedidos = {pedido.id: pedido for pedido in pedidos}
+        self._marcador = marcador
+
+
+pedidos_recentes = PedidosRecentes()
 
 def transformar_lista_str_em_lista_tuple(lista: list[str]) -> list[Tuple[str, int]]:
     """
@@ -56,12 +142,31 @@ def inserir_pedido(produtos: list[Tuple[int, float, int]], mesa: int, status: st
     Returns:
         bool: True se a inserção foi bem sucedida, False caso contrário.
     """
-    list_pedidos_dict = []
-    for pedido in produtos:
-        list_pedidos_dict.append({"produto_id": pedido[0], "preco_pago": pedido[1], "quantidade": pedido[2]})
-        
-    status = bd_pedido_produto.inserir_pedido_com_produtos(list_pedidos_dict, mesa, status)
-    return status
+    itens = [ItemPedido(produto_id=int(id), quantidade=qtd, preco_pago=preco) for id, preco, qtd in produtos]
+
+    pedido = bd_pedido_produto.inserir_pedido_com_produtos(itens, mesa, status)
+    return pedido is not False
+
+def inserir_pedidos_em_lote(pedidos: list[Tuple[list[Tuple[int, float, int]], int, str, datetime]]) -> list[int] | None:
+    """
+    Insere vários pedidos de uma vez, em uma única transação. Usado para reenviar os pedidos
+    feitos enquanto o terminal estava sem conexão ou para importar pedidos de um parceiro.
+    
+    Args:
+        pedidos (list[Tuple[list[Tuple[int, float, int]], int, str, datetime]]): Lista de tuplas no
+        formato (produtos, mesa, status, data/hora), onde cada produto é uma tupla (id, preço, quantidade).
+    
+    Returns:
+        list[int] | None: ID de cada pedido, na mesma ordem, ou None se nenhum pedido foi inserido.
+    """
+    lote = [
+        (
+            Pedido(mesa, status, data_hora),
+            [ItemPedido(produto_id=int(id), quantidade=qtd, preco_pago=preco) for id, preco, qtd in produtos]
+        )
+        for produtos, mesa, status, data_hora in pedidos
+    ]
+    return bd_pedido_produto.inserir_pedidos_em_lote(lote)
   
 def transformar_lista_str_em_lista_tuple(lista: list[str]) -> list[Tuple[str, int]]:
     """
@@ -85,20 +190,44 @@ def transformar_lista_str_em_lista_tuple(lista: list[str]) -> list[Tuple[str, in
 
 def get_utimos_1000_pedidos() -> list[str]:
     """
-    Busca os últimos 1000 pedidos no banco de dados.
+    Busca os últimos 1000 pedidos. Depois da primeira chamada, apenas os pedidos alterados
+    desde a chamada anterior são consultados no banco.
     
     Returns:
         list[str]: Lista de pedidos no formato "ID: id, Mesa: mesa, Status: status, Data/Hora: data_hora".
     """
-    pedidos = []
-    for pedido in bd_pedido.get_last_1000():
-        id = pedido[0]
-        mesa = pedido[1]
-        status = pedido[2]
-        data_hora = pedido[3]
-        pedidos.append(f"ID: {id}, Mesa: {mesa}, Status: {status}, Data/Hora: {data_hora}")
+    return [formatar_pedido(pedido) for pedido in pedidos_recentes.listar()]
+
+def get_ultimos_pedidos() -> list[Pedido]:
+    """
+    Busca os últimos 1000 pedidos, como `get_utimos_1000_pedidos`, sem formatá-los.
     
-    return pedidos
+    Returns:
+        list[Pedido]: Pedidos do mais recente ao mais antigo.
+    """
+    return pedidos_recentes.listar()
+
+def get_pedidos_abertos() -> list[Pedido]:
+    """
+    Busca a fila de pedidos abertos ("Pedido em andamento" e "Entregar"), do mais antigo ao mais recente.
+    
+    Returns:
+        list[Pedido]: Pedidos abertos, ou lista vazia em caso de erro.
+    """
+    pedidos = bd_pedido.get_abertos()
+    return pedidos or []
+
+def formatar_pedido(pedido: Pedido) -> str:
+    """
+    Formata um pedido para exibição na lista de pedidos.
+    
+    Args:
+        pedido (Pedido): Pedido a ser formatado.
+    
+    Returns:
+        str: Pedido no formato "ID: id, Mesa: mesa, Status: status, Data/Hora: data_hora".
+    """
+    return f"ID: {pedido.id}, Mesa: {pedido.mesa}, Status: {pedido.status}, Data/Hora: {pedido.data_hora}"
 
 def editar_status_pedido(id_pedido: str, status: str) -> bool:
     """
@@ -115,7 +244,55 @@ def editar_status_pedido(id_pedido: str, status: str) -> bool:
     status = bd_pedido.editar_status(status, id_pedido)
     return status
 
-def get_produtos_do_pedido(id_pedido: str) -> list[str]:
+def editar_status_pedidos(alteracoes: list[Tuple[str, str]]) -> bool:
+    """
+    Edita o status de vários pedidos em uma única transação.
+    
+    Args:
+        alteracoes (list[Tuple[str, str]]): Lista de tuplas no formato (id do pedido, novo status).
+    
+    Returns:
+        bool: True se todas as edições foram confirmadas, False caso alguma tenha falhado e nada foi alterado.
+    """
+    try:
+        with bd_pedido.transacao():
+            for id_pedido, status in alteracoes:
+                bd_pedido.editar_status(status, id_pedido)
+    except ErroTransacao as e:
+        print(f"[LOG ERRO] {e}")
+        return False
+    return True
+
+def editar_status_pedidos_em_lote(ids_pedidos: list[str], status: str) -> bool:
+    """
+    Define o mesmo status para vários pedidos de uma vez, em um único comando no banco.
+    
+    Args:
+        ids_pedidos (list[str]): IDs dos pedidos a serem editados.
+        status (str): Novo status dos pedidos.
+    
+    Returns:
+        bool: True se a edição foi bem sucedida, False caso contrário.
+    """
+    alterados = bd_pedido.editar_status_em_lote([int(id) for id in ids_pedidos], status)
+    return alterados is not None
+
+def encerrar_pedidos_da_mesa(mesa: int, status: str, status_atual: str | None = None) -> bool:
+    """
+    Define o status de todos os pedidos abertos de uma mesa, por exemplo ao fechar a conta.
+    
+    Args:
+        mesa (int): Número da mesa.
+        status (str): Novo status dos pedidos.
+        status_atual (str | None): Se informado, altera apenas os pedidos da mesa com esse status.
+    
+    Returns:
+        bool: True se a edição foi bem sucedida, False caso contrário.
+    """
+    alterados = bd_pedido.editar_status_dos_abertos(status, mesa=mesa, status_atual=status_atual)
+    return alterados is not None
+
+def get_produtos_do_pedido(id_pedido: str) -> list[ItemPedido]:
     """
     Busca os produtos de um pedido.
     
@@ -123,7 +300,21 @@ def get_produtos_do_pedido(id_pedido: str) -> list[str]:
         id_pedido (str): ID do pedido.
     
     Returns:
-        list[str]: Lista de produtos no formato "ID: id, Nome: nome, Preço: preço, Quantidade: quantidade".
+        list[ItemPedido]: Itens do pedido, com o nome de cada produto.
     """
     pedidos = bd_pedido_produto.get_produtos_do_pedido(id_pedido)
-    return pedidos
\ No newline at end of file
+    return pedidos
+
+def get_pedidos_completos(ids_pedidos: list[str]) -> list[Tuple[Pedido, list[ItemPedido]]]:
+    """
+    Busca vários pedidos com os seus produtos em uma única consulta, para telas que exibem
+    muitos pedidos de uma vez.
+    
+    Args:
+        ids_pedidos (list[str]): IDs dos pedidos.
+    
+    Returns:
+        list[Tuple[Pedido, list[ItemPedido]]]: Pares (pedido, itens) em ordem de id, ou lista vazia em caso de erro.
+    """
+    pedidos = bd_pedido_produto.get_pedidos_completos([int(id) for id in ids_pedidos])
+    return pedidos or []
@@ -3,10 +3,13 @@ Módulo que contém as funções relacionadas a produtos.
 """
 
 from typing import Tuple, Union
-import json
+from funcao_postgree.bd_postgree_base import ErroTransacao
+from funcao_postgree.bd_postgree_modelos import Produto
 from funcao_postgree.bd_postgree_produto import BdProduto
+from funcao_postgree.bd_postgree_servicos import servicos
+from src.func.func_catalogo import catalogo
 
-bd_produto = BdProduto()
+bd_produto = servicos.preguicoso(BdProduto)
 
 
 def inserir_produto(product: dict[str, Union[str, int, bool]]) -> bool:
@@ -20,7 +23,9 @@ def inserir_produto(product: dict[str, Union[str, int, bool]]) -> bool:
     Returns:
         bool: True se a inserção foi bem sucedida, False caso contrário.
     """
-    status = bd_produto.insert_produto(json.dumps(product))
+    status = bd_produto.insert_produto(Produto(**product))
+    if status:
+        catalogo.atualizar()
     return status
 
 
@@ -36,9 +41,32 @@ def atualizar_produto(product: dict[str, Union[str, int, float]], id_product: st
     Returns:
         bool: True se a atualização foi bem sucedida, False caso contrário.
     """
-    status = bd_produto.atualizar_produto(json.dumps(product), int(id_product))
+    status = bd_produto.atualizar_produto(Produto(**product), int(id_product))
+    if status:
+        catalogo.atualizar([int(id_product)])
     return status
 
+def atualizar_produtos(produtos: list[Tuple[dict[str, Union[str, int, float]], str]]) -> bool:
+    """
+    Atualiza vários produtos em uma única transação.
+    
+    Args:
+        produtos (list[Tuple[dict[str, Union[str, int, float]], str]]): Lista de tuplas no formato
+        (dados do produto, ID do produto), com as chaves 'nome', 'preco' e 'disponivel'.
+    
+    Returns:
+        bool: True se todas as atualizações foram confirmadas, False caso alguma tenha falhado e nada foi alterado.
+    """
+    try:
+        with bd_produto.transacao():
+            for product, id_product in produtos:
+                bd_produto.atualizar_produto(Produto(**product), int(id_product))
+    except ErroTransacao as e:
+        print(f"[LOG ERRO] {e}")
+        return False
+    catalogo.atualizar([int(id_product) for _, id_product in produtos])
+    return True
+
 def trocar_disponibilidade(id_product: str) -> bool:
     """
     Troca a disponibilidade de um produto.
@@ -50,9 +78,30 @@ def trocar_disponibilidade(id_product: str) -> bool:
         bool: True se a alteração foi bem sucedida, False caso contrário.
     """
     status = bd_produto.trocar_disponibilidade(id_product)
+    if status:
+        catalogo.atualizar([int(id_product)])
     return status
 
 
+def definir_disponibilidade(ids_products: list[str], disponivel: bool) -> bool:
+    """
+    Define a disponibilidade de vários produtos de uma vez, por exemplo quando falta um ingrediente.
+    
+    Args:
+        ids_products (list[str]): IDs dos produtos a serem alterados.
+        disponivel (bool): Nova disponibilidade.
+    
+    Returns:
+        bool: True se a alteração foi bem sucedida, False caso contrário.
+    """
+    alterados = bd_produto.definir_disponibilidade([int(id) for id in ids_products], disponivel)
+    if alterados is None:
+        return False
+    if alterados:
+        catalogo.atualizar(alterados)
+    return True
+
+
 def remover_produto(id_product: str) -> bool:
     """
     Remove um produto do banco de dados.
@@ -64,23 +113,79 @@ def remover_produto(id_product: str) -> bool:
         bool: True se a remoção foi bem sucedida, False caso contrário.
     """
     status = bd_produto.remover_produto(id_product)
+    if status:
+        catalogo.atualizar([int(id_product)])
     return status
 
 
+def formatar_produto_str(product: Produto) -> str:
+    """
+    Formata os dados de um produto como exibidos nas listas da tela.
+    
+    Args:
+        product (Produto): Produto a ser exibido.
+    
+    Returns:
+        str: Produto no formato "ID: 1, Nome: Pizza, Preço: 30.00, Status: disponível".
+    """
+    disponivel = "disponível" if product.disponivel else "indisponível"
+    return f"ID: {product.id}, Nome: {product.nome}, Preço: {product.preco}, Status: {disponivel}"
+
+
 def pegar_todos_itens_str() -> list[str]:
     """
     Retorna uma lista de strings com os produtos cadastrados.
+
+    Os produtos vêm do cache do catálogo, que só consulta o banco depois de uma alteração.
     
     Returns:
         list[str]: Lista de strings com os produtos cadastrados.
     """
-    produtos = []
-    for product in bd_produto.get_all():
-        id = product[0]
-        nome = product[1]
-        preco = product[2]
-        disponivel = "disponível" if bool(product[3]) else "indisponível"
-        produtos.append(f"ID: {id}, Nome: {nome}, Preço: {preco}, Status: {disponivel}")
+    return [formatar_produto_str(product) for product in catalogo.todos()]
+
+
+def pegar_ids_disponiveis() -> list[str]:
+    """
+    Retorna os IDs dos produtos disponíveis, a partir do cache do catálogo.
+    
+    Returns:
+        list[str]: Lista com os IDs dos produtos disponíveis.
+    """
+    return [str(product.id) for product in catalogo.todos() if product.disponivel]
+
+
+def buscar_produtos(termo: str, limite: int = 50) -> list[str]:
+    """
+    Busca produtos pelo início das palavras do nome, sem diferenciar maiúsculas nem acentos.
+
+    A busca é feita no índice de prefixos do cache do catálogo, sem consultar o banco a cada
+    tecla digitada.
     
-    return produtos
-  
\ No newline at end of file
+    Args:
+        termo (str): Texto digitado, por exemplo "piz cal".
+        limite (int): Quantidade máxima de produtos retornados.
+    
+    Returns:
+        list[str]: Lista de strings com os produtos encontrados, em ordem de nome.
+    """
+    return [formatar_produto_str(product) for product in catalogo.buscar(termo, limite)]
+
+
+def listar_produtos(apos_id: int = 0, limite: int = 100, disponivel: bool | None = None,
+                    prefixo_nome: str | None = None) -> Tuple[list[str], int | None]:
+    """
+    Retorna uma página de produtos, filtrada no banco de dados.
+    
+    Args:
+        apos_id (int): Retorna apenas produtos com ID maior que este. Default é 0 (primeira página).
+        limite (int): Quantidade máxima de produtos na página.
+        disponivel (bool | None): Filtra pela disponibilidade. Default é None (todos).
+        prefixo_nome (str | None): Filtra pelo início do nome. Default é None (todos).
+    
+    Returns:
+        Tuple[list[str], int | None]: Produtos da página e o `apos_id` da próxima página, ou None
+        se esta for a última.
+    """
+    pagina = bd_produto.listar(apos_id, limite, disponivel, prefixo_nome) or []
+    proximo = pagina[-1].id if len(pagina) == limite else None
+    return [formatar_produto_str(product) for product in pagina], proximo
@@ -4,19 +4,17 @@ import numpy as np
 from datetime import datetime 
 from email_functions.email_sand import EmailSender
 
-from funcao_postgree.bd_postgree_base import Bd_Base
 from funcao_postgree.bd_postgree_pedido_produto import BdPedidoProduto
 from funcao_postgree.bd_postgree_pedido import BdPedido
 from funcao_postgree.bd_postgree_produto import BdProduto
-from dotenv import load_dotenv
+from funcao_postgree.bd_postgree_resumo_vendas import BdResumoVendas
+from funcao_postgree.bd_postgree_servicos import servicos
 import os
 
-load_dotenv(".env")
-Bd_Base(os.getenv('HOST_BD'), os.getenv('DATABASE'), os.getenv('USER_BD'), os.getenv('PASSWORD_BD'))
-
-bd_produto = BdProduto()
-bd_pedido = BdPedido()
-bd_pedido_produto = BdPedidoProduto()
+bd_produto = servicos.preguicoso(BdProduto)
+bd_pedido = servicos.preguicoso(BdPedido)
+bd_pedido_produto = servicos.preguicoso(BdPedidoProduto)
+bd_resumo_vendas = servicos.preguicoso(BdResumoVendas)
 
 def criar_csv():
     """
@@ -24,17 +22,19 @@ def criar_csv():
 
     Esta função obtém os dados necessários de três tabelas (pedidos, produtos e produtos pedidos) e 
     grava esses dados em arquivos CSV (pedidos.csv, produtos.csv, produtos_pedidos.csv).
+    As linhas são gravadas à medida que chegam do banco, sem montar o CSV inteiro na memória.
     """
-    text_pedidos_csv = bd_pedido.get_pedidos_csv()
-    text_produtos_csv = bd_produto.get_produto_csv()
-    text_produtos_pedidos_csv = bd_pedido_produto.get_pedidos_produto_csv()
-    
-    with open("pedidos.csv", "w") as file:
-        file.write(text_pedidos_csv)
-    with open("produtos.csv", "w") as file:
-        file.write(text_produtos_csv)
-    with open("produtos_pedidos.csv", "w") as file:
-        file.write(text_produtos_pedidos_csv)
+    arquivos = {
+        "pedidos.csv": bd_pedido.iter_pedidos_csv,
+        "produtos.csv": bd_produto.iter_produto_csv,
+        "produtos_pedidos.csv": bd_pedido_produto.iter_pedidos_produto_csv,
+    }
+    for nome_arquivo, iter_csv in arquivos.items():
+        with open(nome_arquivo, "w") as file:
+            try:
+                file.writelines(iter_csv())
+            except Exception as e:
+                print(f"[LOG ERRO] Erro ao gravar {nome_arquivo}: {e}")
         
 def remover_csv():
     """
@@ -50,103 +50,82 @@ def remover_csv():
 
 def carregar_dados():
     """
-    Carrega os dados de pedidos, produtos e produtos pedidos a partir de arquivos CSV.
+    Carrega os resumos de vendas mantidos pelo banco de dados.
 
-    A função cria os arquivos CSV, carrega os dados em DataFrames pandas, 
-    e remove os arquivos após o uso.
+    Os resumos já têm os totais por hora, mesa e status e por dia, produto e status, então o
+    tempo do relatório depende do número de horas e dias com vendas, e não do número de pedidos.
 
     Retorna:
-        df_pedidos (DataFrame): Dados sobre os pedidos.
-        df_produtos (DataFrame): Dados sobre os produtos.
-        df_produtos_pedidos (DataFrame): Relacionamento entre pedidos e produtos.
-    """
-    criar_csv()
-    df_pedidos = pd.read_csv("pedidos.csv")
-    df_produtos = pd.read_csv("produtos.csv")
-    df_produtos_pedidos = pd.read_csv("produtos_pedidos.csv")
-    remover_csv()
-    
-    print("Dados carregados com sucesso.")
-    print("Pedidos:", df_pedidos.shape)
-    print("Produtos:", df_produtos.shape)
-    print("Produtos_Pedidos:", df_produtos_pedidos.shape)
-    
-    return df_pedidos, df_produtos, df_produtos_pedidos
-
-def mesclar_e_limpar(df1, df2, chave_esquerda, chave_direita, sufixos=("", "_y")):
+        df_vendas_hora (DataFrame): Vendas por hora, mesa e status.
+        df_vendas_produto (DataFrame): Vendas por dia, produto e status.
     """
-    Realiza a mesclagem de dois DataFrames com base nas chaves fornecidas e remove colunas duplicadas.
-
-    A função mescla dois DataFrames com base nas chaves de junção e remove as colunas
-    duplicadas adicionadas pela operação de mesclagem.
+    df_vendas_hora = pd.DataFrame(
+        bd_resumo_vendas.get_vendas_por_hora() or [],
+        columns=["hora", "mesa", "status", "quantidade", "valor"]
+    )
+    df_vendas_produto = pd.DataFrame(
+        bd_resumo_vendas.get_vendas_por_produto() or [],
+        columns=["data", "produto_id", "nome", "status", "quantidade", "valor"]
+    )
 
-    Args:
-        df1 (DataFrame): Primeiro DataFrame para mesclagem.
-        df2 (DataFrame): Segundo DataFrame para mesclagem.
-        chave_esquerda (str): Coluna de junção do primeiro DataFrame.
-        chave_direita (str): Coluna de junção do segundo DataFrame.
-        sufixos (tuple): Sufixos a serem adicionados às colunas duplicadas (padrão: "", "_y").
+    print("Dados carregados com sucesso.")
+    print("Vendas por hora:", df_vendas_hora.shape)
+    print("Vendas por produto:", df_vendas_produto.shape)
 
-    Retorna:
-        DataFrame: DataFrame mesclado e limpo.
-    """
-    mesclado = df1.merge(df2, left_on=chave_esquerda, right_on=chave_direita, suffixes=sufixos)
-    return mesclado.loc[:, ~mesclado.columns.str.endswith("_y")]
+    return df_vendas_hora, df_vendas_produto
 
-def preprocessar_dados(df_pedidos, df_produtos, df_produtos_pedidos):
+def preprocessar_dados(df_vendas_hora, df_vendas_produto):
     """
-    Realiza o pré-processamento dos dados de pedidos, produtos e produtos pedidos.
+    Realiza o pré-processamento dos resumos de vendas.
 
-    Essa função adiciona novas colunas aos dados de pedidos (como mês, hora, dia da semana, etc.) 
-    e realiza a mesclagem entre os DataFrames de pedidos, produtos e produtos pedidos.
+    Essa função adiciona ao resumo por hora as colunas de período (mês, hora, dia da semana, etc.)
+    e converte os valores para float.
 
     Args:
-        df_pedidos (DataFrame): Dados de pedidos.
-        df_produtos (DataFrame): Dados de produtos.
-        df_produtos_pedidos (DataFrame): Relacionamento entre pedidos e produtos.
+        df_vendas_hora (DataFrame): Vendas por hora, mesa e status.
+        df_vendas_produto (DataFrame): Vendas por dia, produto e status.
 
     Retorna:
-        tuple: DataFrames atualizados de pedidos, produtos e produtos pedidos.
+        tuple: DataFrames atualizados de vendas por hora e por produto.
     """
-    df_pedidos["data_hora"] = pd.to_datetime(df_pedidos["data_hora"])
-    df_pedidos["mes"] = df_pedidos["data_hora"].dt.month
-    df_pedidos["dia_semana"] = df_pedidos["data_hora"].dt.dayofweek
-    df_pedidos["hora"] = df_pedidos["data_hora"].dt.hour
-    df_pedidos["data"] = df_pedidos["data_hora"].dt.date
-    df_pedidos["semana"] = df_pedidos["data_hora"].dt.isocalendar().week
-    df_pedidos["trimestre"] = df_pedidos["data_hora"].dt.quarter
-
-    df_produtos_pedidos = mesclar_e_limpar(df_produtos_pedidos, df_produtos, "produto_id", "id")
-    df_produtos_pedidos = mesclar_e_limpar(df_produtos_pedidos, df_pedidos, "pedido_id", "id")
-    return df_pedidos, df_produtos, df_produtos_pedidos
-
-def calcular_totais(df_pedidos, df_produtos, df_produtos_pedidos):
+    df_vendas_hora["hora_inicio"] = pd.to_datetime(df_vendas_hora["hora"])
+    df_vendas_hora["mes"] = df_vendas_hora["hora_inicio"].dt.month
+    df_vendas_hora["dia_semana"] = df_vendas_hora["hora_inicio"].dt.dayofweek
+    df_vendas_hora["hora"] = df_vendas_hora["hora_inicio"].dt.hour
+    df_vendas_hora["data"] = df_vendas_hora["hora_inicio"].dt.date
+    df_vendas_hora["semana"] = df_vendas_hora["hora_inicio"].dt.isocalendar().week
+    df_vendas_hora["trimestre"] = df_vendas_hora["hora_inicio"].dt.quarter
+    df_vendas_hora["valor"] = df_vendas_hora["valor"].astype(float)
+    df_vendas_produto["valor"] = df_vendas_produto["valor"].astype(float)
+    return df_vendas_hora, df_vendas_produto
+
+def calcular_totais(df_vendas_hora, df_vendas_produto):
     """
-    Calcula os totais de vendas com base nos dados de pedidos, produtos e produtos pedidos.
+    Calcula os totais de vendas com base nos resumos de vendas.
 
     A função calcula o total geral de vendas e também o total de vendas agrupado por 
-    diferentes critérios como produto, mês, dia da semana, hora, etc.
+    diferentes critérios como produto, mês, dia da semana, hora, etc. O valor de cada
+    item é a quantidade vezes o preço pago.
 
     Args:
-        df_pedidos (DataFrame): Dados de pedidos.
-        df_produtos (DataFrame): Dados de produtos.
-        df_produtos_pedidos (DataFrame): Relacionamento entre pedidos e produtos.
+        df_vendas_hora (DataFrame): Vendas por hora, mesa e status.
+        df_vendas_produto (DataFrame): Vendas por dia, produto e status.
 
     Retorna:
         dict: Dicionário com os totais de vendas por diferentes critérios.
     """
-    total_vendas = df_produtos_pedidos["preco_pago"].sum()
+    total_vendas = df_vendas_hora["valor"].sum()
     totais = {
         "total_vendas": total_vendas,
-        "total_vendas_produto": df_produtos_pedidos.groupby("nome")["preco_pago"].sum(),
-        "total_vendas_mes": df_produtos_pedidos.groupby("mes")["preco_pago"].sum(),
-        "total_vendas_dia_semana": df_produtos_pedidos.groupby("dia_semana")["preco_pago"].sum(),
-        "total_vendas_hora": df_produtos_pedidos.groupby("hora")["preco_pago"].sum(),
-        "total_vendas_status": df_produtos_pedidos.groupby("status")["preco_pago"].sum(),
-        "total_vendas_mesa": df_produtos_pedidos.groupby("mesa")["preco_pago"].sum(),
-        "total_vendas_data": df_produtos_pedidos.groupby("data")["preco_pago"].sum(),
-        "total_vendas_semana": df_produtos_pedidos.groupby("semana")["preco_pago"].sum(),
-        "total_vendas_trimestre": df_produtos_pedidos.groupby("trimestre")["preco_pago"].sum(),
+        "total_vendas_produto": df_vendas_produto.groupby("nome")["valor"].sum(),
+        "total_vendas_mes": df_vendas_hora.groupby("mes")["valor"].sum(),
+        "total_vendas_dia_semana": df_vendas_hora.groupby("dia_semana")["valor"].sum(),
+        "total_vendas_hora": df_vendas_hora.groupby("hora")["valor"].sum(),
+        "total_vendas_status": df_vendas_hora.groupby("status")["valor"].sum(),
+        "total_vendas_mesa": df_vendas_hora.groupby("mesa")["valor"].sum(),
+        "total_vendas_data": df_vendas_hora.groupby("data")["valor"].sum(),
+        "total_vendas_semana": df_vendas_hora.groupby("semana")["valor"].sum(),
+        "total_vendas_trimestre": df_vendas_hora.groupby("trimestre")["valor"].sum(),
     }
     return totais
 
@@ -285,9 +264,9 @@ def gerar_relatorio() -> str:
     Retorna:
         str: Código HTML do relatório de vendas.
     """
-    df_pedidos, df_produtos, df_produtos_pedidos = carregar_dados()
-    df_pedidos, df_produtos, df_produtos_pedidos = preprocessar_dados(df_pedidos, df_produtos, df_produtos_pedidos)
-    totais = calcular_totais(df_pedidos, df_produtos, df_produtos_pedidos)
+    df_vendas_hora, df_vendas_produto = carregar_dados()
+    df_vendas_hora, df_vendas_produto = preprocessar_dados(df_vendas_hora, df_vendas_produto)
+    totais = calcular_totais(df_vendas_hora, df_vendas_produto)
     html = gerar_html(totais)
     return html
 
@@ -3,12 +3,15 @@ Módulo que contém funções para iniciar o cliente e o servidor de sincroniza
 """
 from typing import Callable
 from sincronizacao_servidor_cliente import ClienteSincronizado, ServidorSincronizacao
+from funcao_postgree.bd_postgree_notificacoes import OuvinteAlteracoes
+from funcao_postgree.bd_postgree_servicos import servicos
 from dotenv import load_dotenv
 import os
 
 load_dotenv('.env')
 cliente_sincronizado = ClienteSincronizado(os.getenv('SERVER_ADDRESS'), int(os.getenv('SERVER_PORT')))
 sync_server = ServidorSincronizacao(os.getenv('SERVER_ADDRESS'), int(os.getenv('SERVER_PORT')))
+ouvinte_alteracoes = None
 
 def iniciar_cliente_sincronizado(on_mensage: Callable) -> None:
     """
@@ -31,10 +34,16 @@ def enviar_mensagem_de_sincronizacao_cliente(msg: str) -> None:
 def iniciar_servidor_sincronizado(on_message: Callable) -> None:
     """
     Inicia o servidor sincronizado.
+
+    Antes de aceitar clientes, passa a escutar as alterações de produtos e pedidos feitas no
+    banco (por qualquer programa) e repassa cada uma aos clientes, por exemplo "sync_produto: 1,2".
     
     Args:
         on_message (Callable): Função de callback para receber mensagens dos clientes.
     """
+    global ouvinte_alteracoes
+    ouvinte_alteracoes = OuvinteAlteracoes(enviar_mensagem_de_sincronizacao_server, **servicos.parametros)
+    ouvinte_alteracoes.iniciar()
     sync_server.iniciar(on_message)
     
 def enviar_mensagem_de_sincronizacao_server(msg: str) -> None:
@@ -50,5 +59,7 @@ def close_server() -> None:
     """
     Encerra o servidor de sincronização.
     """
+    if ouvinte_alteracoes is not None:
+        ouvinte_alteracoes.parar()
     enviar_mensagem_de_sincronizacao_server("server_down")
     sync_server.parar()
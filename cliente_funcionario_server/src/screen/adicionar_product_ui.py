@@ -5,7 +5,6 @@ from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
 from typing import Callable
 from src.func.func_produtos import inserir_produto
-from src.func.func_sincronizacao import enviar_mensagem_de_sincronizacao_cliente
 
 
 class AdicionarProduto(QMainWindow):
@@ -133,7 +132,6 @@ class AdicionarProduto(QMainWindow):
 
             if inserir_produto(produto):  
                 QMessageBox.information(self, "Sucesso", "Produto inserido com sucesso!")
-                enviar_mensagem_de_sincronizacao_cliente("sync_produto")
                 print("[LOG INFO] Produto inserido com sucesso!")
                 self.clear_values()
                 self.close()
@@ -78,14 +78,14 @@ class DialogoExibirProduto(QDialog):
         total_geral = 0
 
         for produto in produtos:
-            total_item = produto['preco_pago'] * produto['quantidade']
+            total_item = produto.preco_pago * produto.quantidade
             total_geral += total_item
 
             texto_produtos += (
-                f"Id: {produto['produto_id']}\n"
-                f"Nome: {produto['nome']}\n"
-                f"Quantidade: {produto['quantidade']}\n"
-                f"Preço unitário: R$ {produto['preco_pago']:.2f}\n"
+                f"Id: {produto.produto_id}\n"
+                f"Nome: {produto.nome}\n"
+                f"Quantidade: {produto.quantidade}\n"
+                f"Preço unitário: R$ {produto.preco_pago:.2f}\n"
                 f"TOTAL: R$ {total_item:.2f}\n"
                 "----------------------------------------\n"
             )
@@ -3,7 +3,6 @@ from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QLabel, QLineEdit, QPushBu
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap, QFont
 from src.func.func_produtos import atualizar_produto
-from src.func.func_sincronizacao import enviar_mensagem_de_sincronizacao_server
 
 
 class EditarProduto(QMainWindow):
@@ -138,7 +137,6 @@ class EditarProduto(QMainWindow):
 
             if atualizar_produto(produto, self.id):
                 QMessageBox.information(self, "Sucesso", "Produto editado com sucesso!")
-                enviar_mensagem_de_sincronizacao_server("sync_produto")
                 self.close()
             else:
                 QMessageBox.warning(self, "Erro", "Falha ao editar. Verifique a conexão ou os dados inseridos.")
@@ -2,7 +2,7 @@
 Módulo que contém a classe TelaPrincipalServer, que é a tela principal do servidor.
 """
 
-from PyQt5.QtWidgets import QMainWindow, QMessageBox, QDialog
+from PyQt5.QtWidgets import QMainWindow, QMessageBox, QDialog, QAbstractItemView
 from PyQt5.QtGui import QStandardItemModel, QStandardItem, QBrush, QColor, QImage, QIcon, QPixmap
 from PyQt5.QtCore import pyqtSignal, QObject
 from PyQt5 import uic
@@ -13,11 +13,19 @@ from src.func.func_pedidos_desenvolvimento import adicionar_pedido_em_desenvolvi
 from .editar_produto_ui import EditarProduto
 from src.screen.adicionar_product_ui import AdicionarProduto
 from .dialogo_exibir_pedido import DialogoExibirProduto
-from src.func.func_pedido import get_utimos_1000_pedidos, editar_status_pedido, inserir_pedido, transformar_lista_str_em_lista_tuple
+from src.func.func_pedido import formatar_pedido, get_pedidos_abertos, get_ultimos_pedidos, editar_status_pedido, editar_status_pedidos_em_lote, inserir_pedido, transformar_lista_str_em_lista_tuple
 from src.func.func_sincronizacao import enviar_mensagem_de_sincronizacao_cliente
-from src.func.func_produtos import pegar_todos_itens_str, remover_produto, trocar_disponibilidade
+from src.func.func_produtos import buscar_produtos, definir_disponibilidade, pegar_ids_disponiveis, pegar_todos_itens_str, remover_produto, trocar_disponibilidade
 from src.func.func_autenticacao import carregar_credenciais
 
+# Cor do ícone de cada pedido na lista, pelo status do pedido.
+CORES_STATUS = {
+    "Pedido em andamento": QColor(255, 255, 0),  # Amarelo
+    "Pedido cancelado": QColor(255, 0, 0),  # Vermelho
+    "Pedido finalizado": QColor(0, 255, 0),  # Verde
+    "Entregar": QColor(0, 0, 255),  # Azul
+}
+
 class SignalHandler(QObject):
     """
     Classe que gerencia os sinais de atualização de produtos e pedidos.
@@ -59,11 +67,17 @@ class TelaPrincipalServer(QMainWindow):
         self.actionEnviar_banco_de_dados_Email.triggered.connect(self.enviar_banco_de_dados_email)
         self.actionTrocar_senha.triggered.connect(self.trocar_senha)
         
+        # Vários produtos podem ser selecionados para trocar a disponibilidade de uma vez.
+        self.lst_todos_produtos.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        # O mesmo vale para os pedidos: o status escolhido é aplicado a todos os selecionados.
+        self.lst_todos_pedidos.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.comboBox_status_do_pedido.setEnabled(False)
         self.lst_todos_pedidos.clicked.connect(self.status_pedido_selecionado)
         self.current_pedido_id = None 
+        self.ids_pedidos_selecionados = []
         
         self.pushButton_exibir_pedido.clicked.connect(self.exibir_pedido)
+        self.lineEdit_buscar_cardapio.textChanged.connect(self.filtrar_cardapio)
     
     def enviar_relatorio_email(self) -> None:
         email,_  = carregar_credenciais()
@@ -101,7 +115,6 @@ class TelaPrincipalServer(QMainWindow):
             numero_de_mesa = dialogo_confirmacao.numero_da_mesa.text()  # Corrigido
             status = dialogo_confirmacao.status_pedido.currentText()
             if(inserir_pedido(transformar_lista_str_em_lista_tuple(pedidos_em_desenvolvimento), numero_de_mesa, status)):
-                enviar_mensagem_de_sincronizacao_cliente("sync_pedido")
                 finalizar_pedido_em_desenvolvimento()
                 self.atualizar_pedido_desenvolvimento()
             else:
@@ -195,6 +208,10 @@ class TelaPrincipalServer(QMainWindow):
             status = item_text.split(", ")[2].split(": ")[1]
         
             self.current_pedido_id = id
+            self.ids_pedidos_selecionados = [
+                self.lst_todos_pedidos.model().itemFromIndex(index).text().split(", ")[0].split(": ")[1]
+                for index in selected_index
+            ]
             
             self.comboBox_status_do_pedido.setCurrentText(status)
             self.comboBox_status_do_pedido.currentTextChanged.connect(self.editar_status_pedido)
@@ -213,10 +230,16 @@ class TelaPrincipalServer(QMainWindow):
     def editar_status_pedido(self) -> None:
         """
         Método que é chamado quando o status de um pedido é editado.
+
+        Com vários pedidos selecionados, todos recebem o novo status em uma única alteração no banco.
         """
         status = self.comboBox_status_do_pedido.currentText()
-        editar_status_pedido(self.current_pedido_id, status)
-        enviar_mensagem_de_sincronizacao_cliente("sync_pedido")
+        if len(self.ids_pedidos_selecionados) > 1:
+            print(f"[LOG INFO] Editando status de {len(self.ids_pedidos_selecionados)} pedidos")
+            if not editar_status_pedidos_em_lote(self.ids_pedidos_selecionados, status):
+                QMessageBox.warning(self, "Erro", "Não foi possível editar o status dos pedidos.")
+        else:
+            editar_status_pedido(self.current_pedido_id, status)
         
         
     def init_vars(self) -> None:
@@ -264,9 +287,31 @@ class TelaPrincipalServer(QMainWindow):
             model_cardapio.appendRow(QStandardItem(item))
         
         self.lst_todos_produtos.setModel(model_produtos)
-        self.listView_cardapio.setModel(model_cardapio)
+        if self.lineEdit_buscar_cardapio.text().strip():
+            self.filtrar_cardapio(self.lineEdit_buscar_cardapio.text())
+        else:
+            self.listView_cardapio.setModel(model_cardapio)
         
         self.atualizar_pedido_desenvolvimento()
+
+    def filtrar_cardapio(self, texto: str) -> None:
+        """
+        Método chamado a cada tecla digitada na busca do cardápio. Mostra apenas os produtos
+        cujo nome tem palavras começando com o texto digitado.
+        
+        Args:
+            texto (str): Texto da busca. Vazio mostra o cardápio inteiro.
+        """
+        itens = buscar_produtos(texto, limite=200) if texto.strip() else pegar_todos_itens_str()
+        
+        model_cardapio = QStandardItemModel()
+        for entry in itens:
+            item = QStandardItem(entry)
+            color = QColor(255, 0, 0) if "indisponível" == entry.split(", ")[3].split(": ")[1] else QColor(0, 255, 0)
+            self.adicionar_cor_item(color, item)
+            model_cardapio.appendRow(item)
+        
+        self.listView_cardapio.setModel(model_cardapio)
         
     def atualizar_pedido_desenvolvimento(self) -> None:
         """
@@ -293,19 +338,9 @@ class TelaPrincipalServer(QMainWindow):
         Função para obter os produtos disponíveis.
         
         Returns:
-            list: Lista com os produtos disponíveis.
+            list: Lista com os IDs dos produtos disponíveis.
         """
-        todos_itens = pegar_todos_itens_str()
-        produtos_disponiveis = []
-        
-        for entry in todos_itens:
-            partes = entry.split(", ")
-            nome_produto = partes[0].split(": ")[1]
-            status_produto = partes[3].split(": ")[1]
-            if "disponível" == status_produto:
-                produtos_disponiveis.append(nome_produto)
-                
-        return produtos_disponiveis
+        return pegar_ids_disponiveis()
         
         
         
@@ -351,7 +386,6 @@ class TelaPrincipalServer(QMainWindow):
                 if remove:
                     print("[LOG INFO] Removendo produto")
                     remover_produto(id)
-                    enviar_mensagem_de_sincronizacao_cliente("sync_produto")
                     
                     
             except ValueError as e:
@@ -362,20 +396,28 @@ class TelaPrincipalServer(QMainWindow):
     def trocar_disponibilidade(self) -> None:
         """
         Método que é chamado quando o botão de trocar disponibilidade é clicado.
+
+        Com vários produtos selecionados, todos ficam indisponíveis se algum estiver disponível,
+        ou todos ficam disponíveis caso contrário, em uma única alteração no banco.
         """
         selected_index = self.lst_todos_produtos.selectedIndexes()
         
-        if selected_index:
+        if len(selected_index) == 1:
             
             selected_item = self.lst_todos_produtos.model().itemFromIndex(selected_index[0])
             item_text = selected_item.text()
 
             id = item_text.split(', ')[0].split(": ")[1]
             print("[LOG INFO] Trocando disponibilidade")
-            if trocar_disponibilidade(id):
-                enviar_mensagem_de_sincronizacao_cliente("sync_produto")
-            else:
+            if not trocar_disponibilidade(id):
                 QMessageBox.warning(self, "Erro", "Não foi possível trocar a disponibilidade do produto.")
+        elif selected_index:
+            itens = [self.lst_todos_produtos.model().itemFromIndex(index).text().split(', ') for index in selected_index]
+            ids = [partes[0].split(": ")[1] for partes in itens]
+            disponivel = not any(partes[3].split(": ")[1] == "disponível" for partes in itens)
+            print(f"[LOG INFO] Definindo disponibilidade de {len(ids)} produtos")
+            if not definir_disponibilidade(ids, disponivel):
+                QMessageBox.warning(self, "Erro", "Não foi possível trocar a disponibilidade dos produtos.")
         else:
             QMessageBox.warning(self, "Erro", "Selecione um produto para trocar a disponibilidade.")
     
@@ -387,19 +429,18 @@ class TelaPrincipalServer(QMainWindow):
         model = QStandardItemModel()
         self.lst_todos_pedidos.setModel(model)
 
-        for pedido in get_utimos_1000_pedidos():
-            item = QStandardItem(pedido)
-            status = pedido.split(", ")[2].split(": ")[1]
+        # A fila de pedidos abertos fica no topo, do mais antigo ao mais recente, seguida pelos
+        # demais pedidos recentes.
+        abertos = get_pedidos_abertos()
+        ids_abertos = {pedido.id for pedido in abertos}
+        pedidos = abertos + [pedido for pedido in get_ultimos_pedidos() if pedido.id not in ids_abertos]
+
+        for pedido in pedidos:
+            item = QStandardItem(formatar_pedido(pedido))
+            cor = CORES_STATUS.get(pedido.status)
+            if cor is not None:
+                self.adicionar_cor_item(cor, item)
 
-            if "Pedido em andamento" in status:
-                self.adicionar_cor_item(QColor(255, 255, 0), item)  # Amarelo para "em andamento"
-            elif "Pedido cancelado" in status:
-                self.adicionar_cor_item(QColor(255, 0, 0), item)  # Vermelho para "cancelado"
-            elif "Pedido finalizado" in status:
-                self.adicionar_cor_item(QColor(0, 255, 0), item)  # Verde para "finalizado"
-            elif "Entregar" in status:
-                self.adicionar_cor_item(QColor(0, 0, 255), item)  # Azul para "entregar"
-            
             model.appendRow(item)
 
         
\ No newline at end of file
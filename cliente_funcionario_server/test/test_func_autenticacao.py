@@ -1,13 +1,25 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from src.func.func_autenticacao import inserir_funcionario
-import json
+from funcao_postgree.bd_postgree_modelos import Funcionario
 
 class TestFuncAutenticacao(unittest.TestCase):
     """
     Classe de testes para validar a funcionalidade de inserção de funcionários.
     """
 
+    def setUp(self):
+        """
+        Grava as credenciais em um diretório temporário, para não alterar o arquivo usado pela aplicação.
+        """
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        arquivo = patch('src.func.func_autenticacao.CREDENCIAIS_FILE', os.path.join(diretorio.name, 'credenciais.json'))
+        arquivo.start()
+        self.addCleanup(arquivo.stop)
+
     @patch('src.func.func_autenticacao.bd_funcionario')
     def test_inserir_funcionario_sucesso(self, mock_bd_funcionario):
         """
@@ -20,7 +32,7 @@ class TestFuncAutenticacao(unittest.TestCase):
         mock_bd_funcionario.insert_funcionario.return_value = True
         funcionario = {'usuario': 'test_user', 'senha': 'test_pass', 'email': 'test@example.com'}
         result = inserir_funcionario(funcionario)
-        mock_bd_funcionario.insert_funcionario.assert_called_once_with(json.dumps(funcionario))
+        mock_bd_funcionario.insert_funcionario.assert_called_once_with(Funcionario(**funcionario))
         self.assertTrue(result)
 
     @patch('src.func.func_autenticacao.bd_funcionario')
@@ -35,7 +47,7 @@ class TestFuncAutenticacao(unittest.TestCase):
         mock_bd_funcionario.insert_funcionario.return_value = False
         funcionario = {'usuario': 'test_user', 'senha': 'test_pass', 'email': 'test@example.com'}
         result = inserir_funcionario(funcionario)
-        mock_bd_funcionario.insert_funcionario.assert_called_once_with(json.dumps(funcionario))
+        mock_bd_funcionario.insert_funcionario.assert_called_once_with(Funcionario(**funcionario))
         self.assertFalse(result)
 
 if __name__ == '__main__':
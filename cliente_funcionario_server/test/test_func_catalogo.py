@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch
+from funcao_postgree.bd_postgree_modelos import Produto
+from src.func.func_catalogo import catalogo
+
+PIZZA = Produto('Pizza', 30.0, True, 1)
+SUCO = Produto('Suco', 8.0, True, 2)
+
+class TestCacheCatalogo(unittest.TestCase):
+    """
+    Classe de testes para validar o cache do catálogo de produtos.
+    """
+
+    def setUp(self):
+        """
+        Descarta o catálogo e zera os contadores antes de cada teste.
+        """
+        catalogo.limpar()
+
+    def tearDown(self):
+        """
+        Descarta o catálogo carregado pelo teste, para não afetar os testes de outros módulos.
+        """
+        catalogo.limpar()
+
+    @patch('src.func.func_catalogo.bd_produto')
+    def test_leituras_atendidas_pelo_cache(self, mock_bd_produto):
+        """
+        Testa se apenas a primeira leitura consulta o banco.
+
+        Valida:
+        - Se `get_all` é chamado uma única vez.
+        - Se os contadores registram uma falta e os acertos seguintes.
+        """
+        mock_bd_produto.get_all.return_value = [PIZZA, SUCO]
+
+        for _ in range(3):
+            self.assertEqual(catalogo.todos(), [PIZZA, SUCO])
+
+        mock_bd_produto.get_all.assert_called_once()
+        self.assertEqual(catalogo.estatisticas(), {'acertos': 2, 'faltas': 1, 'produtos': 2})
+
+    @patch('src.func.func_catalogo.bd_produto')
+    def test_mensagem_com_ids(self, mock_bd_produto):
+        """
+        Testa uma mensagem de sincronização com os ids alterados.
+
+        Valida:
+        - Se apenas os produtos alterados são consultados.
+        - Se produtos removidos saem do catálogo sem recarregá-lo.
+        """
+        mock_bd_produto.get_all.return_value = [PIZZA, SUCO]
+        catalogo.todos()
+        pizza_indisponivel = Produto('Pizza', 30.0, False, 1)
+        mock_bd_produto.get_por_ids.return_value = [pizza_indisponivel]
+
+        catalogo.tratar_mensagem('sync_produto: 1,2')
+
+        mock_bd_produto.get_por_ids.assert_called_once_with([1, 2])
+        self.assertEqual(catalogo.todos(), [pizza_indisponivel])
+        mock_bd_produto.get_all.assert_called_once()
+
+    @patch('src.func.func_catalogo.bd_produto')
+    def test_mensagem_sem_ids(self, mock_bd_produto):
+        """
+        Testa uma mensagem de sincronização sem ids.
+
+        Valida:
+        - Se o catálogo inteiro é recarregado na próxima leitura.
+        """
+        mock_bd_produto.get_all.return_value = [PIZZA]
+        catalogo.todos()
+
+        catalogo.tratar_mensagem('sync_produto')
+        catalogo.todos()
+
+        self.assertEqual(mock_bd_produto.get_all.call_count, 2)
+        mock_bd_produto.get_por_ids.assert_not_called()
+
+    @patch('src.func.func_catalogo.bd_produto')
+    def test_buscar_por_prefixo(self, mock_bd_produto):
+        """
+        Testa a busca no índice de prefixos dos nomes.
+
+        Valida:
+        - Se a busca ignora maiúsculas e acentos e exige que cada palavra do termo comece uma palavra do nome.
+        - Se o índice acompanha a alteração de um produto sem consultar o catálogo inteiro de novo.
+        """
+        mock_bd_produto.get_all.return_value = [
+            Produto('Pizza Calabresa', 30.0, True, 1),
+            Produto('Pão de Açúcar', 5.0, True, 2),
+            Produto('Pizza Atum', 32.0, True, 3),
+        ]
+
+        self.assertEqual([p.id for p in catalogo.buscar('PIZ')], [3, 1])
+        self.assertEqual([p.id for p in catalogo.buscar('cal piz')], [1])
+        self.assertEqual([p.id for p in catalogo.buscar('acu')], [2])
+        self.assertEqual(catalogo.buscar('bolo'), [])
+
+        mock_bd_produto.get_por_ids.return_value = [Produto('Torta de Atum', 20.0, True, 3)]
+        catalogo.atualizar([3])
+
+        self.assertEqual([p.id for p in catalogo.buscar('piz')], [1])
+        self.assertEqual([p.id for p in catalogo.buscar('tor at')], [3])
+        mock_bd_produto.get_all.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import unittest
+from unittest.mock import patch
+from src.func.func_manutencao import agendar_manutencao, manter_particoes
+
+class TestFuncManutencao(unittest.TestCase):
+    """
+    Classe de testes para a manutenção das partições de pedidos.
+    """
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch('src.func.func_manutencao.bd_particoes')
+    def test_manter_particoes_padrao(self, mock_bd_particoes):
+        """
+        Testa a manutenção sem nenhuma variável de ambiente definida.
+
+        Valida:
+        - Se três meses futuros são garantidos e todo o histórico é mantido.
+        """
+        mock_bd_particoes.manter.return_value = True
+
+        self.assertTrue(manter_particoes())
+        mock_bd_particoes.manter.assert_called_once_with(meses_futuros=3, meses_retencao=None, apagar=False)
+
+    @patch.dict(os.environ, {'MESES_PARTICOES_FUTURAS': '2', 'MESES_RETENCAO_PEDIDOS': '24', 'APAGAR_PARTICOES_ANTIGAS': '1'}, clear=True)
+    @patch('src.func.func_manutencao.bd_particoes')
+    def test_manter_particoes_com_retencao(self, mock_bd_particoes):
+        """
+        Testa a manutenção com a retenção configurada.
+
+        Valida:
+        - Se os valores das variáveis de ambiente são repassados ao banco.
+        """
+        manter_particoes()
+
+        mock_bd_particoes.manter.assert_called_once_with(meses_futuros=2, meses_retencao=24, apagar=True)
+
+    @patch('src.func.func_manutencao.manter_particoes')
+    def test_agendar_manutencao(self, mock_manter_particoes):
+        """
+        Testa o agendamento da manutenção.
+
+        Valida:
+        - Se a primeira execução acontece em segundo plano e agenda a seguinte.
+        """
+        with patch('src.func.func_manutencao.threading.Timer') as mock_timer:
+            agendar_manutencao(intervalo=60)
+            executar = mock_timer.call_args.args[1]
+            self.assertEqual(mock_timer.call_args.args[0], 0)
+            mock_timer.return_value.start.assert_called_once()
+
+            executar()
+
+        mock_manter_particoes.assert_called_once()
+        self.assertEqual(mock_timer.call_args.args[0], 60)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from src.func.func_produtos import atualizar_produto
-import json
+from src.func.func_produtos import atualizar_produto, definir_disponibilidade, listar_produtos
+from funcao_postgree.bd_postgree_modelos import Produto
 
 class TestFuncProdutos(unittest.TestCase):
     """
@@ -32,7 +32,7 @@ class TestFuncProdutos(unittest.TestCase):
         result = atualizar_produto(product, id_product)
 
         # Assert
-        mock_bd_produto.atualizar_produto.assert_called_once_with(json.dumps(product), int(id_product))
+        mock_bd_produto.atualizar_produto.assert_called_once_with(Produto(**product), int(id_product))
         self.assertTrue(result)
 
     @patch('src.func.func_produtos.bd_produto')
@@ -59,8 +59,58 @@ class TestFuncProdutos(unittest.TestCase):
         result = atualizar_produto(product, id_product)
 
         # Assert
-        mock_bd_produto.atualizar_produto.assert_called_once_with(json.dumps(product), int(id_product))
+        mock_bd_produto.atualizar_produto.assert_called_once_with(Produto(**product), int(id_product))
         self.assertFalse(result)
 
+    @patch('src.func.func_produtos.catalogo')
+    @patch('src.func.func_produtos.bd_produto')
+    def test_definir_disponibilidade(self, mock_bd_produto, mock_catalogo):
+        """
+        Testa a alteração da disponibilidade de vários produtos de uma vez.
+
+        Valida:
+        - Se os ids são convertidos e enviados em uma única chamada ao banco de dados.
+        - Se apenas os produtos alterados são atualizados no cache do catálogo.
+        """
+        # Arrange
+        mock_bd_produto.definir_disponibilidade.return_value = [2]
+
+        # Act
+        result = definir_disponibilidade(['1', '2'], False)
+
+        # Assert
+        mock_bd_produto.definir_disponibilidade.assert_called_once_with([1, 2], False)
+        mock_catalogo.atualizar.assert_called_once_with([2])
+        self.assertTrue(result)
+
+    @patch('src.func.func_produtos.bd_produto')
+    def test_listar_produtos(self, mock_bd_produto):
+        """
+        Testa a listagem paginada de produtos.
+
+        Valida:
+        - Se os filtros são repassados ao banco de dados.
+        - Se o `apos_id` da próxima página é o último id de uma página cheia, e None na última página.
+        """
+        # Arrange
+        mock_bd_produto.listar.side_effect = [
+            [Produto('Pizza', 30.0, True, 1), Produto('Pastel', 8.0, True, 4)],
+            [Produto('Pudim', 6.0, True, 7)],
+        ]
+
+        # Act
+        pagina, proximo = listar_produtos(limite=2, disponivel=True, prefixo_nome='P')
+        ultima_pagina, fim = listar_produtos(proximo, 2, True, 'P')
+
+        # Assert
+        self.assertEqual(pagina, [
+            'ID: 1, Nome: Pizza, Preço: 30.0, Status: disponível',
+            'ID: 4, Nome: Pastel, Preço: 8.0, Status: disponível',
+        ])
+        self.assertEqual(proximo, 4)
+        mock_bd_produto.listar.assert_called_with(4, 2, True, 'P')
+        self.assertEqual(len(ultima_pagina), 1)
+        self.assertIsNone(fim)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,10 @@
 import unittest
-from src.func.func_pedido import transformar_lista_str_em_lista_tuple
+from datetime import datetime
+from unittest.mock import patch
+from funcao_postgree.bd_postgree_modelos import ItemPedido, Pedido
+from src.func.func_pedido import transformar_lista_str_em_lista_tuple, pedidos_recentes, editar_status_pedidos_em_lote, encerrar_pedidos_da_mesa, get_pedidos_completos, get_pedidos_abertos, formatar_pedido
+
+DATA_HORA = datetime(2024, 1, 1, 12, 0)
 
 class TestFuncPedido(unittest.TestCase):
     """
@@ -62,5 +67,142 @@ class TestFuncPedido(unittest.TestCase):
         with self.assertRaises(IndexError):
             transformar_lista_str_em_lista_tuple(lista)
 
+    @patch('src.func.func_pedido.bd_pedido')
+    def test_editar_status_pedidos_em_lote(self, mock_bd_pedido):
+        """
+        Testa a edição do status de vários pedidos de uma vez.
+
+        Valida:
+        - Se os ids são convertidos e enviados em uma única chamada ao banco de dados.
+        - Se uma falha no banco de dados é retornada como `False`.
+        """
+        mock_bd_pedido.editar_status_em_lote.return_value = [1]
+
+        self.assertTrue(editar_status_pedidos_em_lote(['1', '2'], 'Pedido finalizado'))
+        mock_bd_pedido.editar_status_em_lote.assert_called_once_with([1, 2], 'Pedido finalizado')
+
+        mock_bd_pedido.editar_status_em_lote.return_value = None
+        self.assertFalse(editar_status_pedidos_em_lote(['1'], 'Pedido finalizado'))
+
+    @patch('src.func.func_pedido.bd_pedido')
+    def test_encerrar_pedidos_da_mesa(self, mock_bd_pedido):
+        """
+        Testa a edição do status dos pedidos abertos de uma mesa.
+
+        Valida:
+        - Se a mesa e o status atual são repassados como filtros ao banco de dados.
+        """
+        mock_bd_pedido.editar_status_dos_abertos.return_value = []
+
+        self.assertTrue(encerrar_pedidos_da_mesa(5, 'Pedido finalizado', 'Entregar'))
+        mock_bd_pedido.editar_status_dos_abertos.assert_called_once_with('Pedido finalizado', mesa=5, status_atual='Entregar')
+
+    @patch('src.func.func_pedido.bd_pedido_produto')
+    def test_get_pedidos_completos(self, mock_bd_pedido_produto):
+        """
+        Testa a busca de vários pedidos com os seus produtos.
+
+        Valida:
+        - Se os ids são convertidos e enviados em uma única chamada ao banco de dados.
+        - Se uma falha no banco de dados é retornada como lista vazia.
+        """
+        completos = [(Pedido(5, 'Entregar', DATA_HORA, 1), [ItemPedido(3, 2, 30.0, 'Pizza', 1)])]
+        mock_bd_pedido_produto.get_pedidos_completos.return_value = completos
+
+        self.assertEqual(get_pedidos_completos(['1']), completos)
+        mock_bd_pedido_produto.get_pedidos_completos.assert_called_once_with([1])
+
+        mock_bd_pedido_produto.get_pedidos_completos.return_value = None
+        self.assertEqual(get_pedidos_completos(['1']), [])
+
+    @patch('src.func.func_pedido.bd_pedido')
+    def test_get_pedidos_abertos(self, mock_bd_pedido):
+        """
+        Testa a busca da fila de pedidos abertos.
+
+        Valida:
+        - Se os pedidos são buscados com `get_abertos`, sem formatação.
+        - Se uma falha no banco de dados é retornada como lista vazia.
+        """
+        abertos = [Pedido(5, 'Entregar', DATA_HORA, 1)]
+        mock_bd_pedido.get_abertos.return_value = abertos
+
+        self.assertEqual(get_pedidos_abertos(), abertos)
+
+        mock_bd_pedido.get_abertos.return_value = None
+        self.assertEqual(get_pedidos_abertos(), [])
+
+    def test_formatar_pedido(self):
+        """
+        Testa a formatação de um pedido para a lista de pedidos.
+        """
+        self.assertEqual(
+            formatar_pedido(Pedido(5, 'Entregar', DATA_HORA, 1)),
+            "ID: 1, Mesa: 5, Status: Entregar, Data/Hora: 2024-01-01 12:00:00"
+        )
+
+class TestPedidosRecentes(unittest.TestCase):
+    """
+    Classe de testes para validar a lista de pedidos recentes atualizada pelo marcador.
+    """
+
+    def setUp(self):
+        """
+        Descarta os pedidos antes de cada teste.
+        """
+        pedidos_recentes.limpar()
+
+    def tearDown(self):
+        """
+        Descarta os pedidos carregados pelo teste, para não afetar os testes de outros módulos.
+        """
+        pedidos_recentes.limpar()
+
+    @patch('src.func.func_pedido.bd_pedido')
+    def test_atualizacao_pelo_marcador(self, mock_bd_pedido):
+        """
+        Testa se, depois da primeira carga, apenas as alterações são consultadas.
+
+        Valida:
+        - Se `get_last_1000` é chamado uma única vez.
+        - Se os pedidos alterados substituem os antigos e os novos entram no topo da lista.
+        - Se o marcador retornado é usado na consulta seguinte.
+        """
+        mock_bd_pedido.marcador_atual.return_value = 10
+        mock_bd_pedido.get_last_1000.return_value = [Pedido(1, 'Pedido realizado', DATA_HORA, 2), Pedido(1, 'Entregar', DATA_HORA, 1)]
+        mock_bd_pedido.get_alterados_desde.side_effect = [
+            ([Pedido(3, 'Pedido realizado', DATA_HORA, 3), Pedido(1, 'Pedido finalizado', DATA_HORA, 1)], 14),
+            ([], 14),
+        ]
+
+        pedidos_recentes.listar()
+        pedidos = pedidos_recentes.listar()
+        pedidos_recentes.listar()
+
+        self.assertEqual([(p.id, p.status) for p in pedidos], [(3, 'Pedido realizado'), (2, 'Pedido realizado'), (1, 'Pedido finalizado')])
+        mock_bd_pedido.get_last_1000.assert_called_once()
+        self.assertEqual([c.args for c in mock_bd_pedido.get_alterados_desde.call_args_list], [(10,), (14,)])
+
+    @patch('src.func.func_pedido.bd_pedido')
+    def test_mensagem_sem_ids_recarrega(self, mock_bd_pedido):
+        """
+        Testa uma mensagem de sincronização sem ids.
+
+        Valida:
+        - Se a próxima leitura carrega a lista inteira de novo.
+        - Se uma mensagem com ids não descarta a lista.
+        """
+        mock_bd_pedido.marcador_atual.return_value = 10
+        mock_bd_pedido.get_last_1000.return_value = [Pedido(1, 'Entregar', DATA_HORA, 1)]
+        mock_bd_pedido.get_alterados_desde.return_value = ([], 10)
+
+        pedidos_recentes.listar()
+        pedidos_recentes.tratar_mensagem('sync_pedido: 1')
+        pedidos_recentes.listar()
+        pedidos_recentes.tratar_mensagem('sync_pedido')
+        pedidos_recentes.listar()
+
+        self.assertEqual(mock_bd_pedido.get_last_1000.call_count, 2)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
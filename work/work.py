@@ -1,6 +1,7 @@
 from psycopg2.pool import ThreadedConnectionPool
 from faker import Faker
 from concurrent.futures import ThreadPoolExecutor
+from funcao_postgree.bd_postgree_migracoes import BdMigracoes
 import os
 
 # Configurações do banco de dados
@@ -39,45 +40,11 @@ def executar_query(query, params=None, fetch=False):
 
 # Criação de tabelas
 def criar_tabelas():
-    queries = [
-        """
-        CREATE TABLE IF NOT EXISTS funcionario (
-            id SERIAL PRIMARY KEY,
-            usuario VARCHAR(255) UNIQUE,
-            senha VARCHAR(255) NOT NULL,
-            email VARCHAR(255) NOT NULL UNIQUE
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS Pedido (
-            id SERIAL PRIMARY KEY,
-            mesa INT NOT NULL,
-            status VARCHAR(255) NOT NULL,
-            data_hora TIMESTAMP NOT NULL
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS Produto (
-            id SERIAL PRIMARY KEY,
-            nome VARCHAR(255) UNIQUE,
-            preco DECIMAL(10, 2) NOT NULL,
-            disponivel BOOLEAN DEFAULT TRUE
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS Produto_Pedido (
-            id SERIAL PRIMARY KEY,
-            pedido_id INT NOT NULL,
-            produto_id INT NOT NULL,
-            quantidade INT NOT NULL,
-            preco_pago DECIMAL(10, 2) NOT NULL,
-            FOREIGN KEY (pedido_id) REFERENCES Pedido (id) ON DELETE CASCADE,
-            FOREIGN KEY (produto_id) REFERENCES Produto (id) ON DELETE CASCADE
-        );
-        """
-    ]
-    for query in queries:
-        executar_query(query)
+    """
+    Cria ou atualiza o esquema com as migrações da biblioteca funcao_postgree, as mesmas
+    aplicadas pela aplicação, para que os dados gerados sigam o esquema atual.
+    """
+    BdMigracoes(DB_CONFIG['host'], DB_CONFIG['dbname'], DB_CONFIG['user'], DB_CONFIG['password']).aplicar()
 
 # Geração de dados - Pedidos
 def gerar_dados_pedidos(qtd_pedido):
@@ -96,16 +63,18 @@ def gerar_dados_pedido_produto(qtd_pedido_produto, qtd_pedido, qtd_produto):
     """
     Gera dados fictícios para a tabela Produto_Pedido. 
     Considera os pedidos já inseridos e os novos a serem inseridos.
+    Cada item leva a data/hora do seu pedido (pedido_data_hora), que faz parte da chave
+    estrangeira e define a partição do item.
     """
-    pedidos_inseridos = executar_query("SELECT COUNT(*) FROM Pedido", fetch=True)[0][0]
+    pedidos_inseridos = executar_query("SELECT id, data_hora FROM Pedido", fetch=True)
     
-    if pedidos_inseridos == 0:
+    if not pedidos_inseridos:
         print("Nenhum pedido inserido no banco de dados.")
         return []
     
     return [
         (
-            fake.random_int(1, pedidos_inseridos),
+            *fake.random_element(pedidos_inseridos),
             fake.random_int(1, qtd_produto),
             fake.random_int(1, 10),
             fake.random_int(10, 100)
@@ -119,12 +88,16 @@ def inserir_dados(funcionarios=None, pedidos=None, produtos=None, pedidos_produt
     if funcionarios:
         executar_query("INSERT INTO funcionario (usuario, senha, email) VALUES (%s, %s, %s)", funcionarios)
     if pedidos:
-        executar_query("INSERT INTO Pedido (mesa, status, data_hora) VALUES (%s, %s, %s)", pedidos)
+        # Pedido é particionada por mês: garante as partições dos meses das datas geradas.
+        datas = [data_hora for _, _, data_hora in pedidos]
+        executar_query("SELECT criar_particoes_pedidos(%s::date, %s::date)", (min(datas), max(datas)))
+        # Pedido.status guarda o código da tabela status_pedido; a descrição é convertida no banco.
+        executar_query("INSERT INTO Pedido (mesa, status, data_hora) VALUES (%s, codigo_status_pedido(%s), %s)", pedidos)
     if produtos:
         executar_query("INSERT INTO Produto (nome, preco, disponivel) VALUES (%s, %s, %s)", produtos)
     if pedidos_produtos:
         executar_query(
-            "INSERT INTO Produto_Pedido (pedido_id, produto_id, quantidade, preco_pago) VALUES (%s, %s, %s, %s)", 
+            "INSERT INTO Produto_Pedido (pedido_id, pedido_data_hora, produto_id, quantidade, preco_pago) VALUES (%s, %s, %s, %s, %s)",
             pedidos_produtos
         )
 